@@ -1,9 +1,7 @@
 import os
-import time
 import textwrap
-import google.generativeai as genai
 from dotenv import load_dotenv
-from google.api_core import exceptions
+from core.retry import RetryPolicy, get_breaker
 from .base_agent import AgentBase
 
 class ContentAgent(AgentBase):
@@ -19,9 +17,19 @@ class ContentAgent(AgentBase):
             print("[ContentAgent] WARNING: GEMINI_API_KEY not set in .env")
             self.model = None
         else:
+            import google.generativeai as genai
             genai.configure(api_key=self.api_key)
             # gemini-flash-latest is generally the most cost-effective / free-tier friendly
             self.model = genai.GenerativeModel('gemini-flash-latest')
+        
+        # Shares the Gemini circuit breaker with core.gemini_client
+        self.retry_policy = RetryPolicy(
+            max_attempts=3,
+            breaker=get_breaker("gemini"),
+            on_retry=lambda attempt, delay, e: self.log(
+                f"Rate limit hit. Retrying in {delay:.1f}s..."
+            )
+        )
 
     def run(self, input_data):
         """
@@ -40,40 +48,34 @@ class ContentAgent(AgentBase):
             return self._fallback_content(topic)
 
         # Retry logic for rate limits
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                # Generate content using Gemini
-                response = self.model.generate_content(f"""
-                You are a creative AI Influencer Content Director.
-                Topic: {topic}
-                
-                1. Write a short, engaging, viral-style script (max 30 seconds spoken) for a video.
-                   Tone: Flirty, mischievous, confident.
-                   Format: Just the spoken text.
-                
-                2. Write a catchy Instagram caption with hashtags.
-                
-                3. Write a standard Stable Diffusion prompt for a background image relevant to this topic.
-                
-                Output format (strictly):
-                SCRIPT: [Script text]
-                CAPTION: [Caption text]
-                IMAGE_PROMPT: [Prompt text]
-                """)
-                
-                return self._parse_response(response.text)
-                
-            except exceptions.ResourceExhausted:
-                wait_time = (2 ** attempt) * 2 # 2, 4, 8 seconds
-                self.log(f"Rate limit hit. Retrying in {wait_time}s...")
-                time.sleep(wait_time)
-            except Exception as e:
+        try:
+            # Generate content using Gemini
+            response = self.retry_policy.call(self.model.generate_content, f"""
+            You are a creative AI Influencer Content Director.
+            Topic: {topic}
+            
+            1. Write a short, engaging, viral-style script (max 30 seconds spoken) for a video.
+               Tone: Flirty, mischievous, confident.
+               Format: Just the spoken text.
+            
+            2. Write a catchy Instagram caption with hashtags.
+            
+            3. Write a standard Stable Diffusion prompt for a background image relevant to this topic.
+            
+            Output format (strictly):
+            SCRIPT: [Script text]
+            CAPTION: [Caption text]
+            IMAGE_PROMPT: [Prompt text]
+            """)
+            
+            return self._parse_response(response.text)
+            
+        except Exception as e:
+            if self.retry_policy.is_retryable(e):
+                self.log("Max retries reached. Using fallback.")
+            else:
                 self.log(f"Error generating content: {e}")
-                return self._fallback_content(topic)
-        
-        self.log("Max retries reached. Using fallback.")
-        return self._fallback_content(topic)
+            return self._fallback_content(topic)
 
     def _parse_response(self, text):
         script = ""
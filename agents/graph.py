@@ -3,7 +3,10 @@ from agents.state import AgentState
 from agents.nodes.writer import script_writer_node
 from agents.nodes.voice import voice_artist_node
 from agents.nodes.artist import visual_artist_node
+from agents.nodes.metadata import metadata_node
 from agents.nodes.video import animator_node
+from agents.nodes.timing import timed_node, format_timings
+from core.tracing import format_breakdown, trace_run
 
 def create_agent_graph():
     """
@@ -12,30 +15,43 @@ def create_agent_graph():
     # Initialize the graph
     workflow = StateGraph(AgentState)
     
-    # Add Nodes
-    workflow.add_node("script_writer", script_writer_node)
-    workflow.add_node("voice_artist", voice_artist_node)
-    workflow.add_node("visual_artist", visual_artist_node)
-    workflow.add_node("animator", animator_node)
+    # Add Nodes (each reports its wall-clock span into state['timings'])
+    workflow.add_node("script_writer", timed_node("script_writer")(script_writer_node))
+    workflow.add_node("voice_artist", timed_node("voice_artist")(voice_artist_node))
+    workflow.add_node("visual_artist", timed_node("visual_artist")(visual_artist_node))
+    workflow.add_node("metadata_writer", timed_node("metadata_writer")(metadata_node))
+    workflow.add_node("animator", timed_node("animator")(animator_node))
     
-    # Add Edges (Linear flow)
     # Start -> ScriptWriter
     workflow.set_entry_point("script_writer")
     
-    # ScriptWriter -> VoiceArtist
+    # Fan out: voice, image and metadata only depend on the script
     workflow.add_edge("script_writer", "voice_artist")
+    workflow.add_edge("script_writer", "visual_artist")
+    workflow.add_edge("script_writer", "metadata_writer")
     
-    # VoiceArtist -> VisualArtist (Can be parallel actually, but linear for safety)
-    workflow.add_edge("voice_artist", "visual_artist")
-    
-    # VisualArtist -> Animator
-    workflow.add_edge("visual_artist", "animator")
+    # Join: Animator waits for every branch
+    workflow.add_edge(["voice_artist", "visual_artist", "metadata_writer"], "animator")
     
     # Animator -> End
     workflow.add_edge("animator", END)
     
     return workflow.compile()
 
+def run_pipeline(topic: str, trace_path: str = None) -> AgentState:
+    """
+    Runs the graph for a topic and prints the per-node timing report.
+    trace_path optionally saves every span (.jsonl, or a Chrome trace otherwise).
+    """
+    app = create_agent_graph()
+    with trace_run("agent_graph", topic=topic) as (tracer, root):
+        state = app.invoke({"topic": topic, "timings": {}})
+    print(format_timings(state.get("timings", {})))
+    print(format_breakdown(tracer.breakdown(root)))
+    if trace_path:
+        print(f"Trace saved: {tracer.write(trace_path)}")
+    return state
+
 if __name__ == "__main__":
     # Test the graph construction
     app = create_agent_graph()
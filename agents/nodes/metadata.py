@@ -0,0 +1,34 @@
+from agents.state import AgentState
+
+def metadata_node(state: AgentState) -> AgentState:
+    """
+    Generates thumbnail text and SEO metadata for the video.
+    Independent of audio/image, so it runs alongside them.
+    """
+    print(f"--> MetadataWriter preparing thumbnail and SEO...")
+    
+    topic = state["topic"]
+    script = state.get("script") or ""
+    
+    try:
+        from core.gemini_client import get_gemini_client
+        # Shared across graph runs: one rate limiter, one SDK setup
+        gemini = get_gemini_client()
+        thumbnail = gemini.generate_thumbnail_text(topic)
+        seo = gemini.optimize_for_seo(title=topic, description=script[:300])
+    except Exception as e:
+        # No API key or API failure: derive basic metadata from the topic
+        print(f"    Metadata fallback ({e})")
+        thumbnail = {"main_text": topic}
+        seo = {
+            "optimized_title": topic,
+            "optimized_description": script,
+            "keywords": [],
+            "suggested_tags": []
+        }
+    
+    return {
+        "thumbnail": thumbnail,
+        "seo": seo,
+        "current_step": "metadata_ready"
+    }
@@ -0,0 +1,41 @@
+import functools
+import time
+from typing import Callable, Dict
+
+from core.tracing import span
+
+def timed_node(name: str) -> Callable:
+    """
+    Wraps a graph node so its wall-clock span is merged into state['timings']
+    (and recorded on the active tracer, with the node's LLM/TTS/render spans nested under it).
+    """
+    def decorator(node: Callable) -> Callable:
+        @functools.wraps(node)
+        def wrapper(state):
+            start = time.time()
+            with span(name) as current:
+                update = node(state) or {}
+                if update.get("error"):
+                    current.set(error=update["error"])
+            end = time.time()
+            update["timings"] = {
+                name: {"start": start, "end": end, "seconds": round(end - start, 3)}
+            }
+            return update
+        return wrapper
+    return decorator
+
+def format_timings(timings: Dict[str, Dict[str, float]]) -> str:
+    """
+    Renders a per-node report plus the critical path (first start to last end).
+    """
+    if not timings:
+        return "No timings recorded."
+    origin = min(t["start"] for t in timings.values())
+    finish = max(t["end"] for t in timings.values())
+    lines = [f"{'node':<18}{'start':>8}{'end':>8}{'secs':>8}"]
+    for name, t in sorted(timings.items(), key=lambda item: item[1]["start"]):
+        lines.append(f"{name:<18}{t['start'] - origin:>8.2f}{t['end'] - origin:>8.2f}{t['seconds']:>8.2f}")
+    serial = sum(t["seconds"] for t in timings.values())
+    lines.append(f"critical path: {finish - origin:.2f}s (serial sum {serial:.2f}s)")
+    return "\n".join(lines)
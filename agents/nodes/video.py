@@ -1,7 +1,7 @@
-import subprocess
-import sys
-import os
 from agents.state import AgentState
+from core.sadtalker_worker import get_shared_worker
+from core.artifact_store import get_artifact_store
+from core.run_manifest import file_digest
 
 def animator_node(state: AgentState) -> AgentState:
     """
@@ -15,39 +15,36 @@ def animator_node(state: AgentState) -> AgentState:
     if not image_path or not audio_path:
         return {"error": "Missing image or audio path."}
         
-    output_dir = os.path.abspath("output_agent_video")
-    
-    # Path to our existing video generation script
-    # We use the script we already verified which handles hardware detection
-    base_dir = os.getcwd() # Assumption: running from root
-    script_path = os.path.join(base_dir, "video_gen", "generate_video.py")
-    
-    cmd = [
-        sys.executable, script_path,
-        "--image", image_path,
-        "--audio", audio_path,
-        "--output_dir", output_dir
-    ]
+    # Same settings as video_gen/generate_video.py, but rendered on the
+    # persistent worker so checkpoints stay loaded between graph runs
+    # (the same worker VisualAgent uses)
+    worker = get_shared_worker()
     
     try:
-        print(f"    Running SadTalker wrapper...")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        print(f"    Rendering on SadTalker worker...")
+        # Render straight to the artifact path: the result is known exactly,
+        # and concurrent graph runs never pick up each other's videos
+        inputs = {
+            'image': file_digest(image_path),
+            'audio': file_digest(audio_path),
+            'preprocess': "full",
+            'still': True
+        }
+        video_path = get_artifact_store().get_or_create(
+            'video', inputs, '.mp4',
+            lambda path: worker.render(
+                source_image=image_path,
+                driven_audio=audio_path,
+                output_path=path,
+                preprocess="full",
+                still=True
+            )
+        )
         
-        if result.returncode != 0:
-            print(f"    Animation failed: {result.stderr}")
-            return {"error": f"Video generation failed: {result.stderr}"}
-            
         print("    Video generated successfully.")
-        # Find the output file (SadTalker names them randomly/timestamped)
-        # We take the most recent file in the output dir
-        files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) if f.endswith(".mp4")]
-        if not files:
-             return {"error": "Video generated but file not found in output."}
-             
-        latest_video = max(files, key=os.path.getctime)
         
         return {
-            "video_path": latest_video,
+            "video_path": video_path,
             "current_step": "video_completed"
         }
         
@@ -1,11 +1,15 @@
-import asyncio
-import edge_tts
-import os
 from agents.state import AgentState
+from core.artifact_store import get_artifact_store
+from core.audio_cache import get_audio_cache
+from core.chunked_tts import ChunkedSynthesizer
+from core.voice_service import get_voice_service
+
+VOICE = "en-US-AnaNeural"
 
 def voice_artist_node(state: AgentState) -> AgentState:
     """
     Converts the script to audio using edge-tts.
+    Sentences already in the audio cache are reused.
     """
     print(f"--> VoiceArtist synthesizing audio...")
     
@@ -13,17 +17,23 @@ def voice_artist_node(state: AgentState) -> AgentState:
     if not script:
         return {"error": "No script found in state."}
         
-    output_file = os.path.abspath("output_audio.mp3")
-    voice = "en-US-AnaNeural"
-    
-    async def _generate():
-        communicate = edge_tts.Communicate(script, voice)
-        await communicate.save(output_file)
-
     try:
-        # Run the async generation synchronously
-        asyncio.run(_generate())
-        print(f"    Audio saved to: {output_file}")
+        synthesizer = ChunkedSynthesizer(
+            backend=get_voice_service(VOICE).synthesize,
+            cache=get_audio_cache(),
+            engine="edge-tts",
+            voice=VOICE,
+            rate="+0%"
+        )
+        # Named by content, so overlapping graph runs never share a file
+        output_file = get_artifact_store().get_or_create(
+            "audio",
+            {"text": script, "voice": VOICE, "engine": "edge-tts", "rate": "+0%"},
+            ".mp3",
+            lambda path: synthesizer.synthesize(script, path)
+        )
+        stats = synthesizer.last_stats
+        print(f"    Audio saved to: {output_file} ({stats.get('cache_hits', 0)}/{stats.get('chunks', 0)} chunks from cache)")
         
         return {
             "audio_path": output_file,
@@ -1,34 +1,78 @@
-from .content_agent import ContentAgent
-from .voice_agent import VoiceAgent
-from .visual_agent import VisualAgent
-from .marketing_agent import MarketingAgent
-from .publishing_agent import PublishingAgent
-from .trend_agent import TrendWatcherAgent
-from .community_agent import CommunityManagerAgent
+import functools
+
+from core.tracing import file_size, format_breakdown, span, trace_run
 
 class Orchestrator:
-    def __init__(self):
-        self.trend_agent = TrendWatcherAgent()
-        self.content_agent = ContentAgent()
-        self.voice_agent = VoiceAgent()
-        self.visual_agent = VisualAgent()
-        self.marketing_agent = MarketingAgent()
-        self.publishing_agent = PublishingAgent()
-        self.community_agent = CommunityManagerAgent()
-
-    def create_post(self, topic: str = None):
+    """
+    Runs the agent pipeline
+
+    Agents are built (and their modules imported) the first time they're
+    used, so e.g. engage_community never loads the Gemini SDK or SadTalker.
+    """
+
+    @functools.cached_property
+    def trend_agent(self):
+        from .trend_agent import TrendWatcherAgent
+        return TrendWatcherAgent()
+
+    @functools.cached_property
+    def content_agent(self):
+        from .content_agent import ContentAgent
+        return ContentAgent()
+
+    @functools.cached_property
+    def voice_agent(self):
+        from .voice_agent import VoiceAgent
+        return VoiceAgent()
+
+    @functools.cached_property
+    def visual_agent(self):
+        from .visual_agent import VisualAgent
+        return VisualAgent()
+
+    @functools.cached_property
+    def marketing_agent(self):
+        from .marketing_agent import MarketingAgent
+        return MarketingAgent()
+
+    @functools.cached_property
+    def publishing_agent(self):
+        from .publishing_agent import PublishingAgent
+        return PublishingAgent()
+
+    @functools.cached_property
+    def community_agent(self):
+        from .community_agent import CommunityManagerAgent
+        return CommunityManagerAgent()
+
+    def create_post(self, topic: str = None, trace_path: str = None):
         print("=== Orchestrator: Starting Pipeline ===")
         
+        # Every step is a span; trace_path optionally saves them (.jsonl, or a Chrome trace otherwise)
+        with trace_run("create_post") as (tracer, root):
+            video = self._create_post(topic)
+        
+        breakdown = tracer.breakdown(root)
+        print(format_breakdown(breakdown))
+        if trace_path:
+            print(f"Orchestrator: Trace saved to {tracer.write(trace_path)}")
+        if video:
+            video["timing"] = breakdown
+        return video
+
+    def _create_post(self, topic: str = None):
         # 1. Trend (or simple topic)
         if not topic:
             # For now, TrendAgent is a placeholder returning a list. We take the first one.
-            trends = self.trend_agent.run({"category": "tech"})
+            with span("trend_agent"):
+                trends = self.trend_agent.run({"category": "tech"})
             topic = trends["trends"][0]
             print(f"Orchestrator: Auto-selected trending topic: {topic}")
 
         # 2. Content
         print(f"Orchestrator: Requesting content for '{topic}'...")
-        content = self.content_agent.run({"topic": topic})
+        with span("content_agent", topic=topic):
+            content = self.content_agent.run({"topic": topic})
         if not content:
             print("Orchestrator: Content generation failed.")
             return
@@ -38,7 +82,10 @@ class Orchestrator:
         
         # 3. Voice
         print("Orchestrator: Generating Voiceover...")
-        audio = self.voice_agent.run({"text": script, "output_path": "output/generated_audio.mp3"})
+        with span("voice_agent", bytes_in=len(script.encode("utf-8"))) as current:
+            audio = self.voice_agent.run({"text": script})
+            if audio:
+                current.set(bytes_out=file_size(audio["audio_path"]))
         if not audio:
             print("Orchestrator: Voice generation failed.")
             return
@@ -57,27 +104,32 @@ class Orchestrator:
              pass
 
         print(f"Orchestrator: Generating Video using {image_path}...")
-        video = self.visual_agent.run({
-            "audio_path": audio_path, 
-            "image_path": image_path,
-            "output_dir": "output/final_videos"
-        })
+        with span("visual_agent") as current:
+            video = self.visual_agent.run({
+                "audio_path": audio_path, 
+                "image_path": image_path,
+                "output_dir": "output/final_videos"
+            })
+            if video:
+                current.set(bytes_out=file_size(video["video_path"]))
         
         if not video:
              print("Orchestrator: Video generation failed.")
              return
 
         # 5. Marketing (Placeholder for now)
-        metadata = self.marketing_agent.run({
-            "video_path": video["output_dir"], 
-            "platform": "instagram"
-        })
+        with span("marketing_agent"):
+            metadata = self.marketing_agent.run({
+                "video_path": video["video_path"], 
+                "platform": "instagram"
+            })
         
         # 6. Publishing (Placeholder for now)
-        self.publishing_agent.run({
-            "video_path": video["output_dir"],
-            "metadata": metadata
-        })
+        with span("publishing_agent"):
+            self.publishing_agent.run({
+                "video_path": video["video_path"],
+                "metadata": metadata
+            })
         
         print("=== Orchestrator: Pipeline Complete ===")
         return video
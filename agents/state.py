@@ -1,8 +1,22 @@
-from typing import TypedDict, Optional, List
+from typing import Annotated, Any, Dict, TypedDict, Optional, List
+
+def merge_dicts(left: Optional[Dict], right: Optional[Dict]) -> Dict:
+    """Reducer: parallel nodes each contribute their own keys."""
+    return {**(left or {}), **(right or {})}
+
+def last_value(left: Any, right: Any) -> Any:
+    """Reducer: several nodes finishing in the same step is not an error."""
+    return right
+
+def first_error(left: Optional[str], right: Optional[str]) -> Optional[str]:
+    """Reducer: keep the first error reported by any branch."""
+    return left or right
 
 class AgentState(TypedDict):
     """
     Represents the state of the AI Influencer creation pipeline.
+    Fields written by parallel branches carry a reducer so LangGraph can
+    merge their partial updates.
     """
     topic: str
     script: Optional[str]
@@ -12,6 +26,13 @@ class AgentState(TypedDict):
     image_path: Optional[str]
     video_path: Optional[str]
     
+    # Publishing metadata
+    thumbnail: Optional[Dict]
+    seo: Optional[Dict]
+    
     # Status / Errors
-    current_step: str
-    error: Optional[str]
+    current_step: Annotated[str, last_value]
+    error: Annotated[Optional[str], first_error]
+    
+    # Per-node {'start', 'end', 'seconds'} (wall clock)
+    timings: Annotated[Dict[str, Dict[str, float]], merge_dicts]
@@ -1,6 +1,8 @@
-import asyncio
 import os
-import edge_tts
+from core.artifact_store import get_artifact_store
+from core.audio_cache import get_audio_cache
+from core.chunked_tts import ChunkedSynthesizer
+from core.voice_service import get_voice_service
 from .base_agent import AgentBase
 
 class VoiceAgent(AgentBase):
@@ -8,36 +10,77 @@ class VoiceAgent(AgentBase):
         super().__init__("VoiceAgent", config_path)
         # Default voice: en-US-AnaNeural, en-US-AriaNeural, en-US-GuyNeural, etc.
         self.voice = "en-US-AriaNeural" 
+        self.rate = "+0%"
+        self.audio_cache = get_audio_cache()
+        self.artifacts = get_artifact_store()
+        # One event loop and connection pool shared by every utterance
+        self.voice_service = get_voice_service(self.voice)
 
     def run(self, input_data):
         """
-        Input: {'text': str, 'emotion': str (optional), 'output_path': str (optional)}
-        Output: {'audio_path': str}
+        Input: {'text': str, 'emotion': str (optional), 'output_path': str (optional;
+                default: artifact store, named by text and voice)}
+               or {'segments': [{'text': str, 'output_path': str}, ...]}
+        Output: {'audio_path': str} or {'audio_paths': [str, ...]}
         """
+        if input_data.get("segments"):
+            return self._run_segments(input_data["segments"])
+
         text = input_data.get("text")
         if not text:
             self.log("Error: No text provided.")
             return None
 
-        output_path = input_data.get("output_path", "output/voice_output.mp3")
+        output_path = input_data.get("output_path")
         
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
         self.log(f"Generating audio for: '{text[:20]}...' using voice {self.voice}")
 
-        # Run async function synchronously
+        # Sentences already in the audio cache are reused instead of re-synthesized
         try:
-            asyncio.run(self._generate_audio(text, output_path))
-            self.log(f"Audio saved to {output_path}")
+            synthesizer = ChunkedSynthesizer(
+                backend=self.voice_service.synthesize,
+                cache=self.audio_cache,
+                engine="edge-tts",
+                voice=self.voice,
+                rate=self.rate
+            )
+            if output_path:
+                # Ensure output directory exists
+                os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+                synthesizer.synthesize(text, output_path)
+            else:
+                # Named by content, so concurrent runs never write the same file
+                output_path = self.artifacts.get_or_create(
+                    "audio",
+                    {"text": text, "voice": self.voice, "engine": "edge-tts", "rate": self.rate},
+                    ".mp3",
+                    lambda path: synthesizer.synthesize(text, path)
+                )
+            stats = synthesizer.last_stats
+            self.log(f"Audio saved to {output_path} ({stats.get('cache_hits', 0)}/{stats.get('chunks', 0)} chunks from cache)")
             return {"audio_path": output_path}
         except Exception as e:
             self.log(f"Error generating audio: {e}")
             return None
 
-    async def _generate_audio(self, text, output_file):
-        communicate = edge_tts.Communicate(text, self.voice)
-        await communicate.save(output_file)
+    def _run_segments(self, segments):
+        """Synthesize many short clips (replies, video segments) in one concurrent batch"""
+        pending = []
+        for segment in segments:
+            os.makedirs(os.path.dirname(segment["output_path"]) or ".", exist_ok=True)
+            key = self.audio_cache.make_key(segment["text"], self.voice, "edge-tts", self.rate)
+            if not self.audio_cache.fetch(key, segment["output_path"]):
+                pending.append((key, segment["text"], segment["output_path"]))
+
+        self.log(f"Generating {len(pending)} of {len(segments)} clips ({len(segments) - len(pending)} from cache)")
+        try:
+            self.voice_service.synthesize_many([(text, path) for _, text, path in pending], rate=self.rate)
+        except Exception as e:
+            self.log(f"Error generating audio: {e}")
+            return None
+        for key, _, path in pending:
+            self.audio_cache.store(key, path)
+        return {"audio_paths": [segment["output_path"] for segment in segments]}
 
 if __name__ == "__main__":
     # Test the agent
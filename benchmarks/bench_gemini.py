@@ -0,0 +1,56 @@
+"""
+Benchmark: blocking GeminiClient calls vs async batching, against a fake model
+
+Usage:
+    python -m benchmarks.bench_gemini --prompts 16 --latency 0.5
+"""
+
+import time
+import asyncio
+import argparse
+
+from core.gemini_client import GeminiClient
+from benchmarks.fakes import FakeGenerativeModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prompts', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.5, help='Fake model latency (s)')
+    parser.add_argument('--rpm', type=float, default=600, help='Token bucket rate (free tier is 15)')
+    args = parser.parse_args()
+
+    topics = [f"topic {i}" for i in range(args.prompts)]
+
+    client = GeminiClient(
+        model=FakeGenerativeModel(latency=args.latency),
+        requests_per_minute=args.rpm,
+        use_cache=False
+    )
+    started = time.perf_counter()
+    for topic in topics:
+        client.generate_thumbnail_text(topic)
+    serial = time.perf_counter() - started
+
+    print(f"\n{'mode':<24}{'wall (s)':>10}{'req/s':>10}")
+    print(f"{'sync serial':<24}{serial:>10.2f}{args.prompts / serial:>10.2f}")
+
+    for concurrency in (2, 4, 8):
+        client = GeminiClient(
+            model=FakeGenerativeModel(latency=args.latency),
+            max_concurrency=concurrency,
+            requests_per_minute=args.rpm,
+            use_cache=False
+        )
+
+        async def run():
+            await asyncio.gather(*(client.agenerate_thumbnail_text(t) for t in topics))
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        print(f"{f'async x{concurrency}':<24}{elapsed:>10.2f}{args.prompts / elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Benchmark: end-to-end pipeline scenarios, fully offline
+
+Every external service is replaced by a local stand-in (benchmarks/fakes.py):
+FakeGenerativeModel for Gemini, FakeTTS (silent MP3 of proportional length)
+for gTTS, FakePexelsServer for Pexels and StubRenderer for SadTalker.
+Real ffmpeg still runs, so rendering cost is included.
+
+Each scenario runs in its own process with fresh caches, so peak RSS is
+per scenario. Repeats reuse that process's caches (cold, then warm)
+unless --cold is given.
+
+Scenarios:
+    short     one short-form video
+    long      one long-form video (per-section voicing and rendering)
+    daily     run_daily_automation (long + short, shared trends)
+    personas  N personas through the job queue and worker
+    stock     prefetch stock footage + images for N queries while voicing N sections
+
+Usage:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --scenario short long --repeat 2
+    python -m benchmarks.bench_pipeline --scenario personas --personas 4 --json results.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SCENARIOS = ['short', 'long', 'daily', 'personas', 'stock']
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def stage_latency(tracer) -> Dict[str, Dict]:
+    """count/mean/p50/p95/max seconds per span name"""
+    by_name: Dict[str, List[float]] = {}
+    for span in tracer.spans():
+        by_name.setdefault(span.name, []).append(span.seconds)
+    return {
+        name: {
+            'count': len(values),
+            'mean': sum(values) / len(values),
+            'p50': _percentile(values, 0.5),
+            'p95': _percentile(values, 0.95),
+            'max': max(values)
+        }
+        for name, values in by_name.items()
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process"""
+    # ffmpeg children aren't reported: a forked child's ru_maxrss starts at the parent's RSS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def write_config(path: Path, name: str, image_path: str, niche_suffix: str = ''):
+    with open(PROJECT_ROOT / 'config' / 'influencer_config.json') as f:
+        config = json.load(f)
+    config['influencer']['name'] = name
+    config['influencer']['niche'] += niche_suffix
+    config['avatar']['image_path'] = image_path
+    with open(path, 'w') as f:
+        json.dump(config, f, indent=2)
+
+
+def run_scenario(args) -> Dict:
+    """Run one scenario in this process (caches and cwd already isolated)"""
+    from PIL import Image
+
+    from core.artifact_store import ArtifactStore
+    from core.automation import AIInfluencerAutomation
+    from core.gemini_client import GeminiClient
+    from core.job_queue import JobQueue, JobWorker
+    from core.tracing import Tracer, use_tracer
+    from core.video_pipeline import VideoPipeline
+    from benchmarks.fakes import FakeGenerativeModel, FakePexelsServer, FakeTTS, StubRenderer
+
+    work = Path.cwd()
+    image_path = str(work / 'avatar.png')
+    Image.new('RGB', (512, 512), (40, 60, 90)).save(image_path)
+    config_path = work / 'config.json'
+    write_config(config_path, 'Benchmark Persona', image_path)
+
+    tts = FakeTTS(base_latency=args.tts_latency, per_char_latency=args.tts_per_char)
+    model = FakeGenerativeModel(latency=args.llm_latency, sections=args.sections, vary=True)
+    renderer = StubRenderer(seconds_per_audio_second=args.render_speed)
+    pexels = FakePexelsServer(
+        latency=args.pexels_latency,
+        media_bytes=args.media_kb * 1024,
+        drop_downloads=args.drop_downloads
+    )
+
+    results = []
+    with pexels:
+        for iteration in range(args.repeat):
+            # Cold runs get caches of their own; warm runs share the process's
+            cache_kwargs = {'use_cache': False} if args.cold else {}
+            gemini = GeminiClient(model=model, requests_per_minute=args.rpm, **cache_kwargs)
+            pipeline = VideoPipeline(
+                pexels_api_key='benchmark',
+                pexels_api_base=pexels.api_base,
+                tts_backend=tts.synthesize,
+                use_audio_cache=not args.cold,
+                use_media_cache=not args.cold
+            )
+            artifacts = ArtifactStore(str(work / f"artifacts_{iteration}")) if args.cold else None
+            tracer = Tracer(args.run_scenario)
+            started = time.perf_counter()
+            with use_tracer(tracer):
+                if args.run_scenario in ('short', 'long', 'daily'):
+                    automation = AIInfluencerAutomation(
+                        config_path=str(config_path), gemini=gemini, video_pipeline=pipeline,
+                        avatar_gen=renderer, artifacts=artifacts
+                    )
+                    if args.run_scenario == 'daily':
+                        automation.run_daily_automation()
+                    else:
+                        automation.generate_daily_content(f"{args.run_scenario}_form")
+                    automation.render_pool.shutdown()
+                elif args.run_scenario == 'personas':
+                    queue = JobQueue(str(work / f"jobs_{iteration}.sqlite"))
+                    for i in range(args.personas):
+                        persona_config = work / f"persona_{i}.json"
+                        write_config(persona_config, f"Persona {i}", image_path, f" #{i}")
+                        queue.enqueue(str(persona_config), 'both')
+                    worker = JobWorker(
+                        queue,
+                        network_workers=args.network_workers,
+                        render_workers=args.render_workers,
+                        gemini=gemini,
+                        automation_kwargs={'video_pipeline': pipeline, 'avatar_gen': renderer, 'artifacts': artifacts}
+                    )
+                    worker.run()
+                    stats = queue.stats()
+                    if stats['failed']:
+                        raise RuntimeError(f"{stats['failed']} persona job(s) failed")
+                elif args.run_scenario == 'stock':
+                    media_dir = work / f"stock_{iteration}"
+                    media_dir.mkdir(exist_ok=True)
+                    queries = [f"technology topic {i}" for i in range(args.queries)]
+                    # Downloads start first and overlap with voicing, as in a real run
+                    prefetches = {
+                        kind: pipeline.prefetch_stock_media(queries, str(media_dir), kind)
+                        for kind in ('video', 'photo')
+                    }
+                    for i, query in enumerate(queries):
+                        pipeline.text_to_speech(f"Section {i} is about {query}. " * 10, str(media_dir / f"section_{i}.mp3"))
+                    for kind, futures in prefetches.items():
+                        for query, future in futures.items():
+                            if not future.result():
+                                raise RuntimeError(f"No stock {kind} for {query}")
+            results.append({
+                'iteration': iteration,
+                'wall_seconds': time.perf_counter() - started,
+                'stages': stage_latency(tracer),
+                'categories': tracer.breakdown()['categories']
+            })
+
+    return {
+        'scenario': args.run_scenario,
+        'iterations': results,
+        'peak_rss_mb': peak_rss_mb(),
+        'calls': {
+            'llm': model.calls,
+            'tts': tts.calls,
+            'render': renderer.calls,
+            'pexels': pexels.requests
+        }
+    }
+
+
+def spawn(scenario: str, args, verbose: bool) -> Dict:
+    """Run a scenario in a fresh process with its own working directory and caches"""
+    with tempfile.TemporaryDirectory(prefix=f"bench_{scenario}_") as work:
+        result_path = os.path.join(work, 'result.json')
+        env = dict(
+            os.environ,
+            PYTHONPATH=str(PROJECT_ROOT) + os.pathsep + os.environ.get('PYTHONPATH', ''),
+            AI_INFLUENCER_CACHE_DIR=os.path.join(work, 'cache'),
+            AI_INFLUENCER_ARTIFACT_DIR=os.path.join(work, 'artifacts'),
+            AI_INFLUENCER_QUEUE_DB=os.path.join(work, 'jobs.sqlite')
+        )
+        env.pop('PEXELS_API_BASE', None)
+        cmd = [sys.executable, '-m', 'benchmarks.bench_pipeline', '--run-scenario', scenario,
+               '--result', result_path] + args.passthrough
+        proc = subprocess.run(cmd, cwd=work, env=env, capture_output=not verbose, text=True)
+        if proc.returncode != 0:
+            tail = '\n'.join((proc.stdout or '').splitlines()[-15:] + (proc.stderr or '').splitlines()[-15:])
+            return {'scenario': scenario, 'error': f"exit {proc.returncode}\n{tail}"}
+        with open(result_path) as f:
+            return json.load(f)
+
+
+def print_report(results: List[Dict], top: int):
+    print(f"\n{'scenario':<10}{'run':>5}{'wall (s)':>10}{'peak RSS (MB)':>15}  where the time went")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['scenario']:<10}  FAILED: {result['error']}")
+            continue
+        for it in result['iterations']:
+            where = ', '.join(f"{k} {v:.1f}s" for k, v in it['categories'].items())
+            print(f"{result['scenario']:<10}{it['iteration'] + 1:>5}{it['wall_seconds']:>10.2f}"
+                  f"{result['peak_rss_mb']:>15.0f}  {where}")
+
+    for result in results:
+        if 'error' in result:
+            continue
+        stages = result['iterations'][0]['stages']
+        print(f"\n[{result['scenario']}] slowest stages, first run (calls: {result['calls']})")
+        print(f"  {'stage':<30}{'count':>6}{'mean':>8}{'p50':>8}{'p95':>8}{'max':>8}")
+        for name, s in sorted(stages.items(), key=lambda kv: -kv[1]['mean'] * kv[1]['count'])[:top]:
+            print(f"  {name:<30}{s['count']:>6}{s['mean']:>8.2f}{s['p50']:>8.2f}{s['p95']:>8.2f}{s['max']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per scenario (later runs hit warm caches)')
+    parser.add_argument('--cold', action='store_true', help='Give every run empty caches')
+    parser.add_argument('--personas', type=int, default=3, help='Personas in the personas scenario')
+    parser.add_argument('--network-workers', type=int, default=4)
+    parser.add_argument('--render-workers', type=int, default=1)
+    parser.add_argument('--queries', type=int, default=6, help='Queries in the stock scenario')
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='Seconds per fake Gemini call')
+    parser.add_argument('--rpm', type=float, default=600, help='Gemini rate limit (free tier is 15)')
+    parser.add_argument('--sections', type=int, default=4, help='Sections in long-form scripts')
+    parser.add_argument('--tts-latency', type=float, default=0.3, help='Base seconds per fake TTS request')
+    parser.add_argument('--tts-per-char', type=float, default=0.002, help='Extra fake TTS seconds per character')
+    parser.add_argument('--render-speed', type=float, default=0.05, help='Stub render seconds per audio second')
+    parser.add_argument('--pexels-latency', type=float, default=0.1, help='Seconds per fake Pexels request')
+    parser.add_argument('--media-kb', type=int, default=2048, help='Size of each fake stock file')
+    parser.add_argument('--drop-downloads', type=int, default=0, help='Fake Pexels downloads cut off halfway (resumed)')
+    parser.add_argument('--top', type=int, default=8, help='Stages listed per scenario')
+    parser.add_argument('--json', type=str, help='Also write results to this file')
+    parser.add_argument('--verbose', action='store_true', help='Show pipeline output')
+    parser.add_argument('--run-scenario', choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument('--result', type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        result = run_scenario(args)
+        with open(args.result, 'w') as f:
+            json.dump(result, f)
+        return
+
+    # Scenario processes get the same knobs
+    passthrough = []
+    for name, value in vars(args).items():
+        if name in ('scenario', 'json', 'verbose', 'run_scenario', 'result', 'top') or value is False:
+            continue
+        passthrough += [f"--{name.replace('_', '-')}"] + ([] if value is True else [str(value)])
+    args.passthrough = passthrough
+    results = []
+    for scenario in args.scenario:
+        print(f"▶ {scenario}...", flush=True)
+        results.append(spawn(scenario, args, args.verbose))
+    print_report(results, args.top)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved: {args.json}")
+    if any('error' in result for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: cold SadTalker subprocess per clip vs warm persistent worker
+
+Usage:
+    python -m benchmarks.bench_sadtalker_worker --image test_character.png --audio clip.mp3 --runs 3
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+
+from core.sadtalker_worker import SadTalkerWorker, DEFAULT_SADTALKER_PATH
+
+
+def run_cold(image: str, audio: str, result_dir: str, device: str) -> float:
+    """One clip the old way: a fresh inference.py process"""
+    cmd = [
+        sys.executable, str(DEFAULT_SADTALKER_PATH / 'inference.py'),
+        '--driven_audio', os.path.abspath(audio),
+        '--source_image', os.path.abspath(image),
+        '--result_dir', os.path.abspath(result_dir),
+        '--still',
+        '--preprocess', 'crop'
+    ]
+    if device == 'cpu':
+        cmd.append('--cpu')
+    started = time.perf_counter()
+    subprocess.run(cmd, cwd=str(DEFAULT_SADTALKER_PATH), check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--image', required=True)
+    parser.add_argument('--audio', required=True)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--device', default='cpu', choices=['cpu', 'cuda'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cold = [run_cold(args.image, args.audio, tmp, args.device) for _ in range(args.runs)]
+
+        worker = SadTalkerWorker(device=args.device)
+        started = time.perf_counter()
+        worker.start()
+        startup = time.perf_counter() - started
+
+        warm = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            worker.render(args.image, args.audio, tmp, preprocess='crop', still=True)
+            warm.append(time.perf_counter() - started)
+        worker.close()
+
+    print(f"\n{'mode':<20}{'mean (s)':>12}{'min (s)':>12}")
+    print(f"{'cold subprocess':<20}{sum(cold) / len(cold):>12.2f}{min(cold):>12.2f}")
+    print(f"{'warm worker':<20}{sum(warm) / len(warm):>12.2f}{min(warm):>12.2f}")
+    print(f"worker startup (imports): {startup:.2f}s; first warm run includes checkpoint load")
+    print(f"steady-state speedup: {min(cold) / min(warm[1:] or warm):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
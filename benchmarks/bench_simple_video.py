@@ -0,0 +1,71 @@
+"""
+Benchmark: create_simple_video, ffmpeg fast path vs MoviePy
+
+Renders a still image + title over a long narration track both ways.
+The audio is a generated tone encoded as MP3 (like gTTS output).
+
+Usage:
+    python -m benchmarks.bench_simple_video --minutes 10
+    python -m benchmarks.bench_simple_video --minutes 10 --skip-moviepy
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+from PIL import Image
+
+from core.video_pipeline import VideoPipeline
+from core.ffmpeg_utils import probe_media, run_ffmpeg
+
+
+def make_inputs(tmp: str, minutes: float):
+    image_path = os.path.join(tmp, 'avatar.png')
+    Image.new('RGB', (1280, 720), (40, 60, 90)).save(image_path)
+    audio_path = os.path.join(tmp, 'narration.mp3')
+    run_ffmpeg([
+        '-f', 'lavfi', '-i', f"sine=frequency=220:sample_rate=24000:duration={minutes * 60}",
+        '-ac', '1', '-c:a', 'libmp3lame', '-b:a', '48k', audio_path
+    ])
+    return image_path, audio_path
+
+
+def render(pipeline: VideoPipeline, image_path: str, audio_path: str, output_path: str, text: str):
+    started = time.perf_counter()
+    pipeline.create_simple_video(image_path, audio_path, output_path, add_text=text)
+    elapsed = time.perf_counter() - started
+    info = probe_media(output_path)
+    return elapsed, info['duration'], os.path.getsize(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--minutes', type=float, default=10.0, help='Audio length')
+    parser.add_argument('--text', default='Local AI Models Explained', help='Title overlay')
+    parser.add_argument('--skip-moviepy', action='store_true', help='Only run the ffmpeg path')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path, audio_path = make_inputs(tmp, args.minutes)
+
+        fast = VideoPipeline(use_audio_cache=False)
+        results.append(('ffmpeg', *render(fast, image_path, audio_path, os.path.join(tmp, 'fast.mp4'), args.text)))
+
+        if not args.skip_moviepy:
+            slow = VideoPipeline(use_audio_cache=False, use_ffmpeg=False)
+            # TextClip needs ImageMagick; benchmark MoviePy without the overlay if it is missing
+            try:
+                results.append(('moviepy', *render(slow, image_path, audio_path, os.path.join(tmp, 'slow.mp4'), args.text)))
+            except Exception as e:
+                print(f"MoviePy with text failed ({e}); retrying without overlay")
+                results.append(('moviepy (no text)', *render(slow, image_path, audio_path, os.path.join(tmp, 'slow.mp4'), None)))
+
+    print(f"\n{'path':<18}{'wall (s)':>10}{'video (s)':>11}{'size (MB)':>11}{'x realtime':>12}")
+    for name, elapsed, duration, size in results:
+        print(f"{name:<18}{elapsed:>10.1f}{duration:>11.1f}{size / 1e6:>11.1f}{duration / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
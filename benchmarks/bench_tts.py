@@ -0,0 +1,54 @@
+"""
+Benchmark: chunked parallel TTS throughput vs chunk size and concurrency
+
+Uses FakeTTS (latency grows with text length, like gTTS's sequential
+100-character requests) so it runs offline.
+
+Usage:
+    python -m benchmarks.bench_tts --chars 6000
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+from core.video_pipeline import VideoPipeline
+from core.audio_utils import mp3_duration
+from benchmarks.fakes import FakeTTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chars', type=int, default=6000, help='Narration length')
+    parser.add_argument('--base-latency', type=float, default=0.3)
+    parser.add_argument('--per-char', type=float, default=0.002)
+    args = parser.parse_args()
+
+    sentence = "This is a sentence from a long narration about local AI models. "
+    text = (sentence * (args.chars // len(sentence) + 1))[:args.chars].rsplit('.', 1)[0] + '.'
+
+    print(f"\n{'chunk chars':>12}{'workers':>9}{'calls':>7}{'wall (s)':>10}{'chars/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for chunk_chars in (200, 500, 1000, len(text)):
+            for workers in (1, 2, 4, 8):
+                if chunk_chars == len(text) and workers > 1:
+                    continue
+                fake = FakeTTS(args.base_latency, args.per_char)
+                pipeline = VideoPipeline(
+                    tts_backend=fake.synthesize,
+                    tts_chunk_chars=chunk_chars,
+                    tts_workers=workers,
+                    use_audio_cache=False
+                )
+                output = os.path.join(tmp, f"tts_{chunk_chars}_{workers}.mp3")
+                started = time.perf_counter()
+                pipeline.text_to_speech(text, output)
+                elapsed = time.perf_counter() - started
+                label = 'whole' if chunk_chars == len(text) else str(chunk_chars)
+                print(f"{label:>12}{workers:>9}{fake.calls:>7}{elapsed:>10.2f}{len(text) / elapsed:>10.0f}")
+        print(f"\noutput duration check: {mp3_duration(output):.1f}s of audio")
+
+
+if __name__ == "__main__":
+    main()
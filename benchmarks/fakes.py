@@ -0,0 +1,370 @@
+"""
+Local stand-ins for external services used by the benchmarks
+Deterministic, offline, and with configurable latency
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def _stable_fraction(text: str) -> float:
+    """Deterministic value in [0, 1) derived from text"""
+    return int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16) / 0x100000000
+
+
+# One MPEG-2 Layer III frame: 24 kHz mono 32 kbps (gTTS format), all-zero
+# side info and main data decode as 24 ms of silence
+_SILENT_FRAME = bytes([0xFF, 0xF3, 0x44, 0xC0]) + bytes(92)
+_FRAME_SECONDS = 576 / 24000
+
+
+def silent_mp3(seconds: float, seed: bytes = b'') -> bytes:
+    """
+    MP3 bytes of silence lasting about `seconds`
+
+    `seed` (up to 32 bytes) is written into the first frame's main data,
+    which zero-length side info makes the decoder ignore, so different
+    texts give different files without changing how they sound.
+    """
+    frames = max(1, round(seconds / _FRAME_SECONDS))
+    first = _SILENT_FRAME[:len(_SILENT_FRAME) - len(seed[:32])] + seed[:32]
+    return first + _SILENT_FRAME * (frames - 1)
+
+
+class FakeTTS:
+    """
+    Stand-in TTS backend
+
+    Latency is `base_latency + len(text) * per_char_latency`; output is
+    silent MP3 at `chars_per_second` speaking rate.
+    """
+
+    def __init__(self, base_latency: float = 0.3, per_char_latency: float = 0.002,
+                 chars_per_second: float = 15.0):
+        self.base_latency = base_latency
+        self.per_char_latency = per_char_latency
+        self.chars_per_second = chars_per_second
+        self.calls = 0
+
+    def synthesize(self, text: str, output_path: str, *args, **kwargs):
+        self.calls += 1
+        time.sleep(self.base_latency + len(text) * self.per_char_latency)
+        with open(output_path, 'wb') as f:
+            f.write(silent_mp3(len(text) / self.chars_per_second, hashlib.sha256(text.encode('utf-8')).digest()))
+        return output_path
+
+
+class FakeResponse:
+    """Mimics the .text attribute of a Gemini response"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """
+    Drop-in for genai.GenerativeModel
+
+    Returns canned JSON matching each GeminiClient prompt, after
+    `latency` seconds (+ up to `jitter` seconds, stable per prompt).
+    With stream=True the same total latency is spread over ~40-char chunks.
+    With vary=True, titles and narration carry a tag derived from the prompt,
+    so different personas/topics don't share TTS or render work.
+    """
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, sections: int = 4, vary: bool = False):
+        self.latency = latency
+        self.jitter = jitter
+        self.sections = sections
+        self.vary = vary
+        self.calls = 0
+
+    def _delay(self, prompt: str) -> float:
+        return self.latency + self.jitter * _stable_fraction(prompt)
+
+    def _answer(self, prompt: str) -> str:
+        self.calls += 1
+        if 'trend analyst' in prompt:
+            data = {
+                'trending_topics': [f"Topic {i}" for i in range(1, 6)],
+                'viral_formats': ['Tutorial', 'Reaction', 'Top 5'],
+                'content_angles': ['Beginner', 'Deep dive', 'Myths'],
+                'hashtags': ['#ai', '#tech', '#coding', '#ml', '#tools'],
+                'recommended_topic': 'Local AI models on a laptop'
+            }
+        elif 'Shorts/TikTok script' in prompt:
+            data = {
+                'title': 'Run AI locally in 60 seconds',
+                'hook': 'Your laptop can run AI. Here is how.',
+                'main_content': 'Download a small model. Load it. Ask it anything.',
+                'call_to_action': 'Follow for more!',
+                'full_script': 'Your laptop can run AI. Here is how. Download a small model. '
+                               'Load it. Ask it anything. Follow for more!',
+                'hashtags': ['#ai', '#tech', '#shorts', '#coding', '#local'],
+                'description': 'Running AI models locally.'
+            }
+        elif 'YouTube video script' in prompt:
+            sections = [
+                {
+                    'heading': f"Part {i}",
+                    'content': f"This is part {i} of the video. " * 12,
+                    'duration': '60'
+                }
+                for i in range(1, self.sections + 1)
+            ]
+            data = {
+                'title': 'Running AI models locally: the complete guide',
+                'hook': 'What if your laptop could run ChatGPT-class models?',
+                'sections': sections,
+                'call_to_action': 'Subscribe and like!',
+                'full_script': ' '.join(s['content'] for s in sections),
+                'hashtags': ['#ai', '#tech', '#tutorial'],
+                'description': 'A full guide to local AI.',
+                'tags': ['ai', 'local models', 'tutorial']
+            }
+        elif 'thumbnail' in prompt:
+            data = {
+                'main_text': 'AI ON YOUR LAPTOP',
+                'sub_text': 'No cloud needed',
+                'color_scheme': 'Purple and cyan',
+                'style': 'Bold, high contrast'
+            }
+        elif 'SEO' in prompt:
+            data = {
+                'optimized_title': 'Run AI Models Locally (Free, Easy)',
+                'optimized_description': 'Learn to run AI models locally.',
+                'keywords': ['local ai', 'llm', 'laptop'],
+                'suggested_tags': ['ai', 'llm', 'tutorial']
+            }
+        else:
+            return "SCRIPT: Hello there!\nCAPTION: Hi #ai\nIMAGE_PROMPT: neon city"
+        if self.vary:
+            tag = f"take {int(_stable_fraction(prompt) * 10000)}"
+            for key in ('recommended_topic', 'title', 'hook', 'main_content', 'full_script', 'main_text'):
+                if key in data:
+                    data[key] = f"{data[key]} ({tag})"
+            for section in data.get('sections', []):
+                section['content'] = f"{section['content']}({tag})"
+        if '"full_script" field first' in prompt and 'full_script' in data:
+            data = {'full_script': data.pop('full_script'), **data}
+        return f"```json\n{json.dumps(data, indent=2)}\n```"
+
+    def _stream(self, prompt: str, chunk_size: int = 40):
+        text = self._answer(prompt)
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        delay = self._delay(prompt) / len(chunks)
+        for chunk in chunks:
+            time.sleep(delay)
+            yield FakeResponse(chunk)
+
+    def generate_content(self, prompt: str, generation_config: Optional[dict] = None,
+                         stream: bool = False, **kwargs):
+        if stream:
+            return self._stream(prompt)
+        time.sleep(self._delay(prompt))
+        return FakeResponse(self._answer(prompt))
+
+    async def generate_content_async(self, prompt: str, generation_config: Optional[dict] = None, **kwargs):
+        await asyncio.sleep(self._delay(prompt))
+        return FakeResponse(self._answer(prompt))
+
+
+class StubRenderer:
+    """
+    Drop-in for AvatarGenerator
+
+    Sleeps `seconds_per_audio_second` per second of narration (SadTalker's
+    cost scales with audio length), then writes a small real MP4 with the
+    narration so concat and muxing downstream behave as in production.
+    """
+
+    def __init__(self, seconds_per_audio_second: float = 0.05, size: str = '160x160'):
+        self.seconds_per_audio_second = seconds_per_audio_second
+        self.size = size
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return True
+
+    def generate_talking_video(self, image_path: str, audio_path: str, output_path: str, **kwargs) -> str:
+        from core.audio_utils import mp3_duration
+        from core.ffmpeg_utils import run_ffmpeg
+        from core.tracing import span
+
+        with self._lock:
+            self.calls += 1
+        # Same span name as AvatarGenerator, so reports read the same
+        with span('sadtalker.render'):
+            time.sleep(mp3_duration(audio_path) * self.seconds_per_audio_second)
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            run_ffmpeg([
+                '-f', 'lavfi', '-i', f"color=c=gray:s={self.size}:r=10",
+                '-i', audio_path, '-shortest',
+                '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+                '-c:a', 'aac', '-b:a', '64k', output_path
+            ])
+        return output_path
+
+    def batch_generate(self, image_path: str, audio_files: List[str], output_dir: str,
+                       max_workers: Optional[int] = None, resume: bool = True, **kwargs) -> List[str]:
+        os.makedirs(output_dir, exist_ok=True)
+        paths = [os.path.join(output_dir, f"segment_{i:03d}.mp4") for i in range(len(audio_files))]
+
+        def render(i: int) -> str:
+            if resume and os.path.exists(paths[i]):
+                return paths[i]
+            return self.generate_talking_video(image_path, audio_files[i], paths[i])
+
+        from core.tracing import propagate, span
+
+        with span('sadtalker.batch', segments=len(audio_files)), \
+                ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+            return list(executor.map(propagate(render), range(len(audio_files))))
+
+    def close(self):
+        pass
+
+
+class FakePexelsServer:
+    """
+    Local HTTP stand-in for the Pexels API
+
+    Serves /v1/search and /videos/search with `per_page` deterministic
+    results per query, and the media they link to (`media_bytes` of filler
+    each, Range requests supported) after `latency` seconds, optionally
+    capped at `bandwidth` bytes/second per response. Connections are kept
+    alive (HTTP/1.1) and counted in `requests['connections']`. The first
+    `drop_downloads` media responses are cut off halfway, to exercise
+    resumable downloads.
+
+    Usage:
+        with FakePexelsServer() as server:
+            VideoPipeline(pexels_api_key='fake', pexels_api_base=server.api_base)
+    """
+
+    def __init__(self, latency: float = 0.1, media_bytes: int = 2 * 1024 * 1024,
+                 bandwidth: Optional[float] = None, drop_downloads: int = 0):
+        self.latency = latency
+        self.media_bytes = media_bytes
+        self.bandwidth = bandwidth
+        self.drop_downloads = drop_downloads
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-pexels', daemon=True)
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'FakePexelsServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+
+    def _take_drop(self) -> bool:
+        with self._lock:
+            if self.drop_downloads > 0:
+                self.drop_downloads -= 1
+                return True
+            return False
+
+    def _search_result(self, path: str, query: str, per_page: int) -> Dict:
+        media_ids = [int(_stable_fraction(f"{query}#{i}") * 1_000_000) for i in range(per_page)]
+        if path == '/v1/search':
+            return {'photos': [{
+                'id': media_id,
+                'src': {'large': f"{self.api_base}/media/photo/{media_id}.jpg"}
+            } for media_id in media_ids]}
+        return {'videos': [{
+            'id': media_id,
+            'video_files': [
+                {'quality': 'sd', 'link': f"{self.api_base}/media/video/{media_id}_sd.mp4"},
+                {'quality': 'hd', 'link': f"{self.api_base}/media/video/{media_id}_hd.mp4"}
+            ]
+        } for media_id in media_ids]}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                server._count('connections')
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict] = None,
+                      drop: bool = False):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if drop:
+                    # Promise the whole body, send half, hang up
+                    self.wfile.write(body[:len(body) // 2])
+                    self.close_connection = True
+                    return
+                step = 64 * 1024
+                for i in range(0, len(body), step):
+                    self.wfile.write(body[i:i + step])
+                    if server.bandwidth:
+                        time.sleep(min(step, len(body) - i) / server.bandwidth)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                time.sleep(server.latency)
+                if url.path in ('/v1/search', '/videos/search'):
+                    server._count('search')
+                    if not self.headers.get('Authorization'):
+                        self._send(401, b'{"error": "Unauthorized"}', 'application/json')
+                        return
+                    params = parse_qs(url.query)
+                    query = params.get('query', [''])[0]
+                    per_page = int(params.get('per_page', ['15'])[0])
+                    body = json.dumps(server._search_result(url.path, query, per_page)).encode('utf-8')
+                    self._send(200, body, 'application/json')
+                elif url.path.startswith('/media/'):
+                    server._count('media')
+                    seed = hashlib.sha256(url.path.encode('utf-8')).digest()
+                    data = (seed * (server.media_bytes // len(seed) + 1))[:server.media_bytes]
+                    content_range = self.headers.get('Range')
+                    drop = server._take_drop()
+                    if content_range and content_range.startswith('bytes='):
+                        server._count('range')
+                        start, _, end = content_range[6:].partition('-')
+                        start, end = int(start), int(end) if end else len(data) - 1
+                        self._send(206, data[start:end + 1], 'application/octet-stream', {
+                            'Content-Range': f"bytes {start}-{end}/{len(data)}",
+                            'Accept-Ranges': 'bytes'
+                        }, drop=drop)
+                    else:
+                        self._send(200, data, 'application/octet-stream', {'Accept-Ranges': 'bytes'}, drop=drop)
+                else:
+                    self._send(404, b'not found', 'text/plain')
+
+        return Handler
@@ -3,14 +3,34 @@ Core integration layer for AI Influencer automation
 Combines gemini-youtube-automation, Text-To-Video-AI, and SadTalker
 """
 
-from .gemini_client import GeminiClient
-from .avatar_generator import AvatarGenerator
-from .video_pipeline import VideoPipeline
-from .automation import AIInfluencerAutomation
-
-__all__ = [
-    'GeminiClient',
-    'AvatarGenerator',
-    'VideoPipeline',
-    'AIInfluencerAutomation'
-]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .gemini_client import GeminiClient
+    from .avatar_generator import AvatarGenerator
+    from .video_pipeline import VideoPipeline
+    from .automation import AIInfluencerAutomation
+
+# Exports are imported on first access, so `import core.run_manifest` (or any
+# other light submodule) doesn't load the Gemini SDK, gTTS and friends
+_EXPORTS = {
+    'GeminiClient': '.gemini_client',
+    'AvatarGenerator': '.avatar_generator',
+    'VideoPipeline': '.video_pipeline',
+    'AIInfluencerAutomation': '.automation'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,198 @@
+"""
+Artifact Store - Content-addressed storage for generated media
+Files are named by a hash of the inputs that produced them, so identical
+work is found instead of redone and concurrent runs never share a path
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .tracing import current_span
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_STORE_DIR = PROJECT_ROOT / 'output' / 'artifacts'
+
+
+class ArtifactStore:
+    """Stores audio, video and image artifacts under input-hash names"""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize artifact store
+
+        Args:
+            root: Store directory (default: output/artifacts)
+        """
+        self.root = Path(root or os.getenv('AI_INFLUENCER_ARTIFACT_DIR', str(DEFAULT_STORE_DIR)))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind: str, inputs: Any) -> str:
+        """
+        Build the key for an artifact
+
+        Args:
+            kind: Artifact kind ('audio', 'video', 'thumbnail', ...)
+            inputs: JSON-serializable description of everything the artifact depends on
+
+        Returns:
+            Hex key
+        """
+        raw = kind + '\x00' + json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path_for(self, kind: str, inputs: Any, suffix: str) -> Path:
+        """
+        Get the store path of an artifact (whether or not it exists yet)
+
+        Args:
+            kind: Artifact kind
+            inputs: Artifact inputs
+            suffix: File extension including the dot
+
+        Returns:
+            Path inside the store
+        """
+        key = self.make_key(kind, inputs)
+        return self.root / kind / key[:2] / f"{key}{suffix}"
+
+    def lookup(self, kind: str, inputs: Any, suffix: str) -> Optional[str]:
+        """
+        Check whether an artifact already exists
+
+        Args:
+            kind: Artifact kind
+            inputs: Artifact inputs
+            suffix: File extension including the dot
+
+        Returns:
+            Path to the artifact, or None
+        """
+        path = self.path_for(kind, inputs, suffix)
+        return str(path) if path.exists() else None
+
+    @contextmanager
+    def writing(self, kind: str, inputs: Any, suffix: str) -> Iterator[str]:
+        """
+        Write an artifact atomically
+
+        Yields a temporary path to write to; it is moved into place only
+        if the block completes without error.
+
+        Args:
+            kind: Artifact kind
+            inputs: Artifact inputs
+            suffix: File extension including the dot
+
+        Yields:
+            Temporary file path (same suffix, so tools can infer the format)
+        """
+        path = self.path_for(kind, inputs, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp{suffix}")
+        try:
+            yield str(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def get_or_create(
+        self,
+        kind: str,
+        inputs: Any,
+        suffix: str,
+        produce: Callable[[str], Any]
+    ) -> str:
+        """
+        Return an existing artifact or produce it
+
+        Concurrent requests for the same artifact in this process wait for
+        the first one instead of producing it twice.
+
+        Args:
+            kind: Artifact kind
+            inputs: Artifact inputs
+            suffix: File extension including the dot
+            produce: Callable(output_path) that writes the artifact
+
+        Returns:
+            Path to the artifact
+        """
+        key = self.make_key(kind, inputs)
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            existing = self.lookup(kind, inputs, suffix)
+            if existing:
+                print(f"♻️ Reusing {kind} artifact: {existing}")
+                current_span().add(cache_hits=1)
+                return existing
+            with self.writing(kind, inputs, suffix) as tmp_path:
+                produce(tmp_path)
+            return str(self.path_for(kind, inputs, suffix))
+
+    def add(self, kind: str, inputs: Any, source_path: str) -> str:
+        """
+        Move an already produced file into the store
+
+        Args:
+            kind: Artifact kind
+            inputs: Artifact inputs
+            source_path: File to move in (its extension is kept)
+
+        Returns:
+            Path to the artifact
+        """
+        suffix = Path(source_path).suffix
+        with self.writing(kind, inputs, suffix) as tmp_path:
+            shutil.move(source_path, tmp_path)
+        return str(self.path_for(kind, inputs, suffix))
+
+    @staticmethod
+    def export(artifact_path: str, dest_path: str) -> str:
+        """
+        Expose an artifact under a human-readable name
+
+        Hard-links when possible (no extra disk space), copies otherwise.
+
+        Args:
+            artifact_path: Path inside the store
+            dest_path: Readable destination path
+
+        Returns:
+            Destination path
+        """
+        dest = Path(dest_path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        # Renaming a link over another link to the same file is a no-op, so stop here
+        if dest.exists() and os.path.samefile(artifact_path, dest):
+            return str(dest)
+        tmp_path = dest.with_name(f"{dest.name}.{threading.get_ident()}.tmp")
+        try:
+            os.link(artifact_path, tmp_path)
+        except OSError:
+            shutil.copy2(artifact_path, tmp_path)
+        os.replace(tmp_path, dest)
+        return str(dest)
+
+
+_shared_store: Optional[ArtifactStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get the process-wide artifact store"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ArtifactStore()
+        return _shared_store
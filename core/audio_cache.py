@@ -0,0 +1,187 @@
+"""
+Audio Cache - Content-addressed cache of synthesized speech
+Keyed on normalized text + voice + engine + rate, shared by every TTS path;
+least recently used clips are evicted beyond a size bound
+"""
+
+import os
+import re
+import shutil
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = Path(os.getenv('AI_INFLUENCER_CACHE_DIR', str(PROJECT_ROOT / 'output' / 'cache'))) / 'audio'
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace so trivial edits still hit"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class AudioCache:
+    """Disk cache of MP3 clips addressed by what was spoken and how"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 1024 ** 3):
+        """
+        Initialize audio cache
+
+        Args:
+            cache_dir: Directory for cached clips (default: output/cache/audio)
+            max_bytes: Least recently used clips beyond this total size are evicted
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # Total size of the cache directory, scanned on the first store
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, voice: str, engine: str, rate: str = 'normal') -> str:
+        """
+        Build the cache key for a clip
+
+        Args:
+            text: Spoken text
+            voice: Voice name or language code
+            engine: TTS engine ('gtts', 'edge-tts', ...)
+            rate: Speaking rate
+
+        Returns:
+            Hex cache key
+        """
+        raw = '\x00'.join([engine, voice, rate, normalize_text(text)])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.mp3"
+
+    def contains(self, key: str) -> bool:
+        """Check whether a clip is cached (without counting a lookup)"""
+        return self._path(key).exists()
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """
+        Copy a cached clip to output_path if present
+
+        Args:
+            key: Cache key from make_key
+            output_path: Destination file
+
+        Returns:
+            True on a cache hit
+        """
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, output_path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+        try:
+            # mtime doubles as the last access time for eviction
+            os.utime(path)
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = os.path.getsize(output_path)
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+        return True
+
+    def store(self, key: str, source_path: str):
+        """
+        Add a freshly synthesized clip to the cache
+
+        Args:
+            key: Cache key from make_key
+            source_path: MP3 file to copy in
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += path.stat().st_size
+            over_limit = self._size > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        entries = []
+        for path in self.cache_dir.glob('*/*.mp3'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Remove least recently used clips until the cache fits
+
+        Args:
+            max_bytes: Size limit (default: max_bytes)
+
+        Returns:
+            Number of clips removed
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        if removed:
+            print(f"🧹 Evicted {removed} cached audio clip(s)")
+        return removed
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters for this process
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and bytes_saved
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'bytes_saved': self.bytes_saved
+            }
+
+
+_shared_cache: Optional[AudioCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_audio_cache() -> AudioCache:
+    """Get the process-wide audio cache so all TTS paths share counters"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = AudioCache()
+        return _shared_cache
@@ -0,0 +1,178 @@
+"""
+Audio Utilities - Sentence splitting and lossless MP3 concatenation
+Pure Python helpers shared by the TTS paths
+"""
+
+import os
+import re
+from typing import Iterator, List, Optional, Tuple
+
+# Sentence end: whitespace after terminal punctuation (optionally closed by a quote/bracket)
+_SENTENCE_END = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+')
+
+# MPEG audio Layer III tables
+_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),   # MPEG-1
+    2: (22050, 24000, 16000),   # MPEG-2
+    0: (11025, 12000, 8000),    # MPEG-2.5
+}
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences at terminal punctuation
+
+    Args:
+        text: Input text
+
+    Returns:
+        Non-empty, stripped sentences
+    """
+    return [s.strip() for s in _SENTENCE_END.split(text.strip()) if s.strip()]
+
+
+class SentenceBuffer:
+    """Accumulates streamed text and releases complete sentences"""
+
+    def __init__(self):
+        self._pending = ''
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add text and return the sentences completed by it
+
+        Args:
+            text: Newly arrived text
+
+        Returns:
+            Complete sentences (the trailing partial one is kept)
+        """
+        self._pending += text
+        parts = _SENTENCE_END.split(self._pending)
+        self._pending = parts.pop()
+        return [p.strip() for p in parts if p.strip()]
+
+    def flush(self) -> List[str]:
+        """Return whatever text is left as a final sentence"""
+        rest, self._pending = self._pending.strip(), ''
+        return [rest] if rest else []
+
+
+def _parse_frame_header(header: bytes) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse an MPEG Layer III frame header
+
+    Returns:
+        (frame_length, samples_per_frame, sample_rate) or None if invalid
+    """
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = _BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    if version == 3:
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+    return 72 * bitrate // sample_rate + padding, 576, sample_rate
+
+
+def _skip_id3v2(data: bytes) -> int:
+    if data[:3] != b'ID3' or len(data) < 10:
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def iter_mp3_frames(data: bytes) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Walk the audio frames of an MP3 byte string
+
+    Args:
+        data: MP3 file contents
+
+    Yields:
+        (offset, length, samples, sample_rate) per frame
+    """
+    end = len(data)
+    if end >= 128 and data[-128:-125] == b'TAG':
+        end -= 128
+    pos = _skip_id3v2(data)
+    while pos + 4 <= end:
+        parsed = _parse_frame_header(data[pos:pos + 4])
+        if parsed is None or pos + parsed[0] > end:
+            # Resynchronize on the next frame sync word
+            pos = data.find(b'\xff', pos + 1, end)
+            if pos < 0:
+                return
+            continue
+        length, samples, sample_rate = parsed
+        yield pos, length, samples, sample_rate
+        pos += length
+
+
+def mp3_audio_frames(data: bytes) -> bytes:
+    """
+    Return only the audio frames of an MP3 (no ID3 tags or Xing/Info header)
+
+    Args:
+        data: MP3 file contents
+
+    Returns:
+        Concatenated audio frames
+    """
+    frames = []
+    for index, (offset, length, _, _) in enumerate(iter_mp3_frames(data)):
+        frame = data[offset:offset + length]
+        if index == 0 and (b'Xing' in frame or b'Info' in frame or b'VBRI' in frame):
+            continue
+        frames.append(frame)
+    return b''.join(frames)
+
+
+def mp3_duration(path: str) -> float:
+    """
+    Compute MP3 duration from its frames
+
+    Args:
+        path: MP3 file path
+
+    Returns:
+        Duration in seconds
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return sum(samples / rate for _, _, samples, rate in iter_mp3_frames(data))
+
+
+def concat_mp3(paths: List[str], output_path: str) -> str:
+    """
+    Concatenate MP3 files frame by frame (no re-encoding)
+
+    All inputs should come from the same TTS engine so their sample rate
+    and channel layout match.
+
+    Args:
+        paths: MP3 files in playback order
+        output_path: Where to save the joined file
+
+    Returns:
+        Path to joined file
+    """
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as out:
+        for path in paths:
+            with open(path, 'rb') as f:
+                out.write(mp3_audio_frames(f.read()))
+    os.replace(tmp_path, output_path)
+    return output_path
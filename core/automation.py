@@ -5,25 +5,56 @@ Combines all components: Gemini, Video Pipeline, Avatar Generator, and your exis
 
 import os
 import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 # Import core components
 from .gemini_client import GeminiClient
 from .avatar_generator import AvatarGenerator
 from .video_pipeline import VideoPipeline
+from .script_streaming import stream_script_to_speech, narration_text, section_texts
+from .audio_utils import concat_mp3
+from .retry import RetryPolicy
+from .run_manifest import RunManifest, file_digest
+from .artifact_store import ArtifactStore, get_artifact_store
+from .tracing import format_breakdown, propagate, span, trace_run
+
+# Checkpointed steps that don't wait on Gemini or TTS
+LOCAL_STEPS = ('start', 'render')
 
 
 class AIInfluencerAutomation:
     """Main automation system combining all components"""
     
-    def __init__(self, config_path: str = "config/influencer_config.json"):
+    def __init__(
+        self,
+        config_path: str = "config/influencer_config.json",
+        gemini: Optional[GeminiClient] = None,
+        video_pipeline: Optional[VideoPipeline] = None,
+        avatar_gen: Optional[AvatarGenerator] = None,
+        artifacts: Optional[ArtifactStore] = None,
+        render_pool: Optional[ThreadPoolExecutor] = None,
+        network_slots: Optional[threading.Semaphore] = None,
+        output_dir: str = 'output'
+    ):
         """
         Initialize automation system
         
         Args:
             config_path: Path to configuration file
+            gemini: Gemini client to use (default: a new one); share it to share the rate limit
+            video_pipeline: Video pipeline to use (default: a new one)
+            avatar_gen: Avatar renderer to use (default: SadTalker AvatarGenerator)
+            artifacts: Artifact store to use (default: the shared output/artifacts store)
+            render_pool: Executor for renders (default: own pool of performance.render_workers)
+            network_slots: Semaphore bounding Gemini/TTS steps in flight (default: unbounded)
+            output_dir: Root of the videos/audio/thumbnails/logs directories
         """
         print("🚀 Initializing AI Influencer Automation System...")
         
@@ -34,12 +65,25 @@ class AIInfluencerAutomation:
         print(f"✅ Loaded config for: {self.config['influencer']['name']}")
         
         # Initialize core components
-        self.gemini = GeminiClient()
-        self.video_pipeline = VideoPipeline()
-        self.avatar_gen = AvatarGenerator()
+        self.gemini = gemini or GeminiClient()
+        self.video_pipeline = video_pipeline or VideoPipeline()
+        self.avatar_gen = avatar_gen or AvatarGenerator()
+        # Generated media is named by its inputs, so identical work is reused
+        self.artifacts = artifacts or get_artifact_store()
+        
+        # Rendering is CPU-heavy; bound it separately from network-bound steps
+        performance = self.config.get('performance', {})
+        self.parallel_variants = performance.get('parallel_variants', True)
+        self.stream_tts = performance.get('stream_tts', False)
+        self.segment_long_form = performance.get('segment_long_form', True)
+        self.render_pool = render_pool or ThreadPoolExecutor(
+            max_workers=performance.get('render_workers', 1),
+            thread_name_prefix='render'
+        )
+        self.network_slots = network_slots
         
         # Setup output directories
-        self.output_dir = Path('output')
+        self.output_dir = Path(output_dir)
         self.video_dir = self.output_dir / 'videos'
         self.audio_dir = self.output_dir / 'audio'
         self.thumbnail_dir = self.output_dir / 'thumbnails'
@@ -48,14 +92,101 @@ class AIInfluencerAutomation:
         for dir_path in [self.video_dir, self.audio_dir, self.thumbnail_dir, self.log_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
         
+        # Open run manifests, shared by the variants of a run
+        self._manifests: Dict[str, RunManifest] = {}
+        self._manifests_lock = threading.Lock()
+        
         print("✅ AI Influencer Automation System ready!")
     
-    def generate_daily_content(self, video_type: str = "long_form") -> Dict:
+    def analyze_trends(self) -> Dict:
+        """
+        Run trend analysis for the configured niche
+        
+        Returns:
+            Trend analysis dictionary
+        """
+        print("\n📊 Step 1: Analyzing trends...")
+        return self.gemini.generate_trend_analysis(
+            self.config['influencer']['niche']
+        )
+    
+    @staticmethod
+    def _topic_trends(topic: str) -> Dict:
+        """Trend analysis stand-in for a fixed topic"""
+        return {'recommended_topic': topic, 'trending_topics': [topic]}
+    
+    def open_run(self, run_id: Optional[str] = None) -> RunManifest:
+        """
+        Get the checkpoint manifest for a run
+        
+        Args:
+            run_id: Run to resume, or None to start a new one
+            
+        Returns:
+            RunManifest stored under output/logs
+        """
+        with self._manifests_lock:
+            if run_id is None or run_id not in self._manifests:
+                manifest = RunManifest(run_id, str(self.log_dir))
+                self._manifests[manifest.run_id] = manifest
+                run_id = manifest.run_id
+            return self._manifests[run_id]
+    
+    def _run_step(
+        self,
+        manifest: RunManifest,
+        name: str,
+        inputs,
+        fn: Callable,
+        files: Optional[Callable] = None,
+        on_stage: Optional[Callable[[str, float], None]] = None
+    ):
+        """
+        Run a checkpointed step, holding a network slot unless it is local
+        
+        Args:
+            manifest: Run manifest
+            name: Step name
+            inputs: Step inputs
+            fn: Produces the step's outputs
+            files: Maps outputs to the files they refer to
+            on_stage: Called with (name, seconds) when the step actually ran
+            
+        Returns:
+            The step's outputs
+        """
+        if manifest.get(name, inputs) is not None:
+            with span(name, resumed=True):
+                return manifest.run_step(name, inputs, fn, files)
+        local = name.split('/')[-1] in LOCAL_STEPS
+        with (self.network_slots if self.network_slots is not None and not local else nullcontext()):
+            started = time.perf_counter()
+            with span(name):
+                outputs = manifest.run_step(name, inputs, fn, files)
+        if on_stage:
+            on_stage(name, time.perf_counter() - started)
+        return outputs
+    
+    def generate_daily_content(
+        self,
+        video_type: str = "long_form",
+        trends: Optional[Dict] = None,
+        run_id: Optional[str] = None,
+        topic: Optional[str] = None,
+        on_stage: Optional[Callable[[str, float], None]] = None
+    ) -> Dict:
         """
         Main workflow: Generate daily content
         
+        Every step is checkpointed in the run manifest; resuming a run id
+        skips steps whose inputs are unchanged.
+        
         Args:
             video_type: "long_form" or "short_form"
+            trends: Precomputed trend analysis (shared between variants)
+            run_id: Run to resume (default: start a new run)
+            topic: Topic to use instead of running trend analysis
+            on_stage: Called with (step name, seconds) for each step that ran
             
         Returns:
             Dictionary with video path and metadata
@@ -64,130 +195,404 @@ class AIInfluencerAutomation:
         print(f"🎬 Starting {video_type} content generation...")
         print("="*60)
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        try:
-            # Step 1: Analyze trends
-            print("\n📊 Step 1: Analyzing trends...")
-            trends = self.gemini.generate_trend_analysis(
-                self.config['influencer']['niche']
-            )
-            topic = trends.get('recommended_topic', trends['trending_topics'][0])
-            print(f"✅ Selected topic: {topic}")
-            
-            # Step 2: Generate script
-            print("\n📝 Step 2: Generating script...")
-            duration = self.config['video_settings'][video_type]['duration']
-            style = self.config['influencer']['content_style']
+        with trace_run(f"generate_{video_type}") as (tracer, root):
+            manifest = self.open_run(run_id)
             
-            script = self.gemini.generate_script(
-                topic=topic,
-                duration=duration,
-                style=style,
-                video_type=video_type
-            )
-            print(f"✅ Script generated: {script.get('title', 'Untitled')}")
+            def step(name, inputs, fn, files=None):
+                return self._run_step(manifest, f"{video_type}/{name}", inputs, fn, files, on_stage)
             
-            # Step 3: Generate audio (TTS)
-            print("\n🎤 Step 3: Generating voiceover...")
-            audio_filename = f"audio_{video_type}_{timestamp}.mp3"
-            audio_path = self.audio_dir / audio_filename
+            # File names must stay the same when the run is resumed
+            timestamp = manifest.run_step(f"{video_type}/start", [], lambda: datetime.now().strftime('%Y%m%d_%H%M%S'))
             
-            full_script = script.get('full_script', '')
-            if not full_script:
-                # Combine sections if no full_script
-                if 'sections' in script:
-                    full_script = ' '.join([s['content'] for s in script['sections']])
+            try:
+                # Step 1: Analyze trends
+                if topic:
+                    trends = self._topic_trends(topic)
+                elif trends is None:
+                    trends = self._run_step(
+                        manifest, 'trends', [self.config['influencer']['niche']], self.analyze_trends, on_stage=on_stage
+                    )
+                topic = trends.get('recommended_topic', trends['trending_topics'][0])
+                print(f"✅ Selected topic: {topic}")
+                
+                # Step 2: Generate script
+                duration = self.config['video_settings'][video_type]['duration']
+                style = self.config['influencer']['content_style']
+                lang = self.config['avatar']['language']
+                
+                # Long-form videos are voiced and rendered per script section
+                segmented = video_type == 'long_form' and self.segment_long_form
+                sections = []
+                section_audio = []
+                
+                if self.stream_tts and not segmented:
+                    # Step 3 runs inside step 2: sentences are voiced as they stream in
+                    print("\n📝 Step 2: Generating script (streaming into voiceover)...")
+                    
+                    def stream_script_and_audio():
+                        streamed_path = self.audio_dir / f"audio_{video_type}_{timestamp}.mp3"
+                        streamed_script = stream_script_to_speech(
+                            self.gemini,
+                            lambda text, path: self.video_pipeline.text_to_speech(
+                                text=text, output_path=path, lang=lang
+                            ),
+                            topic=topic,
+                            duration=duration,
+                            style=style,
+                            video_type=video_type,
+                            output_path=str(streamed_path)
+                        )
+                        stored_path = self.artifacts.add(
+                            'audio', self._audio_inputs(narration_text(streamed_script, topic), lang), str(streamed_path)
+                        )
+                        return {'script': streamed_script, 'audio_path': stored_path}
+                    
+                    streamed = step(
+                        'script_audio',
+                        [topic, duration, style, lang],
+                        stream_script_and_audio,
+                        files=lambda out: [out['audio_path']]
+                    )
+                    script, audio_path = streamed['script'], streamed['audio_path']
+                    print(f"✅ Script generated: {script.get('title', 'Untitled')}")
+                    print(f"✅ Audio generated: {audio_path}")
+                else:
+                    print("\n📝 Step 2: Generating script...")
+                    script = step(
+                        'script',
+                        [topic, duration, style],
+                        lambda: self.gemini.generate_script(
+                            topic=topic,
+                            duration=duration,
+                            style=style,
+                            video_type=video_type
+                        )
+                    )
+                    print(f"✅ Script generated: {script.get('title', 'Untitled')}")
+                    
+                    if segmented:
+                        sections = section_texts(script)
+                    if len(sections) >= 2:
+                        # Step 3: Generate audio per section (concurrently)
+                        print(f"\n🎤 Step 3: Generating voiceover for {len(sections)} sections...")
+                        voiced = step(
+                            'audio',
+                            [sections, lang],
+                            lambda: self._synthesize_sections(sections, lang),
+                            files=lambda out: out['sections'] + [out['audio_path']]
+                        )
+                        section_audio, audio_path = voiced['sections'], voiced['audio_path']
+                    else:
+                        sections = []
+                        # Step 3: Generate audio (TTS)
+                        print("\n🎤 Step 3: Generating voiceover...")
+                        narration = narration_text(script, topic)
+                        audio_path = step(
+                            'audio',
+                            [narration, lang],
+                            lambda: self._synthesize(narration, lang),
+                            files=lambda path: [path]
+                        )
+                    print(f"✅ Audio generated: {audio_path}")
+                
+                # Step 4: Generate avatar video (in the render pool)
+                # Renders are checkpointed as soon as they finish, whatever happens to later steps
+                render_inputs = [
+                    self.config['avatar']['image_path'],
+                    script.get('title', topic),
+                    file_digest(audio_path)
+                ]
+                if section_audio:
+                    render_future = self.render_pool.submit(
+                        propagate(step), 'render', render_inputs,
+                        lambda: self._render_sectioned_video(video_type, timestamp, section_audio, script, topic),
+                        lambda path: [path]
+                    )
                 else:
-                    full_script = script.get('main_content', topic)
+                    render_future = self.render_pool.submit(
+                        propagate(step), 'render', render_inputs,
+                        lambda: self._render_video(video_type, timestamp, audio_path, script, topic),
+                        lambda path: [path]
+                    )
+                
+                # Step 5: Generate thumbnail (placeholder for now)
+                # Step 6: Optimize for SEO
+                # Independent prompts, sent concurrently
+                print("\n🖼️ Step 5: Generating thumbnail...")
+                print("\n🔍 Step 6: Optimizing for SEO...")
+                try:
+                    thumbnail_data, seo_data = step(
+                        'metadata',
+                        [topic, script.get('title', topic), script.get('description', '')],
+                        lambda: asyncio.run(self._generate_publish_metadata(topic, script))
+                    )
+                except Exception:
+                    # Let the render finish and be checkpointed so a resume doesn't redo it
+                    wait([render_future])
+                    raise
+                print(f"✅ Thumbnail text: {thumbnail_data.get('main_text', topic)}")
+                print(f"✅ SEO optimized title: {seo_data.get('optimized_title', '')}")
+                
+                # Steps 5-6 only need the script, so they overlapped the render
+                final_video_path = render_future.result()
+                
+                # Compile results
+                result = {
+                    'video_path': str(final_video_path),
+                    'audio_path': str(audio_path),
+                    'topic': topic,
+                    'script': script,
+                    'trends': trends,
+                    'thumbnail': thumbnail_data,
+                    'seo': seo_data,
+                    'metadata': {
+                        'title': seo_data.get('optimized_title', script.get('title', topic)),
+                        'description': seo_data.get('optimized_description', script.get('description', '')),
+                        'tags': seo_data.get('suggested_tags', script.get('hashtags', [])),
+                        'hashtags': script.get('hashtags', [])
+                    },
+                    'timestamp': timestamp,
+                    'video_type': video_type,
+                    'run_id': manifest.run_id,
+                    # Where the time went: Gemini vs TTS vs rendering, per step
+                    'timing': tracer.breakdown(root)
+                }
+                
+                # Save metadata
+                metadata_path = self.log_dir / f"metadata_{video_type}_{timestamp}.json"
+                with open(metadata_path, 'w') as f:
+                    json.dump(result, f, indent=2)
+                
+                print("\n" + "="*60)
+                print("✅ Content generation complete!")
+                print(f"📹 Video: {final_video_path}")
+                print(f"📄 Metadata: {metadata_path}")
+                print(f"🆔 Run ID: {manifest.run_id}")
+                print(format_breakdown(result['timing']))
+                print("="*60)
+                
+                return result
+                
+            except Exception as e:
+                print(f"\n❌ Error during content generation: {e}")
+                import traceback
+                traceback.print_exc()
+                raise
+    
+    async def _generate_publish_metadata(self, topic: str, script: Dict):
+        """
+        Generate thumbnail text and SEO metadata concurrently
+        
+        Args:
+            topic: Video topic
+            script: Generated script
             
-            self.video_pipeline.text_to_speech(
-                text=full_script,
-                output_path=str(audio_path),
-                lang=self.config['avatar']['language']
+        Returns:
+            (thumbnail_data, seo_data)
+        """
+        return await asyncio.gather(
+            self.gemini.agenerate_thumbnail_text(topic),
+            self.gemini.aoptimize_for_seo(
+                title=script.get('title', topic),
+                description=script.get('description', '')
             )
-            print(f"✅ Audio generated: {audio_path}")
+        )
+    
+    @staticmethod
+    def _audio_inputs(text: str, lang: str) -> Dict:
+        return {'text': text, 'lang': lang, 'engine': 'gtts'}
+    
+    def _synthesize(self, text: str, lang: str) -> str:
+        """
+        Voice text into the artifact store (reused if already synthesized)
+        
+        Args:
+            text: Narration text
+            lang: Language code
             
-            # Step 4: Generate avatar video
-            print("\n🎭 Step 4: Generating avatar video...")
+        Returns:
+            Path to the audio artifact
+        """
+        return self.artifacts.get_or_create(
+            'audio', self._audio_inputs(text, lang), '.mp3',
+            lambda path: self.video_pipeline.text_to_speech(text=text, output_path=path, lang=lang)
+        )
+    
+    def _synthesize_sections(self, sections: List[str], lang: str) -> Dict:
+        """
+        Voice script sections concurrently and join them into one narration
+        
+        Args:
+            sections: Section texts in order
+            lang: Language code
             
-            if self.avatar_gen.is_available():
-                avatar_video_filename = f"avatar_{video_type}_{timestamp}.mp4"
-                avatar_video_path = self.video_dir / avatar_video_filename
-                
+        Returns:
+            Dictionary with per-section audio paths and the joined audio path
+        """
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix='section-tts') as executor:
+            section_audio = list(executor.map(propagate(lambda text: self._synthesize(text, lang)), sections))
+        audio_path = self.artifacts.get_or_create(
+            'audio', {'sections': [self._audio_inputs(text, lang) for text in sections]}, '.mp3',
+            lambda path: concat_mp3(section_audio, path)
+        )
+        return {'sections': section_audio, 'audio_path': audio_path}
+    
+    def _render_video(
+        self,
+        video_type: str,
+        timestamp: str,
+        audio_path: str,
+        script: Dict,
+        topic: str
+    ) -> str:
+        """
+        Render the final video (SadTalker avatar or simple fallback)
+        
+        The render is stored by its inputs, so an identical render is
+        reused instead of redone.
+        
+        Args:
+            video_type: "long_form" or "short_form"
+            timestamp: Run timestamp used in file names
+            audio_path: Voiceover audio
+            script: Generated script
+            topic: Video topic
+            
+        Returns:
+            Path to rendered video
+        """
+        print("\n🎭 Step 4: Generating avatar video...")
+        image_path = self.config['avatar']['image_path']
+        inputs = {
+            'audio': file_digest(audio_path),
+            'image': file_digest(image_path),
+            'video_type': video_type
+        }
+        
+        if self.avatar_gen.is_available():
+            inputs['renderer'] = 'sadtalker'
+            
+            def produce(path: str):
                 self.avatar_gen.generate_talking_video(
-                    image_path=self.config['avatar']['image_path'],
-                    audio_path=str(audio_path),
-                    output_path=str(avatar_video_path),
+                    image_path=image_path,
+                    audio_path=audio_path,
+                    output_path=path,
                     still_mode=True,
                     expression_scale=1.0
                 )
-                print(f"✅ Avatar video generated: {avatar_video_path}")
-                final_video_path = avatar_video_path
-            else:
-                print("⚠️ SadTalker not available, creating simple video...")
-                simple_video_filename = f"simple_{video_type}_{timestamp}.mp4"
-                simple_video_path = self.video_dir / simple_video_filename
-                
-                self.video_pipeline.create_simple_video(
-                    image_path=self.config['avatar']['image_path'],
-                    audio_path=str(audio_path),
-                    output_path=str(simple_video_path),
-                    add_text=script.get('title', topic)
-                )
-                print(f"✅ Simple video generated: {simple_video_path}")
-                final_video_path = simple_video_path
             
-            # Step 5: Generate thumbnail (placeholder for now)
-            print("\n🖼️ Step 5: Generating thumbnail...")
-            thumbnail_data = self.gemini.generate_thumbnail_text(topic)
-            print(f"✅ Thumbnail text: {thumbnail_data.get('main_text', topic)}")
+            prefix = 'avatar'
+        else:
+            print("⚠️ SadTalker not available, creating simple video...")
+            title = script.get('title', topic)
+            inputs.update(renderer='simple', title=title)
             
-            # Step 6: Optimize for SEO
-            print("\n🔍 Step 6: Optimizing for SEO...")
-            seo_data = self.gemini.optimize_for_seo(
-                title=script.get('title', topic),
-                description=script.get('description', '')
-            )
-            print(f"✅ SEO optimized title: {seo_data.get('optimized_title', '')}")
-            
-            # Compile results
-            result = {
-                'video_path': str(final_video_path),
-                'audio_path': str(audio_path),
-                'topic': topic,
-                'script': script,
-                'trends': trends,
-                'thumbnail': thumbnail_data,
-                'seo': seo_data,
-                'metadata': {
-                    'title': seo_data.get('optimized_title', script.get('title', topic)),
-                    'description': seo_data.get('optimized_description', script.get('description', '')),
-                    'tags': seo_data.get('suggested_tags', script.get('hashtags', [])),
-                    'hashtags': script.get('hashtags', [])
-                },
-                'timestamp': timestamp,
-                'video_type': video_type
-            }
-            
-            # Save metadata
-            metadata_path = self.log_dir / f"metadata_{video_type}_{timestamp}.json"
-            with open(metadata_path, 'w') as f:
-                json.dump(result, f, indent=2)
+            def produce(path: str):
+                self.video_pipeline.create_simple_video(
+                    image_path=image_path,
+                    audio_path=audio_path,
+                    output_path=path,
+                    add_text=title
+                )
             
-            print("\n" + "="*60)
-            print("✅ Content generation complete!")
-            print(f"📹 Video: {final_video_path}")
-            print(f"📄 Metadata: {metadata_path}")
-            print("="*60)
+            prefix = 'simple'
+        
+        artifact = self.artifacts.get_or_create('video', inputs, '.mp4', produce)
+        final_video_path = self.artifacts.export(artifact, str(self.video_dir / f"{prefix}_{video_type}_{timestamp}.mp4"))
+        print(f"✅ {prefix.capitalize()} video generated: {final_video_path}")
+        return final_video_path
+    
+    def _render_sectioned_video(
+        self,
+        video_type: str,
+        timestamp: str,
+        section_audio: List[str],
+        script: Dict,
+        topic: str,
+        max_attempts: int = 3
+    ) -> str:
+        """
+        Render each voiced script section separately, then join them
+        
+        Sections are rendered in parallel; a failed section is retried on
+        its own instead of restarting the whole video. Finished sections
+        are kept in the artifact store, so a later run with the same
+        sections only renders what is missing.
+        
+        Args:
+            video_type: "long_form" or "short_form"
+            timestamp: Run timestamp used in file names
+            section_audio: Section narration files in order
+            script: Generated script
+            topic: Video topic
+            max_attempts: Attempts per section
             
-            return result
+        Returns:
+            Path to rendered video
+        """
+        print(f"\n🎭 Step 4: Rendering {len(section_audio)} sections...")
+        image_path = self.config['avatar']['image_path']
+        title = script.get('title', topic)
+        available = self.avatar_gen.is_available()
+        inputs = {
+            'sections': [file_digest(path) for path in section_audio],
+            'image': file_digest(image_path),
+            'video_type': video_type,
+            'renderer': 'sadtalker' if available else 'simple'
+        }
+        if not available:
+            inputs['title'] = title
+        segment_dir = self.artifacts.path_for('segments', inputs, '')
+        
+        def produce(path: str):
+            if available:
+                # batch_generate skips finished segments, so a retry only re-renders failures
+                segments = []
+                for attempt in range(1, max_attempts + 1):
+                    segments = self.avatar_gen.batch_generate(
+                        image_path=image_path,
+                        audio_files=section_audio,
+                        output_dir=str(segment_dir),
+                        still_mode=True,
+                        expression_scale=1.0
+                    )
+                    if len(segments) == len(section_audio):
+                        break
+                    if attempt < max_attempts:
+                        print(f"⚠️ {len(section_audio) - len(segments)} section(s) failed, retrying (attempt {attempt + 1}/{max_attempts})")
+                if len(segments) < len(section_audio):
+                    raise RuntimeError(
+                        f"{len(section_audio) - len(segments)} of {len(section_audio)} sections failed after {max_attempts} attempts"
+                    )
+            else:
+                print("⚠️ SadTalker not available, creating simple section videos...")
+                segment_dir.mkdir(parents=True, exist_ok=True)
+                retry_policy = RetryPolicy(
+                    max_attempts=max_attempts,
+                    base_delay=1.0,
+                    retry_on=(Exception,),
+                    on_retry=lambda attempt, delay, e: print(f"⚠️ Section render failed ({e}), retry {attempt}")
+                )
+                
+                def render_section(i: int) -> str:
+                    section_path = str(segment_dir / f"segment_{i:03d}.mp4")
+                    if not os.path.exists(section_path):
+                        retry_policy.call(
+                            self.video_pipeline.create_simple_video,
+                            image_path, section_audio[i], section_path, add_text=title
+                        )
+                    return section_path
+                
+                with ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='section-render') as executor:
+                    segments = list(executor.map(propagate(render_section), range(len(section_audio))))
             
-        except Exception as e:
-            print(f"\n❌ Error during content generation: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
+            self.video_pipeline.combine_videos(segments, path)
+        
+        artifact = self.artifacts.get_or_create('video', inputs, '.mp4', produce)
+        prefix = 'avatar' if available else 'simple'
+        final_video_path = self.artifacts.export(artifact, str(self.video_dir / f"{prefix}_{video_type}_{timestamp}.mp4"))
+        print(f"✅ {prefix.capitalize()} video generated: {final_video_path}")
+        return final_video_path
     
     def generate_short_from_long(self, long_video_metadata: Dict) -> Dict:
         """
@@ -233,32 +638,76 @@ class AIInfluencerAutomation:
         
         print("⚠️ Publishing not yet implemented. Add your publishing agent integration here.")
     
-    def run_daily_automation(self):
-        """Run complete daily automation workflow"""
+    def run_daily_automation(
+        self,
+        run_id: Optional[str] = None,
+        topic: Optional[str] = None,
+        on_stage: Optional[Callable[[str, float], None]] = None
+    ):
+        """
+        Run complete daily automation workflow
+        
+        Args:
+            run_id: Run to resume (default: start a new run)
+            topic: Topic to use instead of running trend analysis
+            on_stage: Called with (step name, seconds) for each step that ran
+        """
         print("\n" + "="*60)
         print("🤖 AI INFLUENCER DAILY AUTOMATION")
         print("="*60)
         
-        try:
-            # Generate long-form content
-            long_content = self.generate_daily_content(video_type="long_form")
-            
-            # Generate short-form content
-            short_content = self.generate_daily_content(video_type="short_form")
-            
-            # Publish (when implemented)
-            # self.publish_content(long_content)
-            # self.publish_content(short_content)
+        with trace_run('daily_automation'):
+            manifest = self.open_run(run_id)
+            print(f"🆔 Run ID: {manifest.run_id} (resume with --resume {manifest.run_id})")
             
-            print("\n✅ Daily automation complete!")
-            return {
-                'long_form': long_content,
-                'short_form': short_content
-            }
-            
-        except Exception as e:
-            print(f"\n❌ Daily automation failed: {e}")
-            raise
+            try:
+                # One trend analysis shared by both variants
+                if topic:
+                    trends = self._topic_trends(topic)
+                else:
+                    trends = self._run_step(
+                        manifest, 'trends', [self.config['influencer']['niche']], self.analyze_trends, on_stage=on_stage
+                    )
+                
+                if self.parallel_variants:
+                    # LLM/TTS waits of one variant overlap the other's rendering
+                    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='variant') as executor:
+                        long_future = executor.submit(
+                            propagate(self.generate_daily_content), "long_form", trends, manifest.run_id, on_stage=on_stage
+                        )
+                        short_future = executor.submit(
+                            propagate(self.generate_daily_content), "short_form", trends, manifest.run_id, on_stage=on_stage
+                        )
+                        long_content = long_future.result()
+                        short_content = short_future.result()
+                else:
+                    long_content = self.generate_daily_content(
+                        video_type="long_form", trends=trends, run_id=manifest.run_id, on_stage=on_stage
+                    )
+                    short_content = self.generate_daily_content(
+                        video_type="short_form", trends=trends, run_id=manifest.run_id, on_stage=on_stage
+                    )
+                
+                # Publish (when implemented)
+                # self.publish_content(long_content)
+                # self.publish_content(short_content)
+                
+                print("\n✅ Daily automation complete!")
+                if self.gemini.cache is not None:
+                    stats = self.gemini.cache.stats()
+                    print(f"📦 Gemini cache: {stats['hits']} hits / {stats['misses']} misses")
+                if self.video_pipeline.audio_cache is not None:
+                    stats = self.video_pipeline.audio_cache.stats()
+                    print(f"🔊 Audio cache: {stats['hit_rate']:.0%} hit rate, "
+                          f"{stats['bytes_saved'] / 1024:.0f} KB not re-synthesized")
+                return {
+                    'long_form': long_content,
+                    'short_form': short_content
+                }
+                
+            except Exception as e:
+                print(f"\n❌ Daily automation failed: {e}")
+                raise
 
 
 # Example usage
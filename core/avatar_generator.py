@@ -3,9 +3,77 @@ Avatar Generator - Integrates SadTalker for talking head videos
 """
 
 import os
-import sys
+import json
+import queue
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+
+from .sadtalker_worker import SadTalkerWorker
+from .tracing import propagate, traced
+
+# Approximate resident memory of one SadTalker worker (checkpoints + 512px renderer)
+WORKER_MEMORY_GB = float(os.getenv('SADTALKER_WORKER_MEMORY_GB', '3'))
+# Approximate extra memory per renderer batch item
+BATCH_ITEM_MEMORY_GB = 1.0
+MAX_RENDER_BATCH = 8
+# Fewer threads than this per worker and torch's own parallelism stops paying off
+MIN_THREADS_PER_WORKER = 2
+
+
+def available_memory_gb() -> Optional[float]:
+    """Available system memory in GB, or None if it cannot be determined"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 1024 ** 3
+    except ImportError:
+        pass
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024 ** 2
+    except OSError:
+        pass
+    return None
+
+
+def plan_batch_resources(
+    num_segments: int,
+    max_workers: Optional[int] = None
+) -> Tuple[int, int, int]:
+    """
+    Size a render pool for the host
+
+    Args:
+        num_segments: Segments waiting to be rendered
+        max_workers: Upper bound on workers (default: cores / MIN_THREADS_PER_WORKER)
+
+    Returns:
+        (workers, threads_per_worker, renderer_batch_size)
+    """
+    cores = os.cpu_count() or 1
+    workers = max_workers or max(1, cores // MIN_THREADS_PER_WORKER)
+    memory = available_memory_gb()
+    if memory is not None:
+        workers = min(workers, max(1, int(memory // WORKER_MEMORY_GB)))
+    workers = max(1, min(workers, num_segments))
+
+    batch_size = 1
+    if memory is not None:
+        spare = memory / workers - WORKER_MEMORY_GB
+        batch_size = max(1, min(MAX_RENDER_BATCH, 1 + int(spare // BATCH_ITEM_MEMORY_GB)))
+    return workers, max(1, cores // workers), batch_size
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 class AvatarGenerator:
@@ -23,8 +91,13 @@ class AvatarGenerator:
             sadtalker_path: Path to SadTalker repository
             checkpoint_path: Path to SadTalker checkpoints
         """
-        self.sadtalker_path = Path(sadtalker_path or os.getenv('SADTALKER_PATH', './tools/SadTalker'))
-        self.checkpoint_path = Path(checkpoint_path or os.getenv('SADTALKER_CHECKPOINT_PATH', './tools/SadTalker/checkpoints'))
+        self.sadtalker_path = Path(
+            sadtalker_path or os.getenv('SADTALKER_PATH', './tools/SadTalker')
+        )
+        self.checkpoint_path = Path(
+            checkpoint_path
+            or os.getenv('SADTALKER_CHECKPOINT_PATH', './tools/SadTalker/checkpoints')
+        )
         
         # Check if SadTalker exists
         if not self.sadtalker_path.exists():
@@ -32,11 +105,20 @@ class AvatarGenerator:
             print("   Please clone SadTalker or set SADTALKER_PATH")
             self.available = False
         else:
-            # Add SadTalker to path
-            sys.path.insert(0, str(self.sadtalker_path))
             self.available = True
             print(f"✅ SadTalker found at: {self.sadtalker_path}")
+        
+        # Persistent worker for sequential renders: checkpoints are loaded
+        # once, on the first render, and torch uses every core
+        self.worker = SadTalkerWorker(
+            sadtalker_path=str(self.sadtalker_path),
+            checkpoint_path=str(self.checkpoint_path)
+        )
+        # Thread-capped workers for parallel batches; kept (models loaded) until close()
+        self._extra_workers: List[SadTalkerWorker] = []
+        self._pool_lock = threading.Lock()
     
+    @traced('sadtalker.render', output_file=True)
     def generate_talking_video(
         self,
         image_path: str,
@@ -46,7 +128,9 @@ class AvatarGenerator:
         preprocess: str = 'crop',
         still_mode: bool = True,
         expression_scale: float = 1.0,
-        pose_style: int = 0
+        pose_style: int = 0,
+        batch_size: int = 1,
+        worker: Optional[SadTalkerWorker] = None
     ) -> str:
         """
         Generate talking head video using SadTalker
@@ -60,6 +144,8 @@ class AvatarGenerator:
             still_mode: Minimize head movement
             expression_scale: Expression intensity (0.0-2.0)
             pose_style: Pose style (0-45)
+            batch_size: Renderer batch size (higher is faster but uses more memory)
+            worker: Worker process to render on (default: this generator's worker)
             
         Returns:
             Path to generated video
@@ -72,31 +158,22 @@ class AvatarGenerator:
             print(f"   Image: {image_path}")
             print(f"   Audio: {audio_path}")
             
-            # Import SadTalker inference
-            try:
-                from inference import main as sadtalker_inference
-            except ImportError:
-                print("❌ Could not import SadTalker. Make sure it's properly installed.")
-                raise
-            
             # Prepare output directory
             output_dir = Path(output_path).parent
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Run SadTalker inference
-            result = sadtalker_inference(
+            # Run SadTalker inference on the warm worker, straight to output_path
+            result = (worker or self.worker).render(
                 source_image=str(image_path),
                 driven_audio=str(audio_path),
-                result_dir=str(output_dir),
+                output_path=str(output_path),
                 enhancer=enhancer,
                 preprocess=preprocess,
-                still_mode=still_mode,
-                use_idle_mode=False,
-                batch_size=1,
+                still=still_mode,
+                batch_size=batch_size,
                 size=512,
                 pose_style=pose_style,
-                expression_scale=expression_scale,
-                checkpoint_dir=str(self.checkpoint_path)
+                expression_scale=expression_scale
             )
             
             print(f"✅ Avatar video generated: {result}")
@@ -106,53 +183,161 @@ class AvatarGenerator:
             print(f"❌ Error generating avatar video: {e}")
             raise
     
+    @traced('sadtalker.batch')
     def batch_generate(
         self,
         image_path: str,
         audio_files: List[str],
         output_dir: str,
+        max_workers: Optional[int] = None,
+        resume: bool = True,
         **kwargs
     ) -> List[str]:
         """
         Generate multiple videos from audio files
         
+        Segments are rendered in parallel on a pool of SadTalker worker
+        processes (each with its own loaded models), sized to the host's
+        cores and memory. The pool is kept between calls until close().
+        Finished segments are recorded in batch_manifest.json so a rerun
+        after a crash only renders the rest.
+        
         Args:
             image_path: Path to influencer image
             audio_files: List of audio file paths
             output_dir: Directory to save videos
+            max_workers: Upper bound on parallel workers (1 = sequential)
+            resume: Reuse segments finished by a previous run
             **kwargs: Additional arguments for generate_talking_video
             
         Returns:
-            List of generated video paths
+            List of generated video paths, in segment order (failed segments omitted)
         """
-        results = []
+        if not self.available:
+            raise RuntimeError("SadTalker not available. Please set it up first.")
+        
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
+        manifest_path = output_path / 'batch_manifest.json'
+        manifest = self._load_manifest(manifest_path) if resume else {}
+        manifest_lock = threading.Lock()
+        
+        # A segment is done if the same image, audio and settings produced its video
+        base = hashlib.sha256(
+            (_file_digest(image_path) + json.dumps(kwargs, sort_keys=True, default=str)).encode()
+        ).hexdigest()
+        fingerprints = [
+            hashlib.sha256((base + _file_digest(audio_file)).encode()).hexdigest()
+            for audio_file in audio_files
+        ]
+        video_paths = [output_path / f"segment_{i:03d}.mp4" for i in range(len(audio_files))]
+        results: List[Optional[str]] = [None] * len(audio_files)
+        pending = []
+        for i, video_path in enumerate(video_paths):
+            if manifest.get(video_path.name) == fingerprints[i] and video_path.exists():
+                results[i] = str(video_path)
+            else:
+                pending.append(i)
+        if len(pending) < len(audio_files):
+            print(f"♻️ Resuming: {len(audio_files) - len(pending)}/{len(audio_files)} "
+                  f"segments already rendered")
+        if not pending:
+            return [r for r in results if r]
         
-        for i, audio_file in enumerate(audio_files):
+        workers, threads, batch_size = plan_batch_resources(len(pending), max_workers)
+        kwargs.setdefault('batch_size', batch_size)
+        print(f"🎬 Rendering {len(pending)} segments on {workers} worker(s), "
+              f"batch size {kwargs['batch_size']}")
+        
+        pool = self._worker_pool(workers, threads)
+        idle = queue.Queue()
+        for worker in pool:
+            idle.put(worker)
+        
+        def render(i: int):
             print(f"\n🎬 Generating video {i+1}/{len(audio_files)}...")
-            
-            video_path = output_path / f"segment_{i:03d}.mp4"
-            
+            worker = idle.get()
             try:
-                result = self.generate_talking_video(
+                self.generate_talking_video(
                     image_path=image_path,
-                    audio_path=audio_file,
-                    output_path=str(video_path),
+                    audio_path=audio_files[i],
+                    output_path=str(video_paths[i]),
+                    worker=worker,
                     **kwargs
                 )
-                results.append(result)
             except Exception as e:
                 print(f"⚠️ Failed to generate video {i+1}: {e}")
-                continue
+                return
+            finally:
+                idle.put(worker)
+            results[i] = str(video_paths[i])
+            with manifest_lock:
+                manifest[video_paths[i].name] = fingerprints[i]
+                self._save_manifest(manifest_path, manifest)
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sadtalker') as executor:
+            list(executor.map(propagate(render), pending))
         
-        print(f"\n✅ Generated {len(results)}/{len(audio_files)} videos")
-        return results
+        done = [r for r in results if r]
+        print(f"\n✅ Generated {len(done)}/{len(audio_files)} videos")
+        return done
+    
+    def _worker_pool(self, workers: int, threads: int) -> List[SadTalkerWorker]:
+        """
+        Get `workers` worker processes, starting more only if needed
+        
+        Workers persist across batches (and retries), so each loads its
+        checkpoints once. Thread counts are fixed when a worker is created.
+        A single worker is this generator's own (all cores); parallel pools
+        only use thread-capped workers, so the batch never runs more torch
+        threads than the host has cores.
+        
+        Args:
+            workers: Workers wanted
+            threads: Torch threads for newly created workers
+            
+        Returns:
+            [self.worker] for one worker, otherwise `workers` extra workers
+        """
+        if workers <= 1:
+            return [self.worker]
+        with self._pool_lock:
+            while len(self._extra_workers) < workers:
+                self._extra_workers.append(SadTalkerWorker(
+                    sadtalker_path=str(self.sadtalker_path),
+                    checkpoint_path=str(self.checkpoint_path),
+                    device=self.worker.device,
+                    threads=threads
+                ))
+            return self._extra_workers[:workers]
+    
+    @staticmethod
+    def _load_manifest(path: Path) -> Dict[str, str]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _save_manifest(path: Path, manifest: Dict[str, str]):
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
     
     def is_available(self) -> bool:
         """Check if SadTalker is available"""
         return self.available
     
+    def close(self):
+        """Stop the SadTalker worker processes"""
+        self.worker.close()
+        with self._pool_lock:
+            for worker in self._extra_workers:
+                worker.close()
+            self._extra_workers = []
+    
     @staticmethod
     def setup_instructions():
         """Print setup instructions for SadTalker"""
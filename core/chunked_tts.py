@@ -0,0 +1,166 @@
+"""
+Chunked TTS - Parallel synthesis of long narration
+Splits text at sentence boundaries, synthesizes chunks concurrently and
+joins them into one MP3 without re-encoding; chunks can be served from
+the audio cache
+"""
+
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .audio_utils import split_sentences, concat_mp3
+from .retry import RetryPolicy
+from .audio_cache import AudioCache
+
+
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """
+    Group sentences into chunks of at most max_chars
+
+    Sentences longer than max_chars are split at commas, then at spaces.
+
+    Args:
+        text: Input text
+        max_chars: Target maximum chunk length
+
+    Returns:
+        Chunks in reading order
+    """
+    pieces = []
+    for sentence in split_sentences(text):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        words = []
+        for part in re.split(r'(?<=,)\s+|\s+', sentence):
+            if words and len(' '.join(words + [part])) > max_chars:
+                pieces.append(' '.join(words))
+                words = []
+            words.append(part)
+        if words:
+            pieces.append(' '.join(words))
+
+    chunks, current = [], ''
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class ChunkedSynthesizer:
+    """Synthesizes long text as concurrent chunks through a TTS backend"""
+
+    def __init__(
+        self,
+        backend: Callable[[str, str], None],
+        chunk_chars: int = 500,
+        max_workers: int = 4,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[AudioCache] = None,
+        engine: str = 'gtts',
+        voice: str = 'en',
+        rate: str = 'normal'
+    ):
+        """
+        Initialize chunked synthesizer
+
+        Args:
+            backend: Callable(text, output_path) writing one MP3
+            chunk_chars: Target maximum characters per chunk
+            max_workers: Concurrent backend calls
+            retry_policy: Per-chunk retry policy (default: 3 attempts on any error)
+            cache: Audio cache; cached sentences are reused, the rest is still chunked
+            engine: TTS engine name (part of the cache key)
+            voice: Voice name or language (part of the cache key)
+            rate: Speaking rate (part of the cache key)
+        """
+        self.backend = backend
+        self.chunk_chars = chunk_chars
+        self.max_workers = max_workers
+        self.cache = cache
+        self.engine = engine
+        self.voice = voice
+        self.rate = rate
+        self.last_stats: Dict = {}
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=3,
+            base_delay=1.0,
+            retry_on=(Exception,),
+            on_retry=lambda attempt, delay, e: print(
+                f"⚠️ TTS chunk failed ({e}), retry {attempt} in {delay:.1f}s"
+            )
+        )
+
+    def _units(self, text: str) -> List[str]:
+        if self.cache is None:
+            return chunk_text(text, self.chunk_chars)
+        # Sentences already in the cache (intros, CTAs) are reused as they are;
+        # runs of the others are packed back into chunks, so a cold cache costs
+        # no more requests than no cache. Those chunks are cached whole, which
+        # makes an identical rerun a full hit.
+        units, pending = [], []
+        for sentence in (unit for s in split_sentences(text) for unit in chunk_text(s, self.chunk_chars)):
+            if self.cache.contains(self.cache.make_key(sentence, self.voice, self.engine, self.rate)):
+                if pending:
+                    units.extend(chunk_text(' '.join(pending), self.chunk_chars))
+                    pending = []
+                units.append(sentence)
+            else:
+                pending.append(sentence)
+        if pending:
+            units.extend(chunk_text(' '.join(pending), self.chunk_chars))
+        return units
+
+    def _synthesize_unit(self, text: str, output_path: str) -> bool:
+        """Synthesize one chunk; returns True if it came from the cache"""
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(text, self.voice, self.engine, self.rate)
+            if self.cache.fetch(key, output_path):
+                return True
+        self.retry_policy.call(self.backend, text, output_path)
+        if key:
+            self.cache.store(key, output_path)
+        return False
+
+    def synthesize(self, text: str, output_path: str) -> str:
+        """
+        Synthesize text into one MP3
+
+        Args:
+            text: Text to speak
+            output_path: Where to save audio file
+
+        Returns:
+            Path to generated audio file
+        """
+        chunks = self._units(text)
+        if len(chunks) <= 1:
+            hit = self._synthesize_unit(text, output_path)
+            self.last_stats = {'chunks': 1, 'cache_hits': int(hit)}
+            return output_path
+
+        work_dir = Path(tempfile.mkdtemp(prefix='tts_chunks_', dir=str(Path(output_path).parent)))
+        try:
+            paths = [str(work_dir / f"chunk_{i:04d}.mp3") for i in range(len(chunks))]
+            # Each chunk retries on its own; finished chunks are never redone
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='tts') as executor:
+                futures = [
+                    executor.submit(self._synthesize_unit, chunk, path)
+                    for chunk, path in zip(chunks, paths)
+                ]
+                hits = sum(future.result() for future in futures)
+            concat_mp3(paths, output_path)
+            self.last_stats = {'chunks': len(chunks), 'cache_hits': hits}
+            return output_path
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,200 @@
+"""
+Face Cache - Content-addressed cache for SadTalker face preprocessing
+Stores the cropped image, landmarks and 3DMM source coefficients per avatar image
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = Path(os.getenv('AI_INFLUENCER_CACHE_DIR', str(PROJECT_ROOT / 'output' / 'cache'))) / 'faces'
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Convert numpy scalars/arrays and tuples in crop_info to plain JSON types"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    return value
+
+
+def _to_tuples(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_to_tuples(v) for v in value)
+    return value
+
+
+class FaceCache:
+    """
+    Disk cache of SadTalker preprocess results
+
+    Entries are keyed on the image content hash, preprocess mode and face
+    size, so editing the avatar image produces a new key. Older entries for
+    the same image path are dropped when a new one is stored.
+
+    Several worker processes may share the directory: entries are staged
+    in private temp dirs and published with an atomic rename, and the
+    first writer of a key wins.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize face cache
+
+        Args:
+            cache_dir: Directory for cache entries (default: output/cache/faces)
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR).resolve()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._entries: Dict[str, Tuple[str, str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _image_hash(self, image_path: str) -> str:
+        # Re-hash only when the file's size or mtime changes
+        stat = os.stat(image_path)
+        stamp = (os.path.abspath(image_path), stat.st_size, stat.st_mtime_ns)
+        if stamp not in self._hashes:
+            digest = hashlib.sha256()
+            with open(image_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            self._hashes[stamp] = digest.hexdigest()
+        return self._hashes[stamp]
+
+    def make_key(self, image_path: str, preprocess: str, size: int) -> str:
+        """
+        Build the cache key for an image and preprocess settings
+
+        Args:
+            image_path: Path to source image
+            preprocess: Preprocessing mode ('crop', 'full', ...)
+            size: Face model resolution
+
+        Returns:
+            Hex cache key
+        """
+        raw = f"{self._image_hash(image_path)}|{preprocess}|{size}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[Tuple[str, str, Any]]:
+        """
+        Look up cached preprocess output
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            (first_coeff_path, crop_pic_path, crop_info) or None
+        """
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+
+            entry_dir = self.cache_dir / key
+            if not (entry_dir / 'entry.json').exists():
+                return None
+            entry = self._read_entry(entry_dir)
+            if entry is None:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                return None
+            self._entries[key] = entry
+            return entry
+
+    @staticmethod
+    def _read_entry(entry_dir: Path) -> Optional[Tuple[str, str, Any]]:
+        """Load a published entry, or None if it is incomplete"""
+        try:
+            with open(entry_dir / 'entry.json', 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        coeff_path = entry_dir / meta['coeff_file']
+        crop_pic_path = entry_dir / meta['crop_pic_file']
+        if not coeff_path.exists() or not crop_pic_path.exists():
+            return None
+        return (str(coeff_path), str(crop_pic_path), _to_tuples(meta['crop_info']))
+
+    def put(
+        self,
+        key: str,
+        image_path: str,
+        first_coeff_path: str,
+        crop_pic_path: str,
+        crop_info: Any
+    ) -> Tuple[str, str, Any]:
+        """
+        Store preprocess output (coefficients, cropped image and landmarks)
+
+        Args:
+            key: Cache key from make_key
+            image_path: Source image the entry was computed from
+            first_coeff_path: Path to the source 3DMM coefficients (.mat)
+            crop_pic_path: Path to the cropped image
+            crop_info: SadTalker crop info tuple
+
+        Returns:
+            (first_coeff_path, crop_pic_path, crop_info) pointing into the cache
+            (the existing entry if another process stored the key first)
+        """
+        with self._lock:
+            image_path = os.path.abspath(image_path)
+            image_hash = self._image_hash(image_path)
+            self._evict_source(image_path, image_hash)
+
+            entry_dir = self.cache_dir / key
+            # Private staging dir: other processes may be writing the same key
+            tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key}.", suffix='.tmp', dir=self.cache_dir))
+
+            shutil.copy2(first_coeff_path, tmp_dir / Path(first_coeff_path).name)
+            shutil.copy2(crop_pic_path, tmp_dir / Path(crop_pic_path).name)
+
+            # Landmarks are written next to the cropped image as <name>_landmarks.txt
+            landmarks = Path(crop_pic_path).with_name(Path(crop_pic_path).stem + '_landmarks.txt')
+            if landmarks.exists():
+                shutil.copy2(landmarks, tmp_dir / landmarks.name)
+
+            meta = {
+                'source_image': image_path,
+                'image_hash': image_hash,
+                'coeff_file': Path(first_coeff_path).name,
+                'crop_pic_file': Path(crop_pic_path).name,
+                'crop_info': _to_jsonable(crop_info)
+            }
+            with open(tmp_dir / 'entry.json', 'w') as f:
+                json.dump(meta, f, indent=2)
+
+            try:
+                # Fails if the key is already published; that entry may be in use, so keep it
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            entry = self._read_entry(entry_dir)
+            if entry is None:
+                # Unreadable entry from someone else: use this render's own files uncached
+                return first_coeff_path, crop_pic_path, crop_info
+            self._entries[key] = entry
+            return entry
+
+    def _evict_source(self, image_path: str, image_hash: str):
+        """Drop entries computed from an earlier version of the image"""
+        for meta_path in self.cache_dir.glob('*/entry.json'):
+            if meta_path.parent.name.startswith('.'):
+                # Another process's staging dir
+                continue
+            try:
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if meta.get('source_image') == image_path and meta.get('image_hash') != image_hash:
+                shutil.rmtree(meta_path.parent, ignore_errors=True)
+                self._entries.pop(meta_path.parent.name, None)
@@ -0,0 +1,148 @@
+"""
+FFmpeg Utilities - Locate, probe and run ffmpeg directly
+Lets the video pipeline skip MoviePy's per-frame Python path when it can
+"""
+
+import os
+import re
+import shutil
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class FFmpegError(RuntimeError):
+    """Raised when ffmpeg is missing or exits with an error"""
+
+
+@lru_cache(maxsize=1)
+def get_ffmpeg_exe() -> Optional[str]:
+    """
+    Find an ffmpeg binary
+
+    Prefers the one bundled with imageio-ffmpeg (the binary MoviePy uses),
+    then ffmpeg on PATH.
+
+    Returns:
+        Path to ffmpeg, or None if unavailable
+    """
+    override = os.getenv('FFMPEG_BINARY')
+    if override and override != 'auto-detect':
+        return override
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which('ffmpeg')
+
+
+def run_ffmpeg(args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """
+    Run ffmpeg with the given arguments
+
+    Args:
+        args: Arguments after the executable ('-y' and quiet logging are added)
+        timeout: Seconds before the process is killed
+
+    Returns:
+        Completed process
+
+    Raises:
+        FFmpegError: If ffmpeg is unavailable or fails
+    """
+    exe = get_ffmpeg_exe()
+    if not exe:
+        raise FFmpegError("ffmpeg not found (pip install imageio-ffmpeg)")
+    cmd = [exe, '-hide_banner', '-nostdin', '-loglevel', 'error', '-y'] + [str(a) for a in args]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        raise FFmpegError(f"ffmpeg timed out after {timeout}s") from e
+    if result.returncode != 0:
+        tail = (result.stderr or '').strip().splitlines()[-5:]
+        raise FFmpegError(f"ffmpeg exited with {result.returncode}: {' | '.join(tail)}")
+    return result
+
+
+_DURATION = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+_STREAM = re.compile(r'Stream #\d+:\d+.*?: (Video|Audio): (.*)')
+_SIZE = re.compile(r'^(\d+)x(\d+)')
+_FPS = re.compile(r'^([\d.]+) fps')
+_RATE = re.compile(r'^(\d+) Hz')
+
+
+def _split_fields(text: str) -> List[str]:
+    """Split a stream description on commas outside parentheses"""
+    fields, depth, current = [], 0, ''
+    for char in text:
+        if char == ',' and depth == 0:
+            fields.append(current.strip())
+            current = ''
+            continue
+        depth += {'(': 1, ')': -1}.get(char, 0)
+        current += char
+    fields.append(current.strip())
+    return fields
+
+
+def probe_media(path: str) -> Dict:
+    """
+    Read basic stream information from `ffmpeg -i`
+
+    Args:
+        path: Media file path
+
+    Returns:
+        Dictionary with duration and, when present, video (codec, pix_fmt,
+        width, height, fps) and audio (codec, sample_rate, channels) entries
+
+    Raises:
+        FFmpegError: If ffmpeg is unavailable or cannot read the file
+    """
+    exe = get_ffmpeg_exe()
+    if not exe:
+        raise FFmpegError("ffmpeg not found (pip install imageio-ffmpeg)")
+    if not Path(path).exists():
+        raise FFmpegError(f"File not found: {path}")
+    # Without an output ffmpeg exits non-zero but still prints the input info
+    stderr = subprocess.run(
+        [exe, '-hide_banner', '-nostdin', '-i', str(path)],
+        capture_output=True, text=True
+    ).stderr
+
+    info: Dict = {'duration': None, 'video': None, 'audio': None}
+    match = _DURATION.search(stderr)
+    if match:
+        hours, minutes, seconds = match.groups()
+        info['duration'] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    for line in stderr.splitlines():
+        match = _STREAM.search(line)
+        if not match:
+            continue
+        kind, fields = match.group(1).lower(), _split_fields(match.group(2))
+        if info[kind] is not None:
+            continue
+        codec = fields[0].split()[0]
+        if kind == 'video':
+            size = next((_SIZE.match(f) for f in fields if _SIZE.match(f)), None)
+            fps = next((_FPS.match(f) for f in fields if _FPS.match(f)), None)
+            info['video'] = {
+                'codec': codec,
+                'pix_fmt': fields[1].split('(')[0] if len(fields) > 1 else None,
+                'width': int(size.group(1)) if size else None,
+                'height': int(size.group(2)) if size else None,
+                'fps': float(fps.group(1)) if fps else None
+            }
+        else:
+            rate = next((_RATE.match(f) for f in fields if _RATE.match(f)), None)
+            info['audio'] = {
+                'codec': codec,
+                'sample_rate': int(rate.group(1)) if rate else None,
+                'channels': fields[2] if len(fields) > 2 else None
+            }
+
+    if info['duration'] is None and info['video'] is None and info['audio'] is None:
+        raise FFmpegError(f"Could not read media info from {path}")
+    return info
@@ -6,50 +6,251 @@ Handles all content generation using Google's Gemini API
 import os
 import json
 import re
-from typing import Dict, List, Optional
-import google.generativeai as genai
+import asyncio
+import weakref
+import threading
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .rate_limit import TokenBucket
+from .response_cache import ResponseCache
+from .retry import RetryPolicy, get_breaker
+from .tracing import span
 
 
 class GeminiClient:
     """Wrapper for Google Gemini API - FREE tier"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Response cache lifetime per method (seconds; None = never expires)
+    CACHE_TTLS = {
+        'trend_analysis': 3600,
+        'script': 24 * 3600,
+        'thumbnail_text': None,
+        'seo': None
+    }
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model=None,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[float] = None,
+        cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
         """
         Initialize Gemini client
         
         Args:
             api_key: Gemini API key (or set GEMINI_API_KEY env var)
+            model: Preconfigured model object (e.g. a local stand-in); skips API setup
+            max_concurrency: Maximum in-flight async requests
+            requests_per_minute: Rate limit (or GEMINI_RPM env var, default 15 = free tier)
+            cache: Response cache (default: output/cache/gemini.sqlite)
+            use_cache: Set False to always call the API
+            retry_policy: Backoff policy for rate limits and transient errors
         """
-        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY not found. Set it in .env or pass as parameter")
+        if model is not None:
+            self.api_key = api_key
+            self.model = model
+        else:
+            self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+            if not self.api_key:
+                raise ValueError("GEMINI_API_KEY not found. Set it in .env or pass as parameter")
+            
+            # Imported here: the SDK takes about a second to load and stand-in models never need it
+            import google.generativeai as genai
+            
+            genai.configure(api_key=self.api_key)
+            self.model = genai.GenerativeModel('gemini-pro')
+        self.model_name = getattr(self.model, 'model_name', type(self.model).__name__)
+        self.cache = (cache or ResponseCache()) if use_cache else None
         
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-pro')
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = TokenBucket(
+            requests_per_minute or float(os.getenv('GEMINI_RPM', '15'))
+        )
+        self.retry_policy = retry_policy or RetryPolicy(
+            breaker=get_breaker('gemini'),
+            on_retry=lambda attempt, delay, e: print(
+                f"⚠️ Gemini API error ({type(e).__name__}), retry {attempt} in {delay:.1f}s"
+            )
+        )
+        # asyncio.Semaphore is bound to the loop that first uses it
+        self._semaphores = weakref.WeakKeyDictionary()
         print("✅ Gemini API initialized (FREE tier)")
     
-    def generate_content(self, prompt: str, temperature: float = 0.7) -> str:
+    def generate_content(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        cache_ttl: Optional[float] = 0,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
         """
         Generate content using Gemini
         
         Args:
             prompt: Input prompt
             temperature: Creativity level (0.0-1.0)
+            cache_ttl: Response cache lifetime in seconds (0 = don't cache, None = forever)
+            validate: Only responses passing this check are cached (e.g. parseable JSON)
             
         Returns:
             Generated text
         """
-        try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature,
+        with span('gemini.generate', bytes_in=len(prompt.encode('utf-8'))) as current:
+            cache_key = self._cache_key(prompt, temperature, cache_ttl)
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                current.set(cache_hit=cached is not None)
+                if cached is not None:
+                    current.set(bytes_out=len(cached.encode('utf-8')))
+                    return cached
+            
+            try:
+                response = self.retry_policy.call(self._call_model, prompt, temperature)
+            except Exception as e:
+                print(f"❌ Gemini API error: {e}")
+                raise
+            
+            current.set(bytes_out=len(response.text.encode('utf-8')))
+            if cache_key and (validate is None or validate(response.text)):
+                self.cache.put(cache_key, response.text, cache_ttl)
+            return response.text
+    
+    def stream_content(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        cache_ttl: Optional[float] = 0,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[str]:
+        """
+        Generate content using Gemini's streaming API
+        
+        Args:
+            prompt: Input prompt
+            temperature: Creativity level (0.0-1.0)
+            cache_ttl: Response cache lifetime in seconds (0 = don't cache, None = forever)
+            validate: Only responses passing this check are cached (e.g. parseable JSON)
+            
+        Yields:
+            Text chunks as they arrive
+        """
+        with span('gemini.stream', bytes_in=len(prompt.encode('utf-8'))) as current:
+            cache_key = self._cache_key(prompt, temperature, cache_ttl)
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                current.set(cache_hit=cached is not None)
+                if cached is not None:
+                    current.set(bytes_out=len(cached.encode('utf-8')))
+                    yield cached
+                    return
+            
+            try:
+                # Only opening the stream is retried; a broken stream raises
+                stream = self.retry_policy.call(self._call_model, prompt, temperature, stream=True)
+                parts = []
+                for chunk in stream:
+                    parts.append(chunk.text)
+                    current.add(bytes_out=len(chunk.text.encode('utf-8')))
+                    yield chunk.text
+            except Exception as e:
+                print(f"❌ Gemini API error: {e}")
+                raise
+            
+            text = ''.join(parts)
+            if cache_key and (validate is None or validate(text)):
+                self.cache.put(cache_key, text, cache_ttl)
+    
+    def _call_model(self, prompt: str, temperature: float, **kwargs):
+        self.rate_limiter.acquire()
+        return self.model.generate_content(
+            prompt,
+            generation_config={'temperature': temperature},
+            **kwargs
+        )
+    
+    async def _acall_model(self, prompt: str, temperature: float):
+        # Semaphore is held per attempt, not across backoff sleeps
+        async with self._semaphore():
+            await self.rate_limiter.aacquire()
+            if hasattr(self.model, 'generate_content_async'):
+                return await self.model.generate_content_async(
+                    prompt,
+                    generation_config={'temperature': temperature}
                 )
+            return await asyncio.to_thread(
+                self.model.generate_content,
+                prompt,
+                generation_config={'temperature': temperature}
             )
+    
+    def _cache_key(self, prompt: str, temperature: float, cache_ttl: Optional[float]) -> Optional[str]:
+        if self.cache is None or cache_ttl == 0:
+            return None
+        return ResponseCache.make_key(self.model_name, prompt, temperature)
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
+    
+    async def agenerate_content(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        cache_ttl: Optional[float] = 0,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Generate content using Gemini without blocking the event loop
+        
+        Args:
+            prompt: Input prompt
+            temperature: Creativity level (0.0-1.0)
+            cache_ttl: Response cache lifetime in seconds (0 = don't cache, None = forever)
+            validate: Only responses passing this check are cached (e.g. parseable JSON)
+            
+        Returns:
+            Generated text
+        """
+        with span('gemini.generate', bytes_in=len(prompt.encode('utf-8'))) as current:
+            cache_key = self._cache_key(prompt, temperature, cache_ttl)
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                current.set(cache_hit=cached is not None)
+                if cached is not None:
+                    current.set(bytes_out=len(cached.encode('utf-8')))
+                    return cached
+            
+            try:
+                response = await self.retry_policy.acall(self._acall_model, prompt, temperature)
+            except Exception as e:
+                print(f"❌ Gemini API error: {e}")
+                raise
+            
+            current.set(bytes_out=len(response.text.encode('utf-8')))
+            if cache_key and (validate is None or validate(response.text)):
+                self.cache.put(cache_key, response.text, cache_ttl)
             return response.text
-        except Exception as e:
-            print(f"❌ Gemini API error: {e}")
-            raise
+    
+    async def agenerate_many(self, prompts: List[str], temperature: float = 0.7) -> List[str]:
+        """
+        Generate several prompts concurrently (bounded by max_concurrency)
+        
+        Args:
+            prompts: Input prompts
+            temperature: Creativity level (0.0-1.0)
+            
+        Returns:
+            Generated texts in prompt order
+        """
+        return await asyncio.gather(
+            *(self.agenerate_content(prompt, temperature) for prompt in prompts)
+        )
     
     def generate_trend_analysis(self, niche: str) -> Dict:
         """
@@ -61,7 +262,27 @@ class GeminiClient:
         Returns:
             Dictionary with trending topics and recommendations
         """
-        prompt = f"""
+        response = self.generate_content(
+            self._trend_prompt(niche),
+            temperature=0.8,
+            cache_ttl=self.CACHE_TTLS['trend_analysis'],
+            validate=self._is_json_response
+        )
+        return self._parse_json_response(response)
+    
+    async def agenerate_trend_analysis(self, niche: str) -> Dict:
+        """Async version of generate_trend_analysis"""
+        response = await self.agenerate_content(
+            self._trend_prompt(niche),
+            temperature=0.8,
+            cache_ttl=self.CACHE_TTLS['trend_analysis'],
+            validate=self._is_json_response
+        )
+        return self._parse_json_response(response)
+    
+    @staticmethod
+    def _trend_prompt(niche: str) -> str:
+        return f"""
 You are a social media trend analyst for an AI influencer in the {niche} niche.
 
 Analyze current trends and provide content recommendations.
@@ -97,8 +318,6 @@ Return ONLY valid JSON in this exact format:
 
 Focus on trending, viral-worthy topics that will get views.
 """
-        response = self.generate_content(prompt, temperature=0.8)
-        return self._parse_json_response(response)
     
     def generate_script(
         self,
@@ -119,8 +338,70 @@ Focus on trending, viral-worthy topics that will get views.
         Returns:
             Dictionary with script sections
         """
+        prompt = self._script_prompt(topic, duration, style, video_type)
+        response = self.generate_content(
+            prompt,
+            temperature=0.7,
+            cache_ttl=self.CACHE_TTLS['script'],
+            validate=self._is_json_response
+        )
+        return self._parse_json_response(response)
+    
+    async def agenerate_script(
+        self,
+        topic: str,
+        duration: str,
+        style: str,
+        video_type: str = "long_form"
+    ) -> Dict:
+        """Async version of generate_script"""
+        prompt = self._script_prompt(topic, duration, style, video_type)
+        response = await self.agenerate_content(
+            prompt,
+            temperature=0.7,
+            cache_ttl=self.CACHE_TTLS['script'],
+            validate=self._is_json_response
+        )
+        return self._parse_json_response(response)
+    
+    def generate_script_streaming(
+        self,
+        topic: str,
+        duration: str,
+        style: str,
+        video_type: str = "long_form",
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """
+        Generate video script, passing raw text to on_chunk as it streams in
+        
+        The prompt asks for "full_script" first so narration arrives early.
+        
+        Args:
+            topic: Video topic
+            duration: Target duration (e.g., "5-10 minutes")
+            style: Content style (e.g., "Educational, engaging")
+            video_type: "long_form" or "short_form"
+            on_chunk: Called with each streamed text chunk
+            
+        Returns:
+            Dictionary with script sections
+        """
+        prompt = self._script_prompt(topic, duration, style, video_type)
+        prompt += 'Output the "full_script" field first.\n'
+        parts = []
+        for chunk in self.stream_content(
+            prompt, temperature=0.7, cache_ttl=self.CACHE_TTLS['script'], validate=self._is_json_response
+        ):
+            parts.append(chunk)
+            if on_chunk:
+                on_chunk(chunk)
+        return self._parse_json_response(''.join(parts))
+    
+    @staticmethod
+    def _script_prompt(topic: str, duration: str, style: str, video_type: str) -> str:
         if video_type == "short_form":
-            prompt = f"""
+            return f"""
 Create a {duration} YouTube Shorts/TikTok script about: {topic}
 Style: {style}
 
@@ -138,7 +419,7 @@ Return ONLY valid JSON in this exact format:
 Make it viral-worthy and engaging!
 """
         else:
-            prompt = f"""
+            return f"""
 Create a {duration} YouTube video script about: {topic}
 Style: {style}
 
@@ -167,9 +448,6 @@ Return ONLY valid JSON in this exact format:
 
 Make it educational, engaging, and optimized for YouTube algorithm.
 """
-        
-        response = self.generate_content(prompt, temperature=0.7)
-        return self._parse_json_response(response)
     
     def generate_thumbnail_text(self, topic: str) -> Dict:
         """
@@ -181,7 +459,27 @@ Make it educational, engaging, and optimized for YouTube algorithm.
         Returns:
             Dictionary with thumbnail recommendations
         """
-        prompt = f"""
+        response = self.generate_content(
+            self._thumbnail_prompt(topic),
+            temperature=0.6,
+            cache_ttl=self.CACHE_TTLS['thumbnail_text'],
+            validate=self._is_json_response
+        )
+        return self._parse_json_response(response)
+    
+    async def agenerate_thumbnail_text(self, topic: str) -> Dict:
+        """Async version of generate_thumbnail_text"""
+        response = await self.agenerate_content(
+            self._thumbnail_prompt(topic),
+            temperature=0.6,
+            cache_ttl=self.CACHE_TTLS['thumbnail_text'],
+            validate=self._is_json_response
+        )
+        return self._parse_json_response(response)
+    
+    @staticmethod
+    def _thumbnail_prompt(topic: str) -> str:
+        return f"""
 Create thumbnail text and design for a video about: {topic}
 
 Return ONLY valid JSON:
@@ -192,8 +490,6 @@ Return ONLY valid JSON:
   "style": "Design style recommendation"
 }}
 """
-        response = self.generate_content(prompt, temperature=0.6)
-        return self._parse_json_response(response)
     
     def optimize_for_seo(self, title: str, description: str) -> Dict:
         """
@@ -206,7 +502,27 @@ Return ONLY valid JSON:
         Returns:
             Optimized title and description
         """
-        prompt = f"""
+        response = self.generate_content(
+            self._seo_prompt(title, description),
+            temperature=0.5,
+            cache_ttl=self.CACHE_TTLS['seo'],
+            validate=self._is_json_response
+        )
+        return self._parse_json_response(response)
+    
+    async def aoptimize_for_seo(self, title: str, description: str) -> Dict:
+        """Async version of optimize_for_seo"""
+        response = await self.agenerate_content(
+            self._seo_prompt(title, description),
+            temperature=0.5,
+            cache_ttl=self.CACHE_TTLS['seo'],
+            validate=self._is_json_response
+        )
+        return self._parse_json_response(response)
+    
+    @staticmethod
+    def _seo_prompt(title: str, description: str) -> str:
+        return f"""
 Optimize this YouTube video for SEO:
 
 Title: {title}
@@ -220,8 +536,15 @@ Return ONLY valid JSON:
   "suggested_tags": ["tag1", "tag2", "tag3"]
 }}
 """
-        response = self.generate_content(prompt, temperature=0.5)
-        return self._parse_json_response(response)
+    
+    @classmethod
+    def _is_json_response(cls, response: str) -> bool:
+        """Whether a response parses as JSON (only those are cached, so a bad reply is retried next run)"""
+        try:
+            cls._load_json(response)
+        except json.JSONDecodeError:
+            return False
+        return True
     
     def _parse_json_response(self, response: str) -> Dict:
         """
@@ -233,6 +556,15 @@ Return ONLY valid JSON:
         Returns:
             Parsed JSON dictionary
         """
+        try:
+            return self._load_json(response)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ Failed to parse JSON: {e}")
+            print(f"Response: {response[:200]}...")
+            return {"raw_response": response, "error": str(e)}
+    
+    @staticmethod
+    def _load_json(response: str):
         # Extract JSON from markdown code blocks if present
         json_match = re.search(r'```json\n(.*?)\n```', response, re.DOTALL)
         if json_match:
@@ -245,13 +577,28 @@ Return ONLY valid JSON:
             else:
                 json_str = response
         
-        # Parse JSON
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            print(f"⚠️ Failed to parse JSON: {e}")
-            print(f"Response: {response[:200]}...")
-            return {"raw_response": response, "error": str(e)}
+        return json.loads(json_str)
+
+
+
+_shared_client: Optional[GeminiClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_gemini_client() -> GeminiClient:
+    """
+    Get the process-wide Gemini client
+
+    Raises ValueError (and caches nothing) while GEMINI_API_KEY is unset.
+
+    Returns:
+        Shared GeminiClient, so its rate limiter and circuit breaker see every call
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = GeminiClient()
+        return _shared_client
 
 
 # Example usage
@@ -0,0 +1,127 @@
+"""
+Import Profile - Per-module import timing for startup diagnostics
+Times every module executed after start() (self and cumulative, like
+`python -X importtime`) and summarizes which packages startup went to
+"""
+
+import sys
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+class _TimedLoader:
+    """Wraps a module's loader for the duration of its import"""
+
+    def __init__(self, loader, profiler: 'ImportProfiler', name: str):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Modules only ever see their real loader
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._timed(self._name, self._loader.exec_module, module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportProfiler:
+    """Meta path hook recording how long each import takes"""
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[float, float]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self) -> 'ImportProfiler':
+        """Time imports from now on (modules already loaded aren't counted)"""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def stop(self):
+        """Stop timing imports"""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        # Let the regular finders locate the module, then time its loader
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self, fullname)
+        return spec
+
+    def _timed(self, name: str, exec_module, module):
+        stack: List[float] = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += total
+            with self._lock:
+                self._records[name] = (total - children, total)
+
+    def modules(self) -> Dict[str, Dict[str, float]]:
+        """
+        Import time per module
+
+        Returns:
+            {module: {'self': seconds, 'cumulative': seconds}}, slowest first
+        """
+        with self._lock:
+            records = dict(self._records)
+        return {
+            name: {'self': own, 'cumulative': total}
+            for name, (own, total) in sorted(records.items(), key=lambda kv: -kv[1][1])
+        }
+
+    def packages(self) -> Dict[str, float]:
+        """Self time summed per top-level package, slowest first"""
+        totals: Dict[str, float] = {}
+        for name, record in self.modules().items():
+            package = name.split('.')[0]
+            totals[package] = totals.get(package, 0.0) + record['self']
+        return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+    def report(self, top: int = 15, packages: Optional[int] = 8) -> str:
+        """
+        Render the profile as a text report
+
+        Args:
+            top: Modules to list (by cumulative time)
+            packages: Top-level packages to summarize (None to skip)
+
+        Returns:
+            Multi-line report
+        """
+        modules = self.modules()
+        total = sum(record['self'] for record in modules.values())
+        lines = [f"📦 Imported {len(modules)} modules in {total:.2f}s"]
+        if packages and modules:
+            lines.append("   " + ", ".join(
+                f"{name} {seconds:.2f}s" for name, seconds in list(self.packages().items())[:packages]
+            ))
+        lines.append(f"   {'module':<56}{'self':>8}{'cumulative':>12}")
+        for name, record in list(modules.items())[:top]:
+            if len(name) > 55:
+                name = '…' + name[-54:]
+            lines.append(f"   {name:<56}{record['self']:>8.3f}{record['cumulative']:>12.3f}")
+        return '\n'.join(lines)
@@ -0,0 +1,438 @@
+"""
+Job Queue - SQLite-backed queue of content jobs and the worker that runs them
+Lets one host produce videos for many personas, with network-bound stages
+(Gemini, TTS) and rendering drawing on separately sized pools
+"""
+
+import os
+import time
+import hashlib
+import socket
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .tracing import propagate
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_QUEUE_PATH = PROJECT_ROOT / 'output' / 'jobs.sqlite'
+
+VIDEO_TYPES = ('long_form', 'short_form', 'both')
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    index = min(len(values) - 1, max(0, int(round(fraction * (len(values) - 1)))))
+    return values[index]
+
+
+class JobQueue:
+    """Persistent FIFO of (config, video type, topic) jobs with stage timings"""
+
+    def __init__(self, path: Optional[str] = None, max_attempts: int = 2):
+        """
+        Initialize job queue
+
+        Args:
+            path: SQLite file (default: output/jobs.sqlite)
+            max_attempts: Runs per job before it is marked failed
+        """
+        self.path = Path(path or os.getenv('AI_INFLUENCER_QUEUE_DB', str(DEFAULT_QUEUE_PATH)))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Autocommit mode; claims take an explicit write lock so several workers can share the file
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                config_path TEXT NOT NULL,
+                video_type TEXT NOT NULL,
+                topic TEXT,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                run_id TEXT,
+                worker TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS stage_timings (
+                job_id INTEGER NOT NULL,
+                stage TEXT NOT NULL,
+                seconds REAL NOT NULL,
+                recorded REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_timings_recorded ON stage_timings(recorded)")
+
+    def enqueue(self, config_path: str, video_type: str = 'both', topic: Optional[str] = None) -> int:
+        """
+        Add a job
+
+        Args:
+            config_path: Influencer config of the persona
+            video_type: "long_form", "short_form" or "both"
+            topic: Topic to use instead of running trend analysis
+
+        Returns:
+            Job id
+        """
+        if video_type not in VIDEO_TYPES:
+            raise ValueError(f"Unknown video type: {video_type}")
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (config_path, video_type, topic, created) VALUES (?, ?, ?, ?)",
+                (str(config_path), video_type, topic, time.time())
+            )
+            return cursor.lastrowid
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """
+        Take the oldest queued job and mark it running
+
+        Args:
+            worker: Identifier of the claiming worker
+
+        Returns:
+            Job row as a dictionary, or None if the queue is empty
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                now = time.time()
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, started = ? WHERE id = ?",
+                    (worker, now, row['id'])
+                )
+                self._conn.execute(
+                    "INSERT INTO stage_timings (job_id, stage, seconds, recorded) VALUES (?, 'queue_wait', ?, ?)",
+                    (row['id'], now - row['created'], now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        job = dict(row)
+        job.update(status='running', attempts=row['attempts'] + 1, worker=worker, started=now)
+        return job
+
+    def set_run_id(self, job_id: int, run_id: str):
+        """Remember the run manifest of a job, so a retry resumes it"""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET run_id = ? WHERE id = ?", (run_id, job_id))
+
+    def record_stage(self, job_id: int, stage: str, seconds: float):
+        """
+        Record how long one stage of a job took
+
+        Args:
+            job_id: Job id
+            stage: Stage name (e.g. 'script', 'render')
+            seconds: Wall time of the stage
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO stage_timings (job_id, stage, seconds, recorded) VALUES (?, ?, ?, ?)",
+                (job_id, stage, seconds, time.time())
+            )
+
+    def complete(self, job_id: int):
+        """Mark a job done"""
+        now = time.time()
+        with self._lock:
+            started = self._conn.execute("SELECT started FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            self._conn.execute("UPDATE jobs SET status = 'done', error = NULL, finished = ? WHERE id = ?", (now, job_id))
+            self._conn.execute(
+                "INSERT INTO stage_timings (job_id, stage, seconds, recorded) VALUES (?, 'total', ?, ?)",
+                (job_id, now - started, now)
+            )
+
+    def fail(self, job_id: int, error: str) -> bool:
+        """
+        Record a failed run of a job
+
+        Args:
+            job_id: Job id
+            error: Error message
+
+        Returns:
+            True if the job was requeued, False if it is out of attempts
+        """
+        with self._lock:
+            attempts = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            requeue = attempts < self.max_attempts
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?",
+                ('queued' if requeue else 'failed', error, None if requeue else time.time(), job_id)
+            )
+            return requeue
+
+    def requeue_orphans(self, host: Optional[str] = None) -> int:
+        """
+        Requeue running jobs whose worker process on this host is gone
+
+        Args:
+            host: Host name the worker ids start with (default: this host)
+
+        Returns:
+            Number of jobs requeued
+        """
+        host = host or socket.gethostname()
+        requeued = 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, worker FROM jobs WHERE status = 'running' AND worker LIKE ?", (f"{host}:%",)
+            ).fetchall()
+            for row in rows:
+                pid = int(row['worker'].split(':')[1])
+                try:
+                    os.kill(pid, 0)
+                    continue
+                except ProcessLookupError:
+                    pass
+                except PermissionError:
+                    continue
+                self._conn.execute("UPDATE jobs SET status = 'queued' WHERE id = ?", (row['id'],))
+                requeued += 1
+        return requeued
+
+    def stats(self, window: float = 3600.0) -> Dict:
+        """
+        Get queue depth, throughput and per-stage latency
+
+        Args:
+            window: Seconds of history used for throughput and latency
+
+        Returns:
+            Dictionary with counts per status, jobs finished per hour in the
+            window, and count/mean/p50/p95/max seconds per stage
+        """
+        since = time.time() - window
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            finished = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'done' AND finished >= ?", (since,)
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT stage, seconds FROM stage_timings WHERE recorded >= ?", (since,)
+            ).fetchall()
+
+        timings: Dict[str, List[float]] = {}
+        for stage, seconds in rows:
+            timings.setdefault(stage, []).append(seconds)
+        stages = {}
+        for stage, values in timings.items():
+            values.sort()
+            stages[stage] = {
+                'count': len(values),
+                'mean': sum(values) / len(values),
+                'p50': _percentile(values, 0.5),
+                'p95': _percentile(values, 0.95),
+                'max': values[-1]
+            }
+        return {
+            'queued': counts.get('queued', 0),
+            'running': counts.get('running', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0),
+            'throughput_per_hour': finished * 3600.0 / window,
+            'window': window,
+            'stages': stages
+        }
+
+
+class JobWorker:
+    """Pulls jobs off a JobQueue and runs them on shared network and render pools"""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        network_workers: int = 4,
+        render_workers: int = 1,
+        poll_interval: float = 5.0,
+        gemini: Optional[Any] = None,
+        avatar_gen: Optional[Any] = None,
+        automation_kwargs: Optional[Dict] = None
+    ):
+        """
+        Initialize worker
+
+        Args:
+            queue: Job queue to pull from
+            network_workers: Gemini/TTS stages running at once, across all jobs
+            render_workers: Videos rendered at once, across all jobs
+            poll_interval: Seconds between polls of an empty queue in watch mode
+            gemini: Gemini client shared by all personas (default: a new GeminiClient)
+            avatar_gen: Avatar generator shared by all personas (default: a new
+                AvatarGenerator, closed when run() returns)
+            automation_kwargs: Extra AIInfluencerAutomation arguments (e.g. video_pipeline)
+        """
+        self.queue = queue
+        self.network_workers = network_workers
+        self.render_workers = render_workers
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        # Rendering is CPU-bound; one pool shared by every persona
+        self.render_pool = ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix='queue-render')
+        self.network_slots = threading.BoundedSemaphore(network_workers)
+        self._gemini = gemini
+        self.automation_kwargs = dict(automation_kwargs or {})
+        self._avatar_gen = avatar_gen or self.automation_kwargs.pop('avatar_gen', None)
+        self._owns_avatar_gen = False
+        self._automations = {}
+        self._lock = threading.Lock()
+
+    def _automation_for(self, config_path: str):
+        """Get (or build) the automation of a persona config"""
+        from .automation import AIInfluencerAutomation
+        from .avatar_generator import AvatarGenerator
+        from .gemini_client import GeminiClient
+
+        with self._lock:
+            if self._gemini is None:
+                # One client, so every persona shares the API rate limit and response cache
+                self._gemini = GeminiClient()
+            if self._avatar_gen is None:
+                # One generator, so SadTalker models are resident once however many personas run
+                self._avatar_gen = AvatarGenerator()
+                self._owns_avatar_gen = True
+            automation = self._automations.get(config_path)
+            if automation is None:
+                automation = AIInfluencerAutomation(
+                    config_path=config_path,
+                    gemini=self._gemini,
+                    avatar_gen=self._avatar_gen,
+                    render_pool=self.render_pool,
+                    network_slots=self.network_slots,
+                    # Personas must not overwrite each other's timestamped outputs
+                    output_dir=str(Path('output') / 'personas' / self._persona_dir(config_path)),
+                    **self.automation_kwargs
+                )
+                self._automations[config_path] = automation
+            return automation
+
+    @staticmethod
+    def _persona_dir(config_path: str) -> str:
+        """Output directory name of a config: readable stem plus a hash of its location"""
+        path = Path(config_path).resolve()
+        digest = hashlib.sha256(str(path).encode('utf-8')).hexdigest()[:8]
+        return f"{path.stem}-{digest}"
+
+    def run_job(self, job: Dict) -> bool:
+        """
+        Run one claimed job
+
+        Args:
+            job: Job from JobQueue.claim
+
+        Returns:
+            True on success
+        """
+        job_id = job['id']
+        print(f"\n📥 Job {job_id}: {job['video_type']} for {job['config_path']}"
+              + (f" (topic: {job['topic']})" if job['topic'] else ''))
+        try:
+            automation = self._automation_for(job['config_path'])
+            # Retries resume the job's run, skipping stages that already completed
+            run_id = automation.open_run(job['run_id']).run_id
+            self.queue.set_run_id(job_id, run_id)
+            on_stage = lambda stage, seconds: self.queue.record_stage(job_id, stage, seconds)
+            if job['video_type'] == 'both':
+                automation.run_daily_automation(run_id=run_id, topic=job['topic'], on_stage=on_stage)
+            else:
+                automation.generate_daily_content(
+                    video_type=job['video_type'], run_id=run_id, topic=job['topic'], on_stage=on_stage
+                )
+        except Exception as e:
+            requeued = self.queue.fail(job_id, f"{type(e).__name__}: {e}")
+            print(f"❌ Job {job_id} failed: {e}" + (" (requeued)" if requeued else ""))
+            return False
+        self.queue.complete(job_id)
+        print(f"✅ Job {job_id} done")
+        return True
+
+    def _job_loop(self, watch: bool, remaining: List[Optional[int]]):
+        while True:
+            with self._lock:
+                if remaining[0] is not None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                with self._lock:
+                    if remaining[0] is not None:
+                        remaining[0] += 1
+                if not watch:
+                    return
+                time.sleep(self.poll_interval)
+                continue
+            self.run_job(job)
+
+    def run(self, watch: bool = False, max_jobs: Optional[int] = None):
+        """
+        Process jobs until the queue is empty (or forever in watch mode)
+
+        Jobs run concurrently; a job waiting on its render doesn't hold a
+        network slot, so other jobs keep scripting and voicing meanwhile.
+
+        Args:
+            watch: Keep polling for new jobs instead of exiting when idle
+            max_jobs: Stop after claiming this many jobs
+        """
+        requeued = self.queue.requeue_orphans()
+        if requeued:
+            print(f"♻️ Requeued {requeued} job(s) left running by a dead worker")
+        remaining = [max_jobs]
+        concurrency = self.network_workers + self.render_workers
+        print(f"👷 Worker {self.worker_id}: {self.network_workers} network slot(s), "
+              f"{self.render_workers} render worker(s)")
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='job') as executor:
+                loops = [executor.submit(propagate(self._job_loop), watch, remaining) for _ in range(concurrency)]
+                for loop in loops:
+                    loop.result()
+        finally:
+            self.render_pool.shutdown(wait=True)
+            with self._lock:
+                if self._owns_avatar_gen:
+                    self._avatar_gen.close()
+                    self._avatar_gen = None
+                    self._owns_avatar_gen = False
+
+
+def format_stats(stats: Dict) -> str:
+    """
+    Render queue stats as a text report
+
+    Args:
+        stats: Output of JobQueue.stats
+
+    Returns:
+        Multi-line report
+    """
+    lines = [
+        f"Queue depth: {stats['queued']} queued, {stats['running']} running, "
+        f"{stats['done']} done, {stats['failed']} failed",
+        f"Throughput: {stats['throughput_per_hour']:.1f} jobs/hour (last {stats['window'] / 3600:.1f} h)",
+    ]
+    if stats['stages']:
+        lines.append(f"\n{'stage':<22}{'count':>7}{'mean (s)':>10}{'p50 (s)':>10}{'p95 (s)':>10}{'max (s)':>10}")
+        for stage, s in sorted(stats['stages'].items()):
+            lines.append(f"{stage:<22}{s['count']:>7}{s['mean']:>10.1f}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['max']:>10.1f}")
+    return '\n'.join(lines)
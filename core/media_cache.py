@@ -0,0 +1,354 @@
+"""
+Media Cache - Local library of downloaded stock media
+Assets are stored by Pexels id and indexed in SQLite with normalized search
+results (TTL), LRU eviction by total size and checksum validation
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from .artifact_store import ArtifactStore
+from .audio_cache import normalize_text
+from .run_manifest import file_digest
+from .tracing import current_span
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = Path(os.getenv('AI_INFLUENCER_CACHE_DIR', str(PROJECT_ROOT / 'output' / 'cache'))) / 'media'
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so 'Technology ' and 'technology' share results"""
+    return normalize_text(query).casefold()
+
+
+class MediaCache:
+    """Disk library of stock media with a search-result index"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = 5 * 1024 ** 3,
+        search_ttl: float = 7 * 24 * 3600
+    ):
+        """
+        Initialize media cache
+
+        Args:
+            cache_dir: Directory for media and index.sqlite (default: output/cache/media)
+            max_bytes: Least recently used assets beyond this total size are evicted
+            search_ttl: Seconds a search result is reused before asking Pexels again
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.search_ttl = search_ttl
+        self.hits = 0
+        self.misses = 0
+        self.search_hits = 0
+        self.search_misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        # Held while an asset is downloaded, exported or removed (re-entrant:
+        # get_asset drops corrupted files while get_or_download holds it)
+        self._key_locks: Dict[str, Any] = {}
+        # Assets whose checksum was confirmed by this process
+        self._verified: Set[str] = set()
+        self._conn = sqlite3.connect(str(self.cache_dir / 'index.sqlite'), check_same_thread=False, timeout=30)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS searches (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                asset_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                result TEXT NOT NULL,
+                expires REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_searches_url ON searches(url);
+            CREATE TABLE IF NOT EXISTS assets (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_assets_url ON assets(url);
+            CREATE INDEX IF NOT EXISTS idx_assets_last_access ON assets(last_access);
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _search_key(kind: str, query: str, orientation: str) -> str:
+        return '\x00'.join([kind, orientation, normalize_query(query)])
+
+    @staticmethod
+    def _asset_key(kind: str, asset_id: Any) -> str:
+        return f"{kind}:{asset_id}"
+
+    def _key_lock(self, key: str):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.RLock())
+
+    def get_search(self, kind: str, query: str, orientation: str) -> Optional[Dict]:
+        """
+        Look up a recent search result
+
+        Args:
+            kind: 'video' or 'photo'
+            query: Search query (normalized before lookup)
+            orientation: Requested orientation
+
+        Returns:
+            The cached best match, or None (never searched or expired)
+        """
+        key = self._search_key(kind, query, orientation)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, expires FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= time.time():
+                self.search_misses += 1
+                return None
+            self.search_hits += 1
+            return json.loads(row[0])
+
+    def put_search(self, kind: str, query: str, orientation: str, match: Dict, ttl: Optional[float] = None):
+        """
+        Remember a search result
+
+        Args:
+            kind: 'video' or 'photo'
+            query: Search query
+            orientation: Requested orientation
+            match: Best match ({'id', 'kind', 'url'})
+            ttl: Seconds to reuse it (default: search_ttl)
+        """
+        expires = time.time() + (ttl if ttl is not None else self.search_ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (key, kind, asset_id, url, result, expires) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._search_key(kind, query, orientation), kind, str(match['id']), match['url'],
+                 json.dumps(match), expires)
+            )
+            self._conn.commit()
+
+    def identify(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Find the asset a media URL belongs to
+
+        Args:
+            url: Download URL from a cached search result or asset
+
+        Returns:
+            (kind, asset_id), or None for URLs this cache has never seen
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT key FROM assets WHERE url = ?", (url,)).fetchone()
+            if row is not None:
+                kind, _, asset_id = row[0].partition(':')
+                return kind, asset_id
+            row = self._conn.execute("SELECT kind, asset_id FROM searches WHERE url = ?", (url,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def get_asset(self, kind: str, asset_id: Any) -> Optional[str]:
+        """
+        Look up a stored asset
+
+        The first lookup of an asset in each process checks its SHA-256;
+        missing or corrupted files are dropped from the index.
+
+        Args:
+            kind: 'video' or 'photo'
+            asset_id: Pexels id
+
+        Returns:
+            Path inside the cache, or None
+        """
+        key = self._asset_key(kind, asset_id)
+        with self._key_lock(key):
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT path, size, sha256 FROM assets WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                return None
+            path, size, checksum = row
+            if not self._is_valid(key, path, size, checksum):
+                print(f"⚠️ Cached media {key} is missing or corrupted, fetching it again")
+                self._remove(key, path)
+                return None
+            with self._lock:
+                self._conn.execute("UPDATE assets SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+            return path
+
+    def _is_valid(self, key: str, path: str, size: int, checksum: str) -> bool:
+        try:
+            if os.path.getsize(path) != size:
+                return False
+        except OSError:
+            return False
+        if key in self._verified:
+            return True
+        if file_digest(path) != checksum:
+            return False
+        self._verified.add(key)
+        return True
+
+    def _remove(self, key: str, path: str, blocking: bool = True) -> bool:
+        # The key lock keeps the file in place while it's downloaded or exported
+        lock = self._key_lock(key)
+        if not lock.acquire(blocking=blocking):
+            return False
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM assets WHERE key = ?", (key,))
+                self._conn.commit()
+                self._verified.discard(key)
+            if os.path.exists(path):
+                os.remove(path)
+        finally:
+            lock.release()
+        return True
+
+    def get_or_download(
+        self,
+        kind: str,
+        asset_id: Any,
+        url: str,
+        suffix: str,
+        download: Callable[[str], Any],
+        dest_path: Optional[str] = None
+    ) -> str:
+        """
+        Return a stored asset or download it into the cache
+
+        Concurrent requests for the same asset wait for the first download.
+        Pass dest_path to have the asset linked (or copied) there before
+        the asset lock is released: a path inside the cache may be evicted
+        by another thread as soon as this returns.
+
+        Args:
+            kind: 'video' or 'photo'
+            asset_id: Pexels id
+            url: Download URL
+            suffix: File extension including the dot
+            download: Callable(path) that downloads the asset to path
+            dest_path: Where to export the asset (optional)
+
+        Returns:
+            dest_path, or the path inside the cache
+        """
+        key = self._asset_key(kind, asset_id)
+        with self._key_lock(key):
+            path = self.get_asset(kind, asset_id)
+            downloaded = path is None
+            if not downloaded:
+                size = os.path.getsize(path)
+                with self._lock:
+                    self.hits += 1
+                    self.bytes_saved += size
+                print(f"♻️ Using cached {kind} {asset_id} ({size / 1024 ** 2:.1f} MB)")
+                current_span().add(cache_hits=1)
+            else:
+                with self._lock:
+                    self.misses += 1
+                target = self.cache_dir / kind / f"{asset_id}{suffix}"
+                target.parent.mkdir(parents=True, exist_ok=True)
+                # A stable temporary name lets an interrupted download resume next time
+                tmp_path = target.with_name(f"{target.name}.download")
+                download(str(tmp_path))
+                checksum = file_digest(str(tmp_path))
+                os.replace(tmp_path, target)
+                path = str(target)
+                now = time.time()
+                with self._lock:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO assets (key, url, path, size, sha256, created, last_access) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, url, path, target.stat().st_size, checksum, now, now)
+                    )
+                    self._conn.commit()
+                    self._verified.add(key)
+            if dest_path is not None:
+                path = ArtifactStore.export(path, dest_path)
+        if downloaded:
+            self.evict(keep=key)
+        return path
+
+    def evict(self, max_bytes: Optional[int] = None, keep: Optional[str] = None) -> int:
+        """
+        Remove least recently used assets until the library fits
+
+        Assets being downloaded or exported by another thread are skipped.
+
+        Args:
+            max_bytes: Size limit (default: max_bytes)
+            keep: Asset key never to evict (e.g. the one just added)
+
+        Returns:
+            Number of assets removed
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM assets").fetchone()[0]
+            if total <= limit:
+                return 0
+            rows = self._conn.execute(
+                "SELECT key, path, size FROM assets ORDER BY last_access"
+            ).fetchall()
+        removed = 0
+        for key, path, size in rows:
+            if total <= limit:
+                break
+            if key == keep or not self._remove(key, path, blocking=False):
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            print(f"🧹 Evicted {removed} cached media file(s)")
+        return removed
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with asset and search hits/misses, bytes_saved, assets and bytes
+        """
+        with self._lock:
+            assets, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM assets"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'search_hits': self.search_hits,
+                'search_misses': self.search_misses,
+                'bytes_saved': self.bytes_saved,
+                'assets': assets,
+                'bytes': size
+            }
+
+
+_shared_cache: Optional[MediaCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_media_cache() -> MediaCache:
+    """Get the process-wide media cache"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = MediaCache()
+        return _shared_cache
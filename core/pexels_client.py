@@ -0,0 +1,408 @@
+"""
+Pexels Client - Pooled HTTP client for stock photo and footage search
+Keeps connections alive across calls, searches many queries at once and
+downloads in large chunks, resuming interrupted transfers with Range requests
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .media_cache import MediaCache
+from .retry import RetryPolicy, get_breaker
+from .tracing import propagate, span
+
+DEFAULT_API_BASE = 'https://api.pexels.com'
+
+
+class PexelsError(RuntimeError):
+    """Raised for Pexels API and download failures"""
+
+    def __init__(self, message: str, response=None):
+        super().__init__(message)
+        # Lets retry_after_seconds read the Retry-After header
+        self.response = response
+
+
+class TransientPexelsError(PexelsError):
+    """Rate limit (429) or server error (5xx) worth retrying"""
+
+
+class IncompleteDownloadError(TransientPexelsError):
+    """The connection closed before the whole file arrived"""
+
+
+def photo_link(photo: Dict, size: str = 'large') -> str:
+    """
+    Pick a photo's download URL
+
+    Args:
+        photo: Photo from a search result
+        size: Pexels rendition ('original', 'large2x', 'large', 'medium', ...)
+
+    Returns:
+        URL
+    """
+    src = photo['src']
+    return src.get(size) or src.get('large') or next(iter(src.values()))
+
+
+def video_link(video: Dict, quality: str = 'hd') -> str:
+    """
+    Pick a video's download URL
+
+    Args:
+        video: Video from a search result
+        quality: Preferred quality ('hd', 'sd', ...); falls back to the first file
+
+    Returns:
+        URL
+    """
+    files = video['video_files']
+    return next((f for f in files if f.get('quality') == quality), files[0])['link']
+
+
+class PexelsClient:
+    """Thread-safe Pexels API client sharing one connection pool"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_base: Optional[str] = None,
+        max_workers: int = 8,
+        timeout: float = 10.0,
+        download_timeout: float = 30.0,
+        chunk_size: int = 1 << 20,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[MediaCache] = None
+    ):
+        """
+        Initialize Pexels client
+
+        Args:
+            api_key: Pexels API key (or PEXELS_API_KEY env var)
+            api_base: API root (or PEXELS_API_BASE env var; e.g. a local stand-in)
+            max_workers: Concurrent searches/downloads, and pooled connections per host
+            timeout: Seconds to wait for search responses
+            download_timeout: Seconds to wait for download data before resuming
+            chunk_size: Download read size in bytes
+            retry_policy: Backoff for rate limits, server errors and dropped connections
+            cache: Local media library reused across runs (None: always ask Pexels)
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.api_key = api_key or os.getenv('PEXELS_API_KEY')
+        self.api_base = (api_base or os.getenv('PEXELS_API_BASE', DEFAULT_API_BASE)).rstrip('/')
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.download_timeout = download_timeout
+        self.chunk_size = chunk_size
+        self.cache = cache
+
+        # One keep-alive pool per host, as large as the number of workers using it
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=4,
+            base_delay=1.0,
+            max_delay=30.0,
+            retry_on=(
+                TransientPexelsError,
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError
+            ),
+            breaker=get_breaker('pexels'),
+            on_retry=lambda attempt, delay, e: print(
+                f"⚠️ Pexels request failed ({e}), retry {attempt} in {delay:.1f}s"
+            )
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Worker pool for batch searches and prefetches (started on first use)"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pexels')
+            return self._executor
+
+    def close(self):
+        """Wait for background work, then close pooled connections"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self.session.close()
+
+    def __enter__(self) -> 'PexelsClient':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _search(self, path: str, params: Dict) -> Dict:
+        if not self.api_key:
+            raise PexelsError("PEXELS_API_KEY not set")
+
+        def request() -> Dict:
+            response = self.session.get(
+                f"{self.api_base}{path}",
+                headers={'Authorization': self.api_key},
+                params=params,
+                timeout=self.timeout
+            )
+            if response.status_code == 429 or response.status_code >= 500:
+                raise TransientPexelsError(f"Pexels API error: {response.status_code}", response)
+            if response.status_code != 200:
+                raise PexelsError(f"Pexels API error: {response.status_code}", response)
+            return response.json()
+
+        with span('pexels.search', query=params.get('query')) as current:
+            data = self.retry_policy.call(request)
+            current.set(results=len(data.get('photos') or data.get('videos') or []))
+            return data
+
+    def search_photos(
+        self,
+        query: str,
+        orientation: str = 'landscape',
+        size: str = 'large',
+        per_page: int = 5
+    ) -> List[Dict]:
+        """
+        Search stock photos
+
+        Args:
+            query: Search query
+            orientation: 'landscape', 'portrait', or 'square'
+            size: Minimum photo size ('large', 'medium', 'small')
+            per_page: Results to fetch (alternatives cost no extra request)
+
+        Returns:
+            Photos as returned by the API (id, src, ...)
+        """
+        params = {'query': query, 'orientation': orientation, 'size': size, 'per_page': per_page}
+        return self._search('/v1/search', params)['photos']
+
+    def search_videos(
+        self,
+        query: str,
+        orientation: str = 'landscape',
+        size: str = 'medium',
+        per_page: int = 5
+    ) -> List[Dict]:
+        """
+        Search stock videos
+
+        Args:
+            query: Search query
+            orientation: 'landscape', 'portrait', or 'square'
+            size: Minimum video size ('large', 'medium', 'small')
+            per_page: Results to fetch (alternatives cost no extra request)
+
+        Returns:
+            Videos as returned by the API (id, video_files, ...)
+        """
+        params = {'query': query, 'orientation': orientation, 'size': size, 'per_page': per_page}
+        return self._search('/videos/search', params)['videos']
+
+    def search(self, query: str, kind: str = 'video', orientation: str = 'landscape') -> Optional[Dict]:
+        """
+        Best match for a query
+
+        Args:
+            query: Search query
+            kind: 'video' or 'photo'
+            orientation: 'landscape', 'portrait', or 'square'
+
+        Returns:
+            {'id', 'kind', 'url'} of the top result, or None if nothing matched
+        """
+        if self.cache is not None:
+            with span('pexels.cache', query=query) as current:
+                match = self.cache.get_search(kind, query, orientation)
+                current.set(cache_hit=match is not None)
+            if match is not None:
+                return match
+
+        if kind == 'video':
+            results = self.search_videos(query, orientation)
+            link = video_link
+        else:
+            results = self.search_photos(query, orientation)
+            link = photo_link
+        if not results:
+            return None
+        match = {'id': results[0]['id'], 'kind': kind, 'url': link(results[0])}
+        if self.cache is not None:
+            self.cache.put_search(kind, query, orientation, match)
+        return match
+
+    def search_many(
+        self,
+        queries: Iterable[str],
+        kind: str = 'video',
+        orientation: str = 'landscape'
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Search several queries concurrently (e.g. one per script section)
+
+        Args:
+            queries: Search queries (duplicates are searched once)
+            kind: 'video' or 'photo'
+            orientation: 'landscape', 'portrait', or 'square'
+
+        Returns:
+            {query: best match or None}; failed searches map to None
+        """
+        queries = list(dict.fromkeys(queries))
+
+        def search_one(query: str) -> Optional[Dict]:
+            try:
+                return self.search(query, kind, orientation)
+            except Exception as e:
+                print(f"❌ Pexels search failed for '{query}': {e}")
+                return None
+
+        return dict(zip(queries, self.executor.map(propagate(search_one), queries)))
+
+    def download(self, url: str, output_path: str) -> str:
+        """
+        Download a media file, from the media cache when possible
+
+        URLs from earlier search results are stored in the cache and then
+        linked (or copied) to output_path; other URLs are downloaded directly.
+
+        Args:
+            url: Media URL
+            output_path: Where to save the file
+
+        Returns:
+            output_path
+        """
+        asset = self.cache.identify(url) if self.cache is not None else None
+        if asset is None:
+            return self._download(url, output_path)
+        kind, asset_id = asset
+        suffix = Path(url.split('?')[0]).suffix or Path(output_path).suffix
+        # Exported under the cache's asset lock, so eviction can't race the link
+        return self.cache.get_or_download(
+            kind, asset_id, url, suffix, lambda path: self._download(url, path), dest_path=output_path
+        )
+
+    def _download(self, url: str, output_path: str) -> str:
+        """
+        Download a media file, resuming after dropped connections
+
+        Data goes to output_path + '.part' and is renamed when complete, so a
+        retry (or a later call) continues where the last transfer stopped.
+
+        Args:
+            url: Media URL
+            output_path: Where to save the file
+
+        Returns:
+            output_path
+        """
+        part_path = f"{output_path}.part"
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        attempts = 0
+
+        def transfer():
+            nonlocal attempts
+            attempts += 1
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            headers = {'Range': f"bytes={offset}-"} if offset else {}
+            with self.session.get(url, headers=headers, stream=True, timeout=self.download_timeout) as response:
+                if response.status_code == 416 and offset:
+                    return  # The part file already holds everything
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise TransientPexelsError(f"Download error: {response.status_code}", response)
+                if response.status_code not in (200, 206):
+                    raise PexelsError(f"Download error: {response.status_code}", response)
+                if response.status_code == 200:
+                    offset = 0  # Range not honored: start over
+                total = self._total_size(response, offset)
+                with open(part_path, 'ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        f.write(chunk)
+                        offset += len(chunk)
+            if total is not None and offset < total:
+                raise IncompleteDownloadError(f"connection closed after {offset} of {total} bytes")
+
+        with span('pexels.download') as current:
+            self.retry_policy.call(transfer)
+            os.replace(part_path, output_path)
+            current.set(bytes_out=os.path.getsize(output_path))
+            if attempts > 1:
+                current.set(resumes=attempts - 1)
+        return output_path
+
+    @staticmethod
+    def _total_size(response, offset: int) -> Optional[int]:
+        content_range = response.headers.get('Content-Range', '')
+        if response.status_code == 206 and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            return int(total) if total.isdigit() else None
+        length = response.headers.get('Content-Length')
+        return offset + int(length) if length and length.isdigit() else None
+
+    def fetch(self, query: str, output_dir: str, kind: str = 'video', orientation: str = 'landscape') -> Optional[str]:
+        """
+        Search a query and download its best match
+
+        Args:
+            query: Search query
+            output_dir: Directory for downloads (files are named by Pexels id)
+            kind: 'video' or 'photo'
+            orientation: 'landscape', 'portrait', or 'square'
+
+        Returns:
+            Local path, or None if nothing matched
+        """
+        with span('pexels.fetch', query=query) as current:
+            match = self.search(query, kind, orientation)
+            if match is None:
+                return None
+            suffix = Path(match['url'].split('?')[0]).suffix or ('.mp4' if kind == 'video' else '.jpg')
+            output_path = os.path.join(output_dir, f"{kind}_{match['id']}{suffix}")
+            if os.path.exists(output_path):
+                current.add(cache_hits=1)
+                return output_path
+            return self.download(match['url'], output_path)
+
+    def prefetch(
+        self,
+        queries: Iterable[str],
+        output_dir: str,
+        kind: str = 'video',
+        orientation: str = 'landscape'
+    ) -> Dict[str, Future]:
+        """
+        Search and download media in the background
+
+        Start this as soon as the queries are known (e.g. right after the
+        script) so downloads overlap with TTS and rendering.
+
+        Args:
+            queries: Search queries (duplicates are fetched once)
+            output_dir: Directory for downloads
+            kind: 'video' or 'photo'
+            orientation: 'landscape', 'portrait', or 'square'
+
+        Returns:
+            {query: Future resolving to the local path (or None if nothing matched)}
+        """
+        fetch = propagate(self.fetch)
+        return {
+            query: self.executor.submit(fetch, query, output_dir, kind, orientation)
+            for query in dict.fromkeys(queries)
+        }
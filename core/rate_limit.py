@@ -0,0 +1,51 @@
+"""
+Rate Limiting - Token bucket shared by sync and async API callers
+Keeps request bursts within the Gemini free tier quota
+"""
+
+import time
+import asyncio
+import threading
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from threads and event loops"""
+
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        """
+        Initialize token bucket
+
+        Args:
+            requests_per_minute: Sustained request rate
+            burst: Maximum tokens saved up (default: one second of rate, at least 1)
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(self.rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            # Token is borrowed from the future; wait until it has accrued
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
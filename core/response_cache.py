@@ -0,0 +1,135 @@
+"""
+Response Cache - Persistent prompt/response cache for LLM calls
+SQLite-backed with per-entry TTL, LRU size bound and hit/miss counters
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_PATH = Path(os.getenv('AI_INFLUENCER_CACHE_DIR', str(PROJECT_ROOT / 'output' / 'cache'))) / 'gemini.sqlite'
+
+
+class ResponseCache:
+    """Disk-backed LRU cache of model responses"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2000):
+        """
+        Initialize response cache
+
+        Args:
+            path: SQLite file (default: output/cache/gemini.sqlite)
+            max_entries: Least recently used entries beyond this are evicted
+        """
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                expires REAL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, temperature: float) -> str:
+        """
+        Build the cache key for a request
+
+        Args:
+            model_name: Model identifier
+            prompt: Full prompt text
+            temperature: Sampling temperature
+
+        Returns:
+            Hex cache key
+        """
+        raw = f"{model_name}\x00{temperature:.3f}\x00{prompt}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response text or None (missing or expired)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str, ttl: Optional[float] = None):
+        """
+        Store a response
+
+        Args:
+            key: Cache key from make_key
+            value: Response text
+            ttl: Seconds until expiry (None = never expires)
+        """
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, expires, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, expires, now)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and entries
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries
+        }
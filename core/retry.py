@@ -0,0 +1,292 @@
+"""
+Retry Policy - Rate-limit-aware retries shared by all API callers
+Jittered exponential backoff, Retry-After support and a circuit breaker
+"""
+
+import re
+import time
+import random
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+_default_retryable: Optional[Tuple[Type[BaseException], ...]] = None
+
+
+def default_retryable() -> Tuple[Type[BaseException], ...]:
+    """
+    Exception types retried when a policy names none
+
+    google.api_core is only imported the first time a policy has to
+    classify an error, so importing this module stays cheap.
+
+    Returns:
+        Transient Google API errors plus connection errors and timeouts
+    """
+    global _default_retryable
+    if _default_retryable is None:
+        try:
+            from google.api_core import exceptions as google_exceptions
+            google_retryable: Tuple[Type[BaseException], ...] = (
+                google_exceptions.ResourceExhausted,
+                google_exceptions.TooManyRequests,
+                google_exceptions.ServiceUnavailable,
+                google_exceptions.DeadlineExceeded,
+                google_exceptions.InternalServerError,
+            )
+        except ImportError:
+            google_retryable = ()
+        _default_retryable = google_retryable + (ConnectionError, TimeoutError)
+    return _default_retryable
+
+_RETRY_IN_PATTERN = re.compile(r'retry in ([0-9.]+)\s*s', re.IGNORECASE)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service for a cool-down period
+
+    Closed: calls pass. After `failure_threshold` consecutive failures it
+    opens and rejects calls for `reset_timeout` seconds, then lets one
+    trial call through (half-open); success closes it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        # When the half-open trial call started (None: no trial in flight)
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if now - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def before_call(self):
+        """
+        Raise CircuitOpenError if calls are currently rejected
+
+        While half-open only the first caller is let through as the trial
+        call; the others are rejected until it reports back (or, should it
+        never report, until another reset_timeout has passed).
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == 'closed':
+                return
+            if state == 'half-open':
+                if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+                    self._probe_started = now
+                    return
+                message = f"Circuit half-open after {self._failures} consecutive failures; trial call in progress"
+            else:
+                message = (
+                    f"Circuit open after {self._failures} consecutive failures; "
+                    f"retrying after {self.reset_timeout:.0f}s cool-down"
+                )
+        raise CircuitOpenError(message)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_started = None
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """End a call whose error says nothing about service health (frees the trial slot)"""
+        with self._lock:
+            self._probe_started = None
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(service: str, **kwargs) -> CircuitBreaker:
+    """
+    Get the process-wide circuit breaker for a service
+
+    Args:
+        service: Service name (e.g. 'gemini')
+        **kwargs: CircuitBreaker arguments, used on first creation
+
+    Returns:
+        Shared CircuitBreaker
+    """
+    with _breakers_lock:
+        if service not in _breakers:
+            _breakers[service] = CircuitBreaker(**kwargs)
+        return _breakers[service]
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Extract a server-suggested retry delay from an API error
+
+    Args:
+        error: Exception raised by the API client
+
+    Returns:
+        Delay in seconds, or None if the error carries no hint
+    """
+    explicit = getattr(error, 'retry_after', None)
+    if explicit is not None:
+        return float(explicit)
+
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    header = headers.get('Retry-After') if hasattr(headers, 'get') else None
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
+
+    # google.api_core errors carry a google.rpc.RetryInfo in details
+    for detail in getattr(error, 'details', None) or []:
+        delay = getattr(detail, 'retry_delay', None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+
+    match = _RETRY_IN_PATTERN.search(str(error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class RetryPolicy:
+    """Retries transient failures with jittered exponential backoff"""
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.5,
+        retry_on: Optional[Tuple[Type[BaseException], ...]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        on_retry: Optional[Callable[[int, float, BaseException], None]] = None
+    ):
+        """
+        Initialize retry policy
+
+        Args:
+            max_attempts: Total attempts including the first call
+            base_delay: Delay before the first retry (doubles each attempt)
+            max_delay: Upper bound for any single delay
+            jitter: Fraction of each delay that is randomized (0.0-1.0)
+            retry_on: Exception types considered transient (default: default_retryable())
+            breaker: Optional circuit breaker shared with other callers
+            on_retry: Callback(attempt, delay, error) before each backoff
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.breaker = breaker
+        self.on_retry = on_retry
+
+    def is_retryable(self, error: BaseException) -> bool:
+        return isinstance(error, self.retry_on if self.retry_on is not None else default_retryable())
+
+    def compute_delay(self, attempt: int, error: BaseException) -> float:
+        """
+        Delay before retry number `attempt` (0-based)
+
+        Args:
+            attempt: Number of failed attempts so far minus one
+            error: The error that triggered the retry
+
+        Returns:
+            Seconds to wait
+        """
+        hinted = retry_after_seconds(error)
+        if hinted is not None:
+            return min(self.max_delay, hinted)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    def _handle_failure(self, attempt: int, error: BaseException) -> float:
+        """Record a failure; return the backoff delay or re-raise"""
+        if not self.is_retryable(error):
+            if self.breaker:
+                self.breaker.release()
+            raise error
+        # Only transient (service health) failures count towards the breaker
+        if self.breaker:
+            self.breaker.record_failure()
+        if attempt + 1 >= self.max_attempts:
+            raise error
+        delay = self.compute_delay(attempt, error)
+        if self.on_retry:
+            self.on_retry(attempt + 1, delay, error)
+        return delay
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call fn, sleeping the calling thread between retries
+
+        Args:
+            fn: Function to call
+            *args, **kwargs: Passed to fn
+
+        Returns:
+            fn's return value
+        """
+        for attempt in range(self.max_attempts):
+            if self.breaker:
+                self.breaker.before_call()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                time.sleep(self._handle_failure(attempt, e))
+                continue
+            if self.breaker:
+                self.breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Await fn, backing off with asyncio.sleep so other tasks keep running
+
+        Args:
+            fn: Coroutine function to call
+            *args, **kwargs: Passed to fn
+
+        Returns:
+            fn's result
+        """
+        for attempt in range(self.max_attempts):
+            if self.breaker:
+                self.breaker.before_call()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._handle_failure(attempt, e))
+                continue
+            if self.breaker:
+                self.breaker.record_success()
+            return result
@@ -0,0 +1,141 @@
+"""
+Run Manifest - Checkpoints for resumable pipeline runs
+Each completed step's outputs are saved under output/logs keyed by run id,
+so a resumed run skips steps whose inputs have not changed
+"""
+
+import os
+import json
+import uuid
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash a file's contents
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """Persistent record of the steps a pipeline run has completed"""
+
+    def __init__(self, run_id: Optional[str] = None, log_dir: str = 'output/logs'):
+        """
+        Open (or start) a run manifest
+
+        Args:
+            run_id: Existing run to resume, or None for a new run
+            log_dir: Directory holding run_<id>.json manifests
+        """
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        self.path = Path(log_dir) / f"run_{self.run_id}.json"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._data = {'run_id': self.run_id, 'created': datetime.now().isoformat(), 'steps': {}}
+        if self.path.exists():
+            with open(self.path) as f:
+                self._data = json.load(f)
+
+    @classmethod
+    def exists(cls, run_id: str, log_dir: str = 'output/logs') -> bool:
+        """Check whether a manifest was saved for a run"""
+        return (Path(log_dir) / f"run_{run_id}.json").exists()
+
+    @staticmethod
+    def hash_inputs(inputs: Any) -> str:
+        """
+        Fingerprint a step's inputs
+
+        Args:
+            inputs: JSON-serializable inputs (non-JSON values are str()-ed)
+
+        Returns:
+            Hex digest
+        """
+        raw = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, step: str, inputs: Any) -> Optional[Dict]:
+        """
+        Look up a completed step
+
+        Args:
+            step: Step name
+            inputs: The step's current inputs
+
+        Returns:
+            The step record, or None if the step must run (never completed,
+            inputs changed, or one of its files is missing)
+        """
+        with self._lock:
+            record = self._data['steps'].get(step)
+        if not record or record['inputs'] != self.hash_inputs(inputs):
+            return None
+        if not all(os.path.exists(path) for path in record.get('files', [])):
+            return None
+        return record
+
+    def record(self, step: str, inputs: Any, outputs: Any, files: Optional[List[str]] = None):
+        """
+        Save a completed step
+
+        Args:
+            step: Step name
+            inputs: The step's inputs
+            outputs: JSON-serializable outputs
+            files: Files the step produced (the step reruns if any go missing)
+        """
+        with self._lock:
+            self._data['steps'][step] = {
+                'inputs': self.hash_inputs(inputs),
+                'outputs': outputs,
+                'files': [str(path) for path in files or []],
+                'completed': datetime.now().isoformat()
+            }
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(self._data, f, indent=2, default=str)
+            os.replace(tmp_path, self.path)
+
+    def run_step(
+        self,
+        step: str,
+        inputs: Any,
+        fn: Callable[[], Any],
+        files: Optional[Callable[[Any], List[str]]] = None
+    ) -> Any:
+        """
+        Run a step unless this run already completed it with the same inputs
+
+        Args:
+            step: Step name (unique within the run)
+            inputs: Everything the step's result depends on
+            fn: Produces the step's outputs
+            files: Maps the outputs to the files they refer to
+
+        Returns:
+            The step's outputs (recorded or fresh)
+        """
+        record = self.get(step, inputs)
+        if record is not None:
+            print(f"♻️ Skipping '{step}' (completed in run {self.run_id})")
+            return record['outputs']
+        # Round-trip through JSON so fresh and resumed runs see the same types
+        outputs = json.loads(json.dumps(fn(), default=str))
+        self.record(step, inputs, outputs, files(outputs) if files else None)
+        return outputs
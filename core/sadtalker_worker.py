@@ -0,0 +1,415 @@
+"""
+SadTalker Worker - Persistent inference server for avatar animation
+Loads the SadTalker checkpoints once and serves render jobs over stdin/stdout
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import tempfile
+import itertools
+import threading
+import subprocess
+import traceback
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    from .face_cache import FaceCache
+except ImportError:
+    # Executed as a script inside the worker process (core/ is on sys.path)
+    from face_cache import FaceCache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SADTALKER_PATH = PROJECT_ROOT / 'tools' / 'SadTalker'
+
+
+class SadTalkerWorkerError(RuntimeError):
+    """Raised when the worker cannot start or a render job fails"""
+
+
+class SadTalkerWorker:
+    """
+    Client for a long-lived SadTalker process
+
+    The worker process imports torch and loads the face, audio2coeff and
+    renderer checkpoints once, then renders jobs sent as JSON lines.
+    Jobs are serialized per worker; use one worker per concurrent render.
+    """
+
+    def __init__(
+        self,
+        sadtalker_path: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+        device: str = 'auto',
+        threads: Optional[int] = None
+    ):
+        """
+        Initialize worker client (the process starts on first use)
+
+        Args:
+            sadtalker_path: Path to SadTalker repository
+            checkpoint_path: Path to SadTalker checkpoints
+            device: 'cpu', 'cuda' or 'auto' (CUDA when available)
+            threads: CPU threads for the worker's torch/BLAS (default: all cores)
+        """
+        self.sadtalker_path = Path(
+            sadtalker_path or os.getenv('SADTALKER_PATH', str(DEFAULT_SADTALKER_PATH))
+        ).resolve()
+        self.checkpoint_path = Path(
+            checkpoint_path
+            or os.getenv('SADTALKER_CHECKPOINT_PATH', str(self.sadtalker_path / 'checkpoints'))
+        ).resolve()
+        self.device = device
+        self.threads = threads
+        self._proc = None
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+
+    def is_running(self) -> bool:
+        """Check if the worker process is alive"""
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self):
+        """Start the worker process and wait until models are importable"""
+        with self._lock:
+            self._ensure_started()
+
+    def _ensure_started(self):
+        if self.is_running():
+            return
+
+        if not (self.sadtalker_path / 'inference.py').exists():
+            raise SadTalkerWorkerError(f"SadTalker not found at: {self.sadtalker_path}")
+
+        cmd = [
+            sys.executable, str(Path(__file__).resolve()),
+            '--serve',
+            '--sadtalker-path', str(self.sadtalker_path),
+            '--checkpoint-dir', str(self.checkpoint_path),
+            '--device', self.device
+        ]
+        print(f"🚀 Starting SadTalker worker ({self.device})...")
+
+        env = None
+        if self.threads:
+            # Several workers on one host must not each spawn a thread per core
+            env = dict(os.environ)
+            for name in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+                env[name] = str(self.threads)
+
+        # Run inside the SadTalker directory so its relative paths resolve
+        self._proc = subprocess.Popen(
+            cmd,
+            cwd=str(self.sadtalker_path),
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+
+        message = self._read_message()
+        if message.get('event') != 'ready':
+            self._kill()
+            raise SadTalkerWorkerError(f"SadTalker worker failed to start: {message}")
+        print(f"✅ SadTalker worker ready on {message.get('device')}")
+
+    def _read_message(self) -> Dict:
+        line = self._proc.stdout.readline()
+        if not line:
+            code = self._proc.wait()
+            raise SadTalkerWorkerError(f"SadTalker worker exited with code {code}")
+        return json.loads(line)
+
+    def render(
+        self,
+        source_image: str,
+        driven_audio: str,
+        result_dir: Optional[str] = None,
+        preprocess: str = 'crop',
+        still: bool = True,
+        size: int = 256,
+        enhancer: Optional[str] = None,
+        expression_scale: float = 1.0,
+        pose_style: int = 0,
+        batch_size: int = 2,
+        output_path: Optional[str] = None
+    ) -> str:
+        """
+        Render a talking head video on the warm worker
+
+        Args:
+            source_image: Path to source image
+            driven_audio: Path to driving audio
+            result_dir: Directory for intermediate files and, without
+                output_path, the result (default: output_path's directory)
+            preprocess: Preprocessing mode ('crop', 'resize', 'full', ...)
+            still: Minimize head movement
+            size: Face model resolution (256 or 512)
+            enhancer: Optional face enhancer ('gfpgan' or 'RestoreFormer')
+            expression_scale: Expression intensity
+            pose_style: Pose style (0-45)
+            batch_size: Renderer batch size
+            output_path: Exact file to write (default: a unique name in result_dir)
+
+        Returns:
+            Path to the generated video
+        """
+        if result_dir is None:
+            if output_path is None:
+                raise ValueError("render() needs result_dir or output_path")
+            result_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(result_dir, exist_ok=True)
+        job = {
+            'op': 'render',
+            'source_image': os.path.abspath(source_image),
+            'driven_audio': os.path.abspath(driven_audio),
+            'result_dir': os.path.abspath(result_dir),
+            'preprocess': preprocess,
+            'still': still,
+            'size': size,
+            'enhancer': enhancer,
+            'expression_scale': expression_scale,
+            'pose_style': pose_style,
+            'batch_size': batch_size,
+            'output_path': os.path.abspath(output_path) if output_path else None
+        }
+
+        with self._lock:
+            self._ensure_started()
+            job['id'] = next(self._job_ids)
+            try:
+                self._proc.stdin.write(json.dumps(job) + '\n')
+                self._proc.stdin.flush()
+                reply = self._read_message()
+            except (BrokenPipeError, SadTalkerWorkerError) as e:
+                self._kill()
+                raise SadTalkerWorkerError(f"SadTalker worker died during job: {e}")
+
+        if not reply.get('ok'):
+            raise SadTalkerWorkerError(reply.get('error', 'Unknown SadTalker error'))
+        return reply['video_path']
+
+    def close(self):
+        """Ask the worker to exit and wait for it"""
+        with self._lock:
+            if not self.is_running():
+                return
+            try:
+                self._proc.stdin.write(json.dumps({'op': 'shutdown'}) + '\n')
+                self._proc.stdin.flush()
+                self._proc.wait(timeout=30)
+            except Exception:
+                self._kill()
+
+    def _kill(self):
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+
+
+_shared_workers: Dict[Tuple[str, str, str], SadTalkerWorker] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_worker(
+    sadtalker_path: Optional[str] = None,
+    checkpoint_path: Optional[str] = None,
+    device: Optional[str] = None
+) -> SadTalkerWorker:
+    """
+    Get the process-wide worker for a SadTalker install and device
+
+    Args:
+        sadtalker_path: Path to SadTalker repository
+        checkpoint_path: Path to SadTalker checkpoints
+        device: 'cpu', 'cuda' or 'auto' (default: SADTALKER_DEVICE env var or 'auto')
+
+    Returns:
+        Shared SadTalkerWorker (started lazily)
+    """
+    # Resolve the device before keying, so callers relying on the default
+    # share one worker instead of loading the checkpoints twice
+    device = device or os.getenv('SADTALKER_DEVICE', 'auto')
+    worker = SadTalkerWorker(sadtalker_path, checkpoint_path, device)
+    key = (str(worker.sadtalker_path), str(worker.checkpoint_path), device)
+    with _shared_lock:
+        if key not in _shared_workers:
+            _shared_workers[key] = worker
+        return _shared_workers[key]
+
+
+@atexit.register
+def _close_shared_workers():
+    for worker in list(_shared_workers.values()):
+        worker.close()
+
+
+# ============================================================================
+# Worker process side (runs inside the SadTalker directory)
+# ============================================================================
+
+class _SadTalkerServer:
+    """Holds loaded SadTalker models keyed by (size, facerender mode)"""
+
+    def __init__(self, checkpoint_dir: str, device: str):
+        import torch
+        from src.utils.preprocess import CropAndExtract
+        from src.test_audio2coeff import Audio2Coeff
+        from src.facerender.animate import AnimateFromCoeff
+        from src.generate_batch import get_data
+        from src.generate_facerender_batch import get_facerender_data
+        from src.utils.init_path import init_path
+
+        if device == 'auto':
+            device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.device = device
+        self.checkpoint_dir = checkpoint_dir
+        self.config_dir = os.path.join(os.getcwd(), 'src', 'config')
+
+        self._CropAndExtract = CropAndExtract
+        self._Audio2Coeff = Audio2Coeff
+        self._AnimateFromCoeff = AnimateFromCoeff
+        self._get_data = get_data
+        self._get_facerender_data = get_facerender_data
+        self._init_path = init_path
+        self._models = {}
+        self.face_cache = FaceCache()
+
+    def _get_models(self, size: int, preprocess: str):
+        # init_path only switches the facerender config between 'full' and the rest
+        key = (size, 'full' if 'full' in preprocess else 'crop')
+        if key not in self._models:
+            started = time.time()
+            paths = self._init_path(self.checkpoint_dir, self.config_dir, size, False, preprocess)
+            self._models[key] = (
+                self._CropAndExtract(paths, self.device),
+                self._Audio2Coeff(paths, self.device),
+                self._AnimateFromCoeff(paths, self.device)
+            )
+            print(f"Loaded SadTalker models {key} in {time.time() - started:.1f}s", file=sys.stderr)
+        return self._models[key]
+
+    def render(self, job: Dict) -> str:
+        preprocess = job['preprocess']
+        size = job['size']
+        still = job['still']
+        source_image = job['source_image']
+        audio_path = job['driven_audio']
+        preprocess_model, audio_to_coeff, animate_from_coeff = self._get_models(size, preprocess)
+
+        # Unique per job, so concurrent renders into one result_dir never collide
+        save_dir = tempfile.mkdtemp(prefix=time.strftime("%Y_%m_%d_%H.%M.%S_"), dir=job['result_dir'])
+        try:
+            first_frame_dir = os.path.join(save_dir, 'first_frame_dir')
+            os.makedirs(first_frame_dir, exist_ok=True)
+
+            # Face detection, landmarks and 3DMM fitting only depend on the image
+            cache_key = self.face_cache.make_key(source_image, preprocess, size)
+            cached = self.face_cache.get(cache_key)
+            if cached:
+                first_coeff_path, crop_pic_path, crop_info = cached
+            else:
+                first_coeff_path, crop_pic_path, crop_info = preprocess_model.generate(
+                    source_image, first_frame_dir, preprocess,
+                    source_image_flag=True, pic_size=size
+                )
+                if first_coeff_path is None:
+                    raise RuntimeError("Can't get the coeffs of the input image")
+                first_coeff_path, crop_pic_path, crop_info = self.face_cache.put(
+                    cache_key, source_image, first_coeff_path, crop_pic_path, crop_info
+                )
+
+            batch = self._get_data(first_coeff_path, audio_path, self.device, None, still=still)
+            coeff_path = audio_to_coeff.generate(batch, save_dir, job['pose_style'], None)
+
+            data = self._get_facerender_data(
+                coeff_path, crop_pic_path, first_coeff_path, audio_path,
+                job['batch_size'], None, None, None,
+                expression_scale=job['expression_scale'],
+                still_mode=still,
+                preprocess=preprocess,
+                size=size
+            )
+            result = animate_from_coeff.generate(
+                data, save_dir, source_image, crop_info,
+                enhancer=job['enhancer'],
+                background_enhancer=None,
+                preprocess=preprocess,
+                img_size=size
+            )
+
+            video_path = job.get('output_path') or save_dir + '.mp4'
+            shutil.move(result, video_path)
+            return video_path
+        finally:
+            # Intermediate frames and coefficients are never reused, even on failure
+            shutil.rmtree(save_dir, ignore_errors=True)
+
+
+def serve(sadtalker_path: str, checkpoint_dir: str, device: str):
+    """
+    Worker process main loop
+
+    Args:
+        sadtalker_path: Path to SadTalker repository
+        checkpoint_dir: Path to SadTalker checkpoints
+        device: 'cpu', 'cuda' or 'auto'
+    """
+    # SadTalker and the ffmpeg it spawns print to fd 1; keep it for protocol only
+    protocol = os.fdopen(os.dup(1), 'w', buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    sys.path.insert(0, sadtalker_path)
+
+    def send(message: Dict):
+        protocol.write(json.dumps(message) + '\n')
+        protocol.flush()
+
+    try:
+        server = _SadTalkerServer(checkpoint_dir, device)
+    except Exception as e:
+        traceback.print_exc()
+        send({'event': 'error', 'error': str(e)})
+        return
+    send({'event': 'ready', 'device': server.device})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        if job.get('op') == 'shutdown':
+            break
+        try:
+            started = time.time()
+            video_path = server.render(job)
+            send({
+                'id': job.get('id'),
+                'ok': True,
+                'video_path': video_path,
+                'seconds': round(time.time() - started, 3)
+            })
+        except Exception as e:
+            traceback.print_exc()
+            send({'id': job.get('id'), 'ok': False, 'error': str(e)})
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Persistent SadTalker inference worker")
+    parser.add_argument('--serve', action='store_true', help='Run the worker loop')
+    parser.add_argument('--sadtalker-path', default=str(DEFAULT_SADTALKER_PATH))
+    parser.add_argument('--checkpoint-dir', default=None)
+    parser.add_argument('--device', default='auto', choices=['auto', 'cpu', 'cuda'])
+    args = parser.parse_args()
+
+    checkpoint_dir = args.checkpoint_dir or os.path.join(args.sadtalker_path, 'checkpoints')
+    if args.serve:
+        serve(args.sadtalker_path, checkpoint_dir, args.device)
+    else:
+        parser.print_help()
@@ -0,0 +1,174 @@
+"""
+Script Streaming - Overlap script generation with text-to-speech
+Narration is pulled out of the streamed JSON, split into sentences and
+synthesized while the rest of the script is still being generated
+"""
+
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from .audio_utils import SentenceBuffer, split_sentences, concat_mp3
+from .tracing import propagate
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f'}
+
+
+def narration_text(script: Dict, fallback: str) -> str:
+    """
+    Get the spoken narration from a generated script
+
+    Args:
+        script: Script dictionary from GeminiClient
+        fallback: Text to use if the script has no narration
+
+    Returns:
+        Narration text
+    """
+    full_script = script.get('full_script', '')
+    if not full_script:
+        # Combine sections if no full_script
+        if 'sections' in script:
+            full_script = ' '.join([s['content'] for s in script['sections']])
+        else:
+            full_script = script.get('main_content', fallback)
+    return full_script
+
+
+def section_texts(script: Dict) -> List[str]:
+    """
+    Get the narration of a generated script as separate sections
+
+    The hook and call to action become their own first and last segments.
+
+    Args:
+        script: Script dictionary from GeminiClient
+
+    Returns:
+        Non-empty section texts in speaking order
+    """
+    texts = [script.get('hook', '')]
+    texts += [section.get('content', '') for section in script.get('sections', [])]
+    texts.append(script.get('call_to_action', ''))
+    return [text.strip() for text in texts if isinstance(text, str) and text.strip()]
+
+
+class JsonFieldStream:
+    """Decodes one JSON string field incrementally from streamed text"""
+
+    def __init__(self, field: str):
+        self._marker = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ''
+        self._pos = None
+        self.done = False
+
+    def feed(self, text: str) -> str:
+        """
+        Add streamed text
+
+        Args:
+            text: Newly arrived raw response text
+
+        Returns:
+            Newly decoded characters of the field value
+        """
+        self._buffer += text
+        if self.done:
+            return ''
+        if self._pos is None:
+            match = self._marker.search(self._buffer)
+            if not match:
+                return ''
+            self._pos = match.end()
+
+        buf, i, out = self._buffer, self._pos, []
+        while i < len(buf):
+            char = buf[i]
+            if char == '\\':
+                if i + 1 >= len(buf):
+                    break
+                escape = buf[i + 1]
+                if escape == 'u':
+                    if i + 6 > len(buf):
+                        break
+                    out.append(chr(int(buf[i + 2:i + 6], 16)))
+                    i += 6
+                    continue
+                out.append(_ESCAPES.get(escape, escape))
+                i += 2
+                continue
+            if char == '"':
+                self.done = True
+                i += 1
+                break
+            out.append(char)
+            i += 1
+        self._pos = i
+        return ''.join(out)
+
+
+def stream_script_to_speech(
+    gemini,
+    synthesize: Callable[[str, str], str],
+    topic: str,
+    duration: str,
+    style: str,
+    video_type: str,
+    output_path: str,
+    max_workers: int = 4
+) -> Dict:
+    """
+    Stream a script from Gemini and synthesize it sentence by sentence
+
+    Args:
+        gemini: GeminiClient
+        synthesize: Callable(text, output_path) producing an MP3
+        topic: Video topic
+        duration: Target duration
+        style: Content style
+        video_type: "long_form" or "short_form"
+        output_path: Where to save the joined narration MP3
+        max_workers: Concurrent TTS requests
+
+    Returns:
+        Parsed script dictionary
+    """
+    work_dir = Path(tempfile.mkdtemp(prefix='tts_stream_', dir=str(Path(output_path).parent)))
+    narration = JsonFieldStream('full_script')
+    sentences = SentenceBuffer()
+    futures = []
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tts') as executor:
+            def submit(sentence: str):
+                path = work_dir / f"sentence_{len(futures):04d}.mp3"
+                futures.append(executor.submit(propagate(synthesize), sentence, str(path)))
+
+            def on_chunk(chunk: str):
+                for sentence in sentences.feed(narration.feed(chunk)):
+                    submit(sentence)
+
+            script = gemini.generate_script_streaming(
+                topic=topic,
+                duration=duration,
+                style=style,
+                video_type=video_type,
+                on_chunk=on_chunk
+            )
+            for sentence in sentences.flush():
+                submit(sentence)
+
+            if not futures:
+                # No streamable full_script field; fall back to the parsed script
+                for sentence in split_sentences(narration_text(script, topic)):
+                    submit(sentence)
+
+            paths = [future.result() for future in futures]
+
+        concat_mp3(paths, output_path)
+        return script
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,354 @@
+"""
+Tracing - Lightweight spans for the content pipeline hot paths
+Records start/end, bytes in/out and cache hits per stage, summarizes them
+per run and exports Chrome trace (chrome://tracing, Perfetto) or JSONL files
+"""
+
+import os
+import json
+import time
+import functools
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class Span:
+    """One timed operation with free-form attributes"""
+
+    __slots__ = ('span_id', 'parent_id', 'name', 'attrs', 'start', 'end', 'thread_id', 'thread_name')
+
+    def __init__(self, span_id: int, parent_id: Optional[int], name: str, attrs: Dict):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self.end: Optional[float] = None
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+
+    @property
+    def seconds(self) -> float:
+        return (self.end if self.end is not None else time.time()) - self.start
+
+    def set(self, **attrs):
+        """Set attributes (e.g. cache_hit=True, bytes_out=1024)"""
+        self.attrs.update(attrs)
+
+    def add(self, **counters):
+        """Increment numeric attributes (e.g. cache_hits=1)"""
+        for key, value in counters.items():
+            self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.span_id,
+            'parent': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'end': self.end,
+            'seconds': round(self.seconds, 4),
+            'thread': self.thread_name,
+            'attrs': self.attrs
+        }
+
+
+class _NullSpan:
+    """Stand-in yielded when no tracer is active"""
+
+    def set(self, **attrs):
+        pass
+
+    def add(self, **counters):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+_current_tracer: contextvars.ContextVar[Optional['Tracer']] = contextvars.ContextVar('tracer', default=None)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('span', default=None)
+
+
+class Tracer:
+    """Collects the spans of one run (thread-safe)"""
+
+    def __init__(self, name: str = 'run'):
+        """
+        Initialize tracer
+
+        Args:
+            name: Run name shown as the process name in Chrome traces
+        """
+        self.name = name
+        self._spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        """
+        Time a block as a child of the current span
+
+        Args:
+            name: Span name ('<category>.<operation>' groups spans in summaries)
+            **attrs: Initial attributes
+
+        Yields:
+            The open span
+        """
+        parent = _current_span.get()
+        current = Span(next(self._ids), parent.span_id if parent else None, name, attrs)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.set(error=type(e).__name__)
+            raise
+        finally:
+            current.end = time.time()
+            _current_span.reset(token)
+            with self._lock:
+                self._spans.append(current)
+
+    def spans(self) -> List[Span]:
+        """Finished spans in completion order"""
+        with self._lock:
+            return list(self._spans)
+
+    def breakdown(self, root: Optional[Span] = None) -> Dict:
+        """
+        Summarize where the time of a run went
+
+        Args:
+            root: Only count spans below this one (default: all spans)
+
+        Returns:
+            Dictionary with wall_seconds, per-category seconds (outermost
+            spans of each category, so nesting isn't double counted) and
+            per-span-name count/seconds/bytes/cache hits
+        """
+        spans = self.spans()
+        if root is not None:
+            children: Dict[Optional[int], List[Span]] = {}
+            for s in spans:
+                children.setdefault(s.parent_id, []).append(s)
+            selected, frontier = [], [root.span_id]
+            while frontier:
+                below = children.get(frontier.pop(), [])
+                selected.extend(below)
+                frontier.extend(s.span_id for s in below)
+            spans = selected
+        by_id = {s.span_id: s for s in spans}
+
+        stages: Dict[str, Dict] = {}
+        categories: Dict[str, float] = {}
+        for s in spans:
+            stage = stages.setdefault(s.name, {'count': 0, 'seconds': 0.0})
+            stage['count'] += 1
+            stage['seconds'] += s.seconds
+            for key in ('bytes_in', 'bytes_out', 'cache_hits'):
+                if key in s.attrs:
+                    stage[key] = stage.get(key, 0) + s.attrs[key]
+            if s.attrs.get('cache_hit'):
+                stage['cache_hits'] = stage.get('cache_hits', 0) + 1
+
+            category = s.name.split('.')[0] if '.' in s.name else None
+            parent = by_id.get(s.parent_id)
+            nested = parent is not None and '.' in parent.name and parent.name.split('.')[0] == category
+            if category and not nested:
+                categories[category] = categories.get(category, 0.0) + s.seconds
+
+        if root is not None:
+            wall = root.seconds
+        elif spans:
+            wall = max(s.end or time.time() for s in spans) - min(s.start for s in spans)
+        else:
+            wall = 0.0
+        return {
+            'wall_seconds': round(wall, 3),
+            'categories': {k: round(v, 3) for k, v in sorted(categories.items(), key=lambda kv: -kv[1])},
+            'stages': {
+                name: {k: round(v, 3) if isinstance(v, float) else v for k, v in stage.items()}
+                for name, stage in sorted(stages.items(), key=lambda kv: -kv[1]['seconds'])
+            }
+        }
+
+    def write(self, path: str) -> str:
+        """
+        Write the trace to a file
+
+        Args:
+            path: '.jsonl' for one span per line, anything else for a Chrome trace
+
+        Returns:
+            The path written
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        spans = sorted(self.spans(), key=lambda s: s.start)
+        with open(path, 'w') as f:
+            if path.endswith('.jsonl'):
+                for s in spans:
+                    f.write(json.dumps(s.to_dict(), default=str) + '\n')
+            else:
+                json.dump(self._chrome_events(spans), f, default=str)
+        return path
+
+    def _chrome_events(self, spans: List[Span]) -> Dict:
+        pid = os.getpid()
+        threads: Dict[Tuple[int, str], int] = {}
+        events = [{'ph': 'M', 'pid': pid, 'name': 'process_name', 'args': {'name': self.name}}]
+        for s in spans:
+            tid = threads.setdefault((s.thread_id, s.thread_name), len(threads) + 1)
+            events.append({
+                'ph': 'X',
+                'pid': pid,
+                'tid': tid,
+                'name': s.name,
+                'cat': s.name.split('.')[0] if '.' in s.name else 'step',
+                'ts': s.start * 1e6,
+                'dur': s.seconds * 1e6,
+                'args': s.attrs
+            })
+        for (_, thread_name), tid in threads.items():
+            events.append({'ph': 'M', 'pid': pid, 'tid': tid, 'name': 'thread_name', 'args': {'name': thread_name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Tracer active in this context, if any"""
+    return _current_tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer) -> Iterator[Tracer]:
+    """Make a tracer active for the enclosed block"""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Any]:
+    """
+    Time a block on the active tracer (no-op when tracing is off)
+
+    Args:
+        name: Span name
+        **attrs: Initial attributes
+
+    Yields:
+        Span (or a null span accepting the same calls)
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield _NULL_SPAN
+        return
+    with tracer.span(name, **attrs) as current:
+        yield current
+
+
+def current_span() -> Any:
+    """The innermost open span (or a null span)"""
+    return _current_span.get() or _NULL_SPAN
+
+
+@contextmanager
+def trace_run(name: str, **attrs) -> Iterator[Tuple[Tracer, Any]]:
+    """
+    Open a run's root span, starting a tracer if none is active
+
+    Args:
+        name: Root span name
+        **attrs: Root span attributes
+
+    Yields:
+        (tracer, root span)
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        with use_tracer(Tracer(name)) as tracer, tracer.span(name, **attrs) as root:
+            yield tracer, root
+    else:
+        with tracer.span(name, **attrs) as root:
+            yield tracer, root
+
+
+def propagate(fn: Callable) -> Callable:
+    """
+    Carry the current tracer and span into executor threads
+
+    Thread pools don't inherit context variables; wrap callables before
+    submitting them so their spans nest under the submitting span.
+
+    Args:
+        fn: Callable to run in another thread
+
+    Returns:
+        Wrapped callable (safe to call from several threads at once)
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+
+def traced(name: str, output_file: bool = False) -> Callable:
+    """
+    Decorator running a function inside a span
+
+    Args:
+        name: Span name
+        output_file: The function returns a file path; record its size as bytes_out
+
+    Returns:
+        Decorator
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name) as current:
+                result = fn(*args, **kwargs)
+                if output_file:
+                    current.set(bytes_out=file_size(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def format_breakdown(breakdown: Dict, top: int = 12) -> str:
+    """
+    Render a run breakdown as a text report
+
+    Args:
+        breakdown: Output of Tracer.breakdown
+        top: Span names to list (slowest first)
+
+    Returns:
+        Multi-line report
+    """
+    lines = [f"⏱️ Wall time {breakdown['wall_seconds']:.1f}s"]
+    if breakdown['categories']:
+        lines.append("   " + ", ".join(f"{k} {v:.1f}s" for k, v in breakdown['categories'].items()))
+    for name, stage in list(breakdown['stages'].items())[:top]:
+        extras = ''
+        if stage.get('cache_hits'):
+            extras += f"  {stage['cache_hits']} cache hit(s)"
+        if stage.get('bytes_out'):
+            extras += f"  {stage['bytes_out'] / 1024:.0f} KB out"
+        lines.append(f"   {name:<28}{stage['count']:>4}x{stage['seconds']:>9.2f}s{extras}")
+    return '\n'.join(lines)
+
+
+def file_size(path: Any) -> int:
+    """Size of a file in bytes, 0 if it doesn't exist"""
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
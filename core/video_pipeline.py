@@ -4,30 +4,65 @@ Handles TTS, stock footage, and video assembly
 """
 
 import os
-import requests
+import textwrap
+import functools
+import tempfile
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
-from gtts import gTTS
-try:
-    from moviepy.editor import (
-        VideoFileClip, AudioFileClip, ImageClip,
-        concatenate_videoclips, CompositeVideoClip, TextClip
-    )
-except ImportError:
-    print("⚠️ MoviePy not installed. Install with: pip install moviepy")
+from typing import Callable, List, Dict, Optional
+
+from .chunked_tts import ChunkedSynthesizer
+from .audio_cache import AudioCache, get_audio_cache
+from .ffmpeg_utils import FFmpegError, get_ffmpeg_exe, probe_media, run_ffmpeg
+from .media_cache import MediaCache, get_media_cache
+from .pexels_client import PexelsClient
+from .tracing import current_span, file_size, span, traced
+
+# gTTS and MoviePy (numpy, imageio, PIL) are imported on first use:
+# most runs never hit the MoviePy fallbacks, and importing them costs seconds
 
 
 class VideoPipeline:
     """Combines Text-To-Video-AI logic with avatar generation"""
     
-    def __init__(self, pexels_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        pexels_api_key: Optional[str] = None,
+        tts_backend: Optional[Callable[[str, str, str, bool], None]] = None,
+        tts_chunk_chars: int = 500,
+        tts_workers: int = 4,
+        audio_cache: Optional[AudioCache] = None,
+        use_audio_cache: bool = True,
+        use_ffmpeg: bool = True,
+        pexels_api_base: Optional[str] = None,
+        media_cache: Optional[MediaCache] = None,
+        use_media_cache: bool = True
+    ):
         """
         Initialize video pipeline
         
         Args:
             pexels_api_key: Pexels API key for stock footage
+            tts_backend: Callable(text, output_path, lang, slow) writing an MP3 (default: gTTS)
+            tts_chunk_chars: Long narration is synthesized in chunks of about this size
+            tts_workers: Concurrent TTS chunk requests
+            audio_cache: TTS clip cache (default: shared output/cache/audio)
+            use_audio_cache: Set False to always synthesize
+            use_ffmpeg: Render with ffmpeg directly when possible (MoviePy otherwise)
+            pexels_api_base: Pexels API root (or PEXELS_API_BASE env var; e.g. a local stand-in)
+            media_cache: Stock media library (default: shared output/cache/media)
+            use_media_cache: Set False to always search and download from Pexels
         """
         self.pexels_api_key = pexels_api_key or os.getenv('PEXELS_API_KEY')
+        self.pexels_api_base = (pexels_api_base or os.getenv('PEXELS_API_BASE', 'https://api.pexels.com')).rstrip('/')
+        self.tts_backend = tts_backend or self._gtts_backend
+        self.tts_chunk_chars = tts_chunk_chars
+        self.tts_workers = tts_workers
+        self.audio_cache = (audio_cache or get_audio_cache()) if use_audio_cache else None
+        self.use_ffmpeg = use_ffmpeg and get_ffmpeg_exe() is not None
+        self.media_cache = media_cache
+        self.use_media_cache = use_media_cache
         if not self.pexels_api_key:
             print("⚠️ PEXELS_API_KEY not set. Stock footage will not be available.")
         
@@ -52,15 +87,40 @@ class VideoPipeline:
         Returns:
             Path to generated audio file
         """
-        try:
-            print(f"🎤 Generating speech: {text[:50]}...")
-            tts = gTTS(text=text, lang=lang, slow=slow)
-            tts.save(output_path)
-            print(f"✅ Audio saved: {output_path}")
-            return output_path
-        except Exception as e:
-            print(f"❌ TTS error: {e}")
-            raise
+        with span('tts.synthesize', bytes_in=len(text.encode('utf-8'))) as current:
+            try:
+                print(f"🎤 Generating speech: {text[:50]}...")
+                # gTTS sends one request per ~100 chars in sequence; chunks run in parallel
+                synthesizer = ChunkedSynthesizer(
+                    backend=lambda chunk, path: self.tts_backend(chunk, path, lang, slow),
+                    chunk_chars=self.tts_chunk_chars,
+                    max_workers=self.tts_workers,
+                    cache=self.audio_cache,
+                    engine='gtts',
+                    voice=lang,
+                    rate='slow' if slow else 'normal'
+                )
+                synthesizer.synthesize(text, output_path)
+                stats = synthesizer.last_stats
+                current.set(chunks=stats['chunks'], cache_hits=stats['cache_hits'], bytes_out=file_size(output_path))
+                print(f"✅ Audio saved: {output_path} ({stats['cache_hits']}/{stats['chunks']} chunks from cache)")
+                return output_path
+            except Exception as e:
+                print(f"❌ TTS error: {e}")
+                raise
+    
+    @staticmethod
+    def _gtts_backend(text: str, output_path: str, lang: str, slow: bool):
+        from gtts import gTTS
+        
+        tts = gTTS(text=text, lang=lang, slow=slow)
+        tts.save(output_path)
+    
+    @functools.cached_property
+    def pexels(self) -> PexelsClient:
+        """Pooled Pexels client backed by the media cache (created on first use)"""
+        cache = (self.media_cache or get_media_cache()) if self.use_media_cache else None
+        return PexelsClient(api_key=self.pexels_api_key, api_base=self.pexels_api_base, cache=cache)
     
     def get_stock_image(
         self,
@@ -80,30 +140,11 @@ class VideoPipeline:
         if not self.pexels_api_key:
             return None
         
-        headers = {'Authorization': self.pexels_api_key}
-        params = {
-            'query': query,
-            'orientation': orientation,
-            'size': 'large',
-            'per_page': 1
-        }
-        
         try:
-            response = requests.get(
-                'https://api.pexels.com/v1/search',
-                headers=headers,
-                params=params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data['photos']:
-                    image_url = data['photos'][0]['src']['large']
-                    print(f"✅ Found stock image for: {query}")
-                    return image_url
-            else:
-                print(f"⚠️ Pexels API error: {response.status_code}")
+            match = self.pexels.search(query, 'photo', orientation)
+            if match:
+                print(f"✅ Found stock image for: {query}")
+                return match['url']
         except Exception as e:
             print(f"❌ Error fetching stock image: {e}")
         
@@ -127,41 +168,67 @@ class VideoPipeline:
         if not self.pexels_api_key:
             return None
         
-        headers = {'Authorization': self.pexels_api_key}
-        params = {
-            'query': query,
-            'orientation': orientation,
-            'size': 'medium',
-            'per_page': 1
-        }
-        
         try:
-            response = requests.get(
-                'https://api.pexels.com/videos/search',
-                headers=headers,
-                params=params,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data['videos']:
-                    # Get HD video file
-                    video_files = data['videos'][0]['video_files']
-                    hd_video = next(
-                        (v for v in video_files if v['quality'] == 'hd'),
-                        video_files[0]
-                    )
-                    video_url = hd_video['link']
-                    print(f"✅ Found stock footage for: {query}")
-                    return video_url
-            else:
-                print(f"⚠️ Pexels API error: {response.status_code}")
+            match = self.pexels.search(query, 'video', orientation)
+            if match:
+                print(f"✅ Found stock footage for: {query}")
+                return match['url']
         except Exception as e:
             print(f"❌ Error fetching stock footage: {e}")
         
         return None
     
+    def get_stock_media_batch(
+        self,
+        queries: List[str],
+        kind: str = 'video',
+        orientation: str = 'landscape'
+    ) -> Dict[str, Optional[str]]:
+        """
+        Search stock media for many queries at once (e.g. one per script section)
+        
+        Args:
+            queries: Search queries
+            kind: 'video' or 'photo'
+            orientation: 'landscape', 'portrait', or 'square'
+            
+        Returns:
+            {query: media URL or None}
+        """
+        if not self.pexels_api_key:
+            return {query: None for query in queries}
+        
+        matches = self.pexels.search_many(queries, kind, orientation)
+        return {query: match['url'] if match else None for query, match in matches.items()}
+    
+    def prefetch_stock_media(
+        self,
+        queries: List[str],
+        output_dir: str,
+        kind: str = 'video',
+        orientation: str = 'landscape'
+    ) -> Dict[str, Future]:
+        """
+        Start downloading stock media in the background
+        
+        Call this as soon as the queries are known (e.g. right after the
+        script is written) so downloads overlap with TTS.
+        
+        Args:
+            queries: Search queries
+            output_dir: Download directory
+            kind: 'video' or 'photo'
+            orientation: 'landscape', 'portrait', or 'square'
+            
+        Returns:
+            {query: Future resolving to the local path, or None if nothing matched}
+        """
+        if not self.pexels_api_key:
+            return {}
+        
+        print(f"📥 Prefetching stock {kind} for {len(queries)} queries...")
+        return self.pexels.prefetch(queries, output_dir, kind, orientation)
+    
     def download_media(self, url: str, output_path: str) -> str:
         """
         Download media file from URL
@@ -175,19 +242,14 @@ class VideoPipeline:
         """
         try:
             print(f"📥 Downloading: {url[:50]}...")
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
+            self.pexels.download(url, output_path)
             print(f"✅ Downloaded: {output_path}")
             return output_path
         except Exception as e:
             print(f"❌ Download error: {e}")
             raise
     
+    @traced('video.simple', output_file=True)
     def create_simple_video(
         self,
         image_path: str,
@@ -207,7 +269,16 @@ class VideoPipeline:
         Returns:
             Path to created video
         """
+        if self.use_ffmpeg:
+            try:
+                return self._create_simple_video_ffmpeg(image_path, audio_path, output_path, add_text)
+            except (FFmpegError, OSError) as e:
+                print(f"⚠️ ffmpeg fast path failed ({e}), falling back to MoviePy")
+                current_span().set(fallback='moviepy')
+        
         try:
+            from moviepy.editor import AudioFileClip, CompositeVideoClip, ImageClip, TextClip
+            
             print(f"🎬 Creating video...")
             
             # Load audio to get duration
@@ -248,6 +319,103 @@ class VideoPipeline:
             print(f"❌ Video creation error: {e}")
             raise
     
+    def _create_simple_video_ffmpeg(
+        self,
+        image_path: str,
+        audio_path: str,
+        output_path: str,
+        add_text: Optional[str] = None
+    ) -> str:
+        """
+        ffmpeg-only still image + audio video
+        
+        Two cheap ffmpeg calls instead of MoviePy's per-frame Python loop:
+        a 2-second, single-GOP segment of the still (24 fps, -tune stillimage,
+        text drawn onto the image beforehand) is encoded once, then looped
+        with stream copy for the length of the audio. AAC/MP3 audio is
+        copied as is.
+        """
+        print(f"🎬 Creating video (ffmpeg)...")
+        audio_info = probe_media(audio_path)
+        if not audio_info['audio'] or not audio_info['duration']:
+            raise FFmpegError(f"No audio stream in {audio_path}")
+        
+        output = Path(output_path)
+        copy_audio = (
+            audio_info['audio']['codec'] == 'aac'
+            or (audio_info['audio']['codec'] == 'mp3' and output.suffix.lower() in ('.mp4', '.mov', '.mkv'))
+        )
+        tmp_output = output.with_name(f"{output.stem}.tmp{output.suffix}")
+        
+        try:
+            with tempfile.TemporaryDirectory(prefix='simple_video_') as tmp_dir:
+                frame_path = image_path
+                if add_text:
+                    frame_path = os.path.join(tmp_dir, 'frame.png')
+                    self._render_text_overlay(image_path, add_text, frame_path)
+                
+                segment_path = os.path.join(tmp_dir, 'still.mp4')
+                run_ffmpeg([
+                    '-loop', '1', '-framerate', '24', '-i', frame_path,
+                    '-vf', 'scale=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p',
+                    '-c:v', 'libx264', '-tune', 'stillimage', '-preset', 'veryfast',
+                    '-g', '48', '-t', '2', '-an', segment_path
+                ])
+                run_ffmpeg([
+                    '-stream_loop', '-1', '-i', segment_path,
+                    '-i', audio_path,
+                    '-map', '0:v:0', '-map', '1:a:0',
+                    '-c:v', 'copy',
+                    '-c:a', 'copy' if copy_audio else 'aac',
+                    '-t', f"{audio_info['duration']:.3f}",
+                    '-movflags', '+faststart',
+                    str(tmp_output)
+                ])
+            
+            os.replace(tmp_output, output)
+        finally:
+            # A failed encode must not leave a partial file next to the output
+            if tmp_output.exists():
+                tmp_output.unlink()
+        print(f"✅ Video created: {output_path}")
+        return output_path
+    
+    @staticmethod
+    def _render_text_overlay(image_path: str, text: str, output_path: str):
+        """Draw centered white title text (with outline) onto a copy of the image"""
+        from PIL import Image, ImageDraw, ImageFont
+        
+        image = Image.open(image_path).convert('RGB')
+        font = None
+        for name in ('Arial Bold.ttf', 'arialbd.ttf', 'DejaVuSans-Bold.ttf', 'LiberationSans-Bold.ttf'):
+            try:
+                font = ImageFont.truetype(name, 70)
+                break
+            except OSError:
+                continue
+        if font is None:
+            try:
+                font = ImageFont.load_default(size=70)
+            except TypeError:
+                font = ImageFont.load_default()
+        
+        draw = ImageDraw.Draw(image)
+        # Wrap to roughly 90% of the frame width
+        char_width = max(1, draw.textlength('M', font=font) * 0.6)
+        wrapped = textwrap.fill(text, width=max(10, int(image.width * 0.9 / char_width)))
+        draw.multiline_text(
+            (image.width / 2, image.height / 2),
+            wrapped,
+            font=font,
+            fill='white',
+            anchor='mm',
+            align='center',
+            stroke_width=3,
+            stroke_fill='black'
+        )
+        image.save(output_path)
+    
+    @traced('video.concat', output_file=True)
     def combine_videos(
         self,
         video_paths: List[str],
@@ -263,7 +431,16 @@ class VideoPipeline:
         Returns:
             Path to combined video
         """
+        if self.use_ffmpeg:
+            try:
+                return self._combine_videos_ffmpeg(video_paths, output_path)
+            except (FFmpegError, OSError) as e:
+                print(f"⚠️ ffmpeg concat failed ({e}), falling back to MoviePy")
+                current_span().set(fallback='moviepy')
+        
         try:
+            from moviepy.editor import VideoFileClip, concatenate_videoclips
+            
             print(f"🎬 Combining {len(video_paths)} videos...")
             
             clips = [VideoFileClip(path) for path in video_paths]
@@ -287,26 +464,133 @@ class VideoPipeline:
             print(f"❌ Video combination error: {e}")
             raise
     
+    @staticmethod
+    def _stream_signature(info: Dict) -> Optional[tuple]:
+        """Parameters that must match for concat-demuxer stream copy"""
+        video, audio = info['video'], info['audio']
+        if not video or not audio:
+            return None
+        return (
+            video['codec'], video['width'], video['height'], video['fps'], video['pix_fmt'],
+            audio['codec'], audio['sample_rate'], audio['channels']
+        )
+    
+    def _combine_videos_ffmpeg(self, video_paths: List[str], output_path: str) -> str:
+        """
+        Concatenate with the concat demuxer and stream copy
+        
+        Segments are probed; any whose codec, size, fps or audio format
+        differ from the majority are re-encoded to match (in parallel)
+        before the copy-concat.
+        """
+        print(f"🎬 Combining {len(video_paths)} videos (ffmpeg concat)...")
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            infos = list(executor.map(probe_media, video_paths))
+        
+        signatures = [self._stream_signature(info) for info in infos]
+        common = Counter(sig for sig in signatures if sig).most_common(1)
+        if common and common[0][0][0] == 'h264' and common[0][0][5] in ('aac', 'mp3'):
+            target = common[0][0]
+        else:
+            # No usable majority: normalize everything to H.264/AAC at the first segment's size
+            video = next((info['video'] for info in infos if info['video']), None)
+            if not video:
+                raise FFmpegError("No video stream in any input")
+            target = ('h264', video['width'], video['height'], video['fps'] or 24, 'yuv420p', 'aac', 44100, 'stereo')
+        
+        output = Path(output_path)
+        tmp_output = output.with_name(f"{output.stem}.tmp{output.suffix}")
+        try:
+            with tempfile.TemporaryDirectory(prefix='concat_', dir=str(output.parent)) as tmp_dir:
+                mismatched = [i for i, sig in enumerate(signatures) if sig != target]
+                parts = list(video_paths)
+                if mismatched:
+                    print(f"   Normalizing {len(mismatched)}/{len(video_paths)} segments...")
+                    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                        normalized = executor.map(
+                            lambda i: self._normalize_segment(
+                                video_paths[i], infos[i], target, os.path.join(tmp_dir, f"segment_{i:04d}.mp4")
+                            ),
+                            mismatched
+                        )
+                        for i, path in zip(mismatched, normalized):
+                            parts[i] = path
+            
+                list_path = os.path.join(tmp_dir, 'segments.txt')
+                with open(list_path, 'w') as f:
+                    for part in parts:
+                        escaped = str(Path(part).resolve()).replace("'", "'\\''")
+                        f.write(f"file '{escaped}'\n")
+                run_ffmpeg([
+                    '-f', 'concat', '-safe', '0', '-i', list_path,
+                    '-map', '0:v:0', '-map', '0:a:0', '-c', 'copy',
+                    '-movflags', '+faststart', str(tmp_output)
+                ])
+            
+            os.replace(tmp_output, output)
+        finally:
+            if tmp_output.exists():
+                tmp_output.unlink()
+        print(f"✅ Combined video created: {output_path}")
+        return output_path
+    
+    @staticmethod
+    def _normalize_segment(input_path: str, info: Dict, target: tuple, output_path: str) -> str:
+        """Re-encode one segment to the target stream parameters"""
+        _, width, height, fps, pix_fmt, _, sample_rate, channels = target
+        args = ['-i', input_path]
+        if not info['audio']:
+            # Silent segments get a silent track so every part has the same streams
+            args += ['-f', 'lavfi', '-i', f"anullsrc=sample_rate={sample_rate}"]
+        args += [
+            '-map', '0:v:0', '-map', '0:a:0' if info['audio'] else '1:a:0',
+            '-vf', (
+                f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format={pix_fmt}"
+            ),
+            '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '20',
+            '-c:a', 'libmp3lame' if target[5] == 'mp3' else 'aac', '-ar', str(sample_rate),
+            '-ac', str({'mono': 1, 'stereo': 2}.get(channels, 2)),
+            '-shortest', output_path
+        ]
+        run_ffmpeg(args)
+        return output_path
+    
+    @traced('video.music', output_file=True)
     def add_background_music(
         self,
         video_path: str,
         music_path: str,
         output_path: str,
-        music_volume: float = 0.1
+        music_volume: float = 0.1,
+        duck: bool = True
     ) -> str:
         """
         Add background music to video
         
+        Music is looped or trimmed to the video length and mixed under the
+        existing audio. The video stream is copied, not re-encoded.
+        
         Args:
             video_path: Path to video
             music_path: Path to music file
             output_path: Where to save result
             music_volume: Music volume (0.0-1.0)
+            duck: Lower the music further while someone is speaking
             
         Returns:
             Path to video with music
         """
+        if self.use_ffmpeg:
+            try:
+                return self._add_background_music_ffmpeg(video_path, music_path, output_path, music_volume, duck)
+            except (FFmpegError, OSError) as e:
+                print(f"⚠️ ffmpeg mix failed ({e}), falling back to MoviePy")
+                current_span().set(fallback='moviepy')
+        
         try:
+            from moviepy.editor import AudioFileClip, CompositeAudioClip, VideoFileClip
+            
             print(f"🎵 Adding background music...")
             
             video = VideoFileClip(video_path)
@@ -318,11 +602,12 @@ class VideoPipeline:
             else:
                 music = music.subclip(0, video.duration)
             
-            # Combine original audio with music
+            # Mix original audio with music (no ducking on this path)
             if video.audio:
-                final_audio = video.audio.volumex(1.0)
-                # Mix audio (this is simplified, might need adjustment)
-                video = video.set_audio(final_audio)
+                final_audio = CompositeAudioClip([video.audio, music])
+            else:
+                final_audio = music
+            video = video.set_audio(final_audio.set_duration(video.duration))
             
             video.write_videofile(
                 output_path,
@@ -339,6 +624,57 @@ class VideoPipeline:
         except Exception as e:
             print(f"❌ Error adding music: {e}")
             raise
+    
+    def _add_background_music_ffmpeg(
+        self,
+        video_path: str,
+        music_path: str,
+        output_path: str,
+        music_volume: float,
+        duck: bool
+    ) -> str:
+        """Mix music under the speech track with ffmpeg, copying the video stream"""
+        print(f"🎵 Adding background music (ffmpeg)...")
+        info = probe_media(video_path)
+        if not info['video'] or not info['duration']:
+            raise FFmpegError(f"No video stream in {video_path}")
+        
+        music = f"[1:a]aformat=sample_fmts=fltp:channel_layouts=stereo,volume={music_volume}"
+        if not info['audio']:
+            graph = f"{music}[aout]"
+        elif duck:
+            # Speech drives a sidechain compressor on the music, then both are summed
+            graph = (
+                "[0:a]aformat=sample_fmts=fltp:channel_layouts=stereo,asplit=2[voice][key];"
+                f"{music}[music];"
+                "[music][key]sidechaincompress=threshold=0.02:ratio=8:attack=20:release=400[ducked];"
+                "[voice][ducked]amix=inputs=2:duration=first:dropout_transition=0:normalize=0[aout]"
+            )
+        else:
+            graph = (
+                "[0:a]aformat=sample_fmts=fltp:channel_layouts=stereo[voice];"
+                f"{music}[music];"
+                "[voice][music]amix=inputs=2:duration=first:dropout_transition=0:normalize=0[aout]"
+            )
+        
+        output = Path(output_path)
+        tmp_output = output.with_name(f"{output.stem}.tmp{output.suffix}")
+        try:
+            run_ffmpeg([
+                '-i', video_path,
+                '-stream_loop', '-1', '-i', music_path,
+                '-filter_complex', graph,
+                '-map', '0:v:0', '-map', '[aout]',
+                '-c:v', 'copy', '-c:a', 'aac', '-b:a', '192k',
+                '-t', f"{info['duration']:.3f}",
+                '-movflags', '+faststart', str(tmp_output)
+            ])
+            os.replace(tmp_output, output)
+        finally:
+            if tmp_output.exists():
+                tmp_output.unlink()
+        print(f"✅ Video with music created: {output_path}")
+        return output_path
 
 
 # Example usage
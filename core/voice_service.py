@@ -0,0 +1,201 @@
+"""
+Voice Service - Persistent edge-tts synthesizer
+Owns one event loop on a background thread and one shared connection pool,
+so many short utterances don't each pay for loop and connection setup
+"""
+
+import os
+import atexit
+import asyncio
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import aiohttp
+import edge_tts
+
+from .retry import RetryPolicy
+
+DEFAULT_VOICE = "en-US-AriaNeural"
+
+# Transient failures of the websocket service worth retrying
+RETRYABLE_TTS_ERRORS = (
+    aiohttp.ClientError,
+    edge_tts.exceptions.NoAudioReceived,
+    edge_tts.exceptions.WebSocketError,
+    ConnectionError,
+    TimeoutError,
+    asyncio.TimeoutError,
+)
+
+
+class _SharedConnector(aiohttp.TCPConnector):
+    """TCPConnector that outlives the per-request ClientSession edge-tts opens"""
+
+    async def close(self, *args, **kwargs):
+        # Sessions close their connector on exit; the service closes it in shutdown()
+        return None
+
+    async def shutdown(self):
+        await super().close()
+
+
+class VoiceService:
+    """Synthesizes speech with edge-tts on a long-lived background event loop"""
+
+    def __init__(
+        self,
+        voice: str = DEFAULT_VOICE,
+        rate: str = "+0%",
+        max_concurrency: int = 6,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        """
+        Initialize voice service and start its event loop thread
+
+        Args:
+            voice: Default edge-tts voice
+            rate: Default speaking rate (e.g. '+0%', '-10%')
+            max_concurrency: Simultaneous connections to the TTS service
+            retry_policy: Per-utterance retry policy (default: 3 attempts on transient errors)
+        """
+        self.voice = voice
+        self.rate = rate
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=3,
+            base_delay=1.0,
+            retry_on=RETRYABLE_TTS_ERRORS,
+            on_retry=lambda attempt, delay, e: print(
+                f"⚠️ edge-tts failed ({e}), retry {attempt} in {delay:.1f}s"
+            )
+        )
+        self._connector: Optional[_SharedConnector] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="voice-service", daemon=True)
+        self._thread.start()
+
+    def _submit(self, coro):
+        if self._loop.is_closed():
+            coro.close()
+            raise RuntimeError("VoiceService is closed")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _synthesize_once(self, text: str, output_path: str, voice: str, rate: str):
+        # Loop-bound objects are created lazily on the service loop
+        if self._connector is None:
+            self._connector = _SharedConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            tmp_path = f"{output_path}.tmp"
+            communicate = edge_tts.Communicate(text, voice, rate=rate, connector=self._connector)
+            await communicate.save(tmp_path)
+            os.replace(tmp_path, output_path)
+        return output_path
+
+    async def asynthesize(
+        self,
+        text: str,
+        output_path: str,
+        voice: Optional[str] = None,
+        rate: Optional[str] = None
+    ) -> str:
+        """Coroutine form of synthesize(); must run on the service loop"""
+        return await self.retry_policy.acall(
+            self._synthesize_once, text, output_path, voice or self.voice, rate or self.rate
+        )
+
+    def synthesize(
+        self,
+        text: str,
+        output_path: str,
+        voice: Optional[str] = None,
+        rate: Optional[str] = None
+    ) -> str:
+        """
+        Synthesize one utterance to an MP3 file (blocking, thread-safe)
+
+        Args:
+            text: Text to speak
+            output_path: Where to save audio file
+            voice: edge-tts voice (default: service voice)
+            rate: Speaking rate (default: service rate)
+
+        Returns:
+            Path to generated audio file
+        """
+        return self._submit(self.asynthesize(text, output_path, voice, rate))
+
+    def synthesize_many(
+        self,
+        items: Sequence[Tuple[str, str]],
+        voice: Optional[str] = None,
+        rate: Optional[str] = None
+    ) -> List[str]:
+        """
+        Synthesize several utterances concurrently
+
+        Args:
+            items: (text, output_path) pairs
+            voice: edge-tts voice (default: service voice)
+            rate: Speaking rate (default: service rate)
+
+        Returns:
+            Output paths in input order
+
+        Raises:
+            The first failure, after every other utterance has finished
+        """
+        async def _run_all():
+            return await asyncio.gather(
+                *(self.asynthesize(text, path, voice, rate) for text, path in items),
+                return_exceptions=True
+            )
+
+        results = self._submit(_run_all())
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    def close(self):
+        """Close the connection pool and stop the event loop thread"""
+        if self._loop.is_closed():
+            return
+        if self._connector is not None:
+            asyncio.run_coroutine_threadsafe(self._connector.shutdown(), self._loop).result()
+            self._connector = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_shared_services = {}
+_shared_lock = threading.Lock()
+
+
+def get_voice_service(voice: str = DEFAULT_VOICE) -> VoiceService:
+    """
+    Get the process-wide voice service for a voice
+
+    Args:
+        voice: Default edge-tts voice of the service
+
+    Returns:
+        Shared, running VoiceService
+    """
+    with _shared_lock:
+        service = _shared_services.get(voice)
+        if service is None:
+            service = VoiceService(voice=voice)
+            _shared_services[voice] = service
+        return service
+
+
+@atexit.register
+def _close_shared_services():
+    for service in list(_shared_services.values()):
+        try:
+            service.close()
+        except Exception:
+            pass
@@ -5,6 +5,7 @@ Run this file to generate daily content
 
 import os
 import sys
+import atexit
 import argparse
 from pathlib import Path
 from dotenv import load_dotenv
@@ -16,7 +17,8 @@ load_dotenv()
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from core.automation import AIInfluencerAutomation
+# Project modules are imported inside main(): queue commands and health
+# checks stay fast, and --import-profile can time everything a run loads
 
 
 def main():
@@ -42,9 +44,88 @@ def main():
         action='store_true',
         help='Run in test mode (no publishing)'
     )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        metavar='RUN_ID',
+        help='Resume a previous run, skipping steps it already completed'
+    )
+    parser.add_argument(
+        '--trace',
+        type=str,
+        metavar='PATH',
+        help='Save a timing trace of the run (.jsonl, or Chrome trace JSON otherwise)'
+    )
+    parser.add_argument(
+        '--import-profile',
+        action='store_true',
+        help='Report import time per module when the program exits'
+    )
+    
+    queue_group = parser.add_argument_group('job queue (multi-persona production)')
+    queue_group.add_argument(
+        '--enqueue',
+        action='store_true',
+        help='Queue a job for --config/--video-type/--topic instead of running it'
+    )
+    queue_group.add_argument(
+        '--topic',
+        type=str,
+        help='Topic to use instead of running trend analysis'
+    )
+    queue_group.add_argument(
+        '--work',
+        action='store_true',
+        help='Run queued jobs until the queue is empty'
+    )
+    queue_group.add_argument(
+        '--watch',
+        action='store_true',
+        help='With --work, keep polling for new jobs'
+    )
+    queue_group.add_argument(
+        '--network-workers',
+        type=int,
+        default=4,
+        help='Gemini/TTS steps in flight across all jobs (default: 4)'
+    )
+    queue_group.add_argument(
+        '--render-workers',
+        type=int,
+        default=1,
+        help='Videos rendered at once across all jobs (default: 1)'
+    )
+    queue_group.add_argument(
+        '--queue-stats',
+        action='store_true',
+        help='Show queue depth, throughput and per-stage latency'
+    )
+    queue_group.add_argument(
+        '--queue-db',
+        type=str,
+        help='Job queue database (default: output/jobs.sqlite)'
+    )
     
     args = parser.parse_args()
     
+    if args.import_profile:
+        from core.import_profile import ImportProfiler
+        profiler = ImportProfiler().start()
+        atexit.register(lambda: print("\n" + profiler.report()))
+    
+    # Queue bookkeeping needs no API keys
+    if args.enqueue or args.queue_stats:
+        from core.job_queue import JobQueue, format_stats
+        
+        queue = JobQueue(args.queue_db)
+        if args.enqueue:
+            job_id = queue.enqueue(args.config, args.video_type, args.topic)
+            print(f"📥 Queued job {job_id}: {args.video_type} for {args.config}"
+                  + (f" (topic: {args.topic})" if args.topic else ''))
+        if args.queue_stats:
+            print(format_stats(queue.stats()))
+        return
+    
     # Check for required API keys
     required_keys = ['GEMINI_API_KEY']
     missing_keys = [key for key in required_keys if not os.getenv(key)]
@@ -59,23 +140,51 @@ def main():
         print("PEXELS_API_KEY=your_pexels_api_key_here (optional)")
         sys.exit(1)
     
+    from core.run_manifest import RunManifest
+    
+    if args.resume and not RunManifest.exists(args.resume):
+        print(f"❌ No saved run with ID: {args.resume} (see output/logs/run_*.json)")
+        sys.exit(1)
+    
     # Initialize automation
     print("\n" + "="*70)
     print(" "*20 + "AI INFLUENCER AUTOMATION")
     print("="*70 + "\n")
     
+    if args.work:
+        from core.job_queue import JobQueue, JobWorker, format_stats
+        
+        queue = JobQueue(args.queue_db)
+        JobWorker(
+            queue,
+            network_workers=args.network_workers,
+            render_workers=args.render_workers
+        ).run(watch=args.watch)
+        print("\n" + format_stats(queue.stats()))
+        return
+    
+    from core.automation import AIInfluencerAutomation
+    from core.tracing import Tracer, use_tracer
+    
     automation = AIInfluencerAutomation(config_path=args.config)
     
-    # Generate content based on type
-    if args.video_type == 'both':
-        print("\n📹 Generating both long-form and short-form content...")
-        automation.run_daily_automation()
-    elif args.video_type == 'long_form':
-        print("\n📹 Generating long-form content...")
-        automation.generate_daily_content(video_type='long_form')
-    elif args.video_type == 'short_form':
-        print("\n📹 Generating short-form content...")
-        automation.generate_daily_content(video_type='short_form')
+    tracer = Tracer(f"ai_influencer {args.video_type}")
+    try:
+        with use_tracer(tracer):
+            # Generate content based on type
+            if args.video_type == 'both':
+                print("\n📹 Generating both long-form and short-form content...")
+                automation.run_daily_automation(run_id=args.resume, topic=args.topic)
+            elif args.video_type == 'long_form':
+                print("\n📹 Generating long-form content...")
+                automation.generate_daily_content(video_type='long_form', run_id=args.resume, topic=args.topic)
+            elif args.video_type == 'short_form':
+                print("\n📹 Generating short-form content...")
+                automation.generate_daily_content(video_type='short_form', run_id=args.resume, topic=args.topic)
+    finally:
+        # Written even for failed runs: those are the ones worth a look
+        if args.trace:
+            print(f"\n🧭 Trace saved: {tracer.write(args.trace)} (open in chrome://tracing or ui.perfetto.dev)")
     
     print("\n" + "="*70)
     print("✅ Automation complete!")
@@ -1,12 +1,16 @@
 import argparse
 import os
-import subprocess
 import sys
 
+# Allow running as a script from anywhere
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.sadtalker_worker import SadTalkerWorker, SadTalkerWorkerError
+
 def main():
     parser = argparse.ArgumentParser(description="Generate video from image and audio using SadTalker.")
     parser.add_argument("--image", required=True, help="Path to the source image")
-    parser.add_argument("--audio", required=True, help="Path to the source audio")
+    parser.add_argument("--audio", required=True, nargs="+", help="Path(s) to the source audio; several clips reuse one model load")
     parser.add_argument("--output_dir", default="output", help="Directory to save the result")
     
     args = parser.parse_args()
@@ -15,7 +19,6 @@ def main():
     base_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(base_dir)
     sadtalker_dir = os.path.join(project_root, "tools", "SadTalker")
-    inference_script = os.path.join(sadtalker_dir, "inference.py")
 
     if not os.path.exists(sadtalker_dir):
         print(f"Error: SadTalker not found at {sadtalker_dir}")
@@ -26,9 +29,10 @@ def main():
     if not os.path.exists(args.image):
         print(f"Error: Image not found: {args.image}")
         sys.exit(1)
-    if not os.path.exists(args.audio):
-        print(f"Error: Audio not found: {args.audio}")
-        sys.exit(1)
+    for audio in args.audio:
+        if not os.path.exists(audio):
+            print(f"Error: Audio not found: {audio}")
+            sys.exit(1)
 
     # Create output directory
     os.makedirs(args.output_dir, exist_ok=True)
@@ -47,30 +51,26 @@ def main():
         device = "cpu"
         print("Torch not found (checking for device). Defaulting to CPU.")
 
-    # Construct command
-    # python inference.py --driven_audio <audio> --source_image <image> --result_dir <output> --still --preprocess full --device <device>
-    cmd = [
-        sys.executable, inference_script,
-        "--driven_audio", os.path.abspath(args.audio),
-        "--source_image", os.path.abspath(args.image),
-        "--result_dir", os.path.abspath(args.output_dir),
-        "--still", # Preprocess still image
-        "--preprocess", "full",
-    ]
-    
-    if device == "cpu":
-        cmd.append("--cpu")
+    # Equivalent of: inference.py --still --preprocess full [--cpu]
+    # The worker loads checkpoints once and renders every audio clip with them
+    worker = SadTalkerWorker(sadtalker_path=sadtalker_dir, device=device)
 
     print(f"Running SadTalker inference...")
-    print(f"Command: {' '.join(cmd)}")
-    
-    # Run in SadTalker directory to ensure relative paths work there
     try:
-        subprocess.run(cmd, cwd=sadtalker_dir, check=True)
-        print(f"Success! Check output in {args.output_dir}")
-    except subprocess.CalledProcessError as e:
+        for audio in args.audio:
+            video_path = worker.render(
+                source_image=args.image,
+                driven_audio=audio,
+                result_dir=args.output_dir,
+                preprocess="full",
+                still=True
+            )
+            print(f"Success! Video saved to {video_path}")
+    except SadTalkerWorkerError as e:
         print(f"Error running SadTalker: {e}")
         sys.exit(1)
+    finally:
+        worker.close()
 
 if __name__ == "__main__":
     main()
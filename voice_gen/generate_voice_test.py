@@ -1,15 +1,27 @@
-import asyncio
-import edge_tts
+import os
+import sys
+
+# Allow running as a script from anywhere
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.audio_cache import get_audio_cache
+from core.chunked_tts import ChunkedSynthesizer
+from core.voice_service import get_voice_service
 
 VOICE = "en-US-AnaNeural" # Soft, pleasant female voice
 OUTPUT_FILE = "hello_world.mp3"
 
 TEXT = "Hello! I am excited to show you around these beautiful places. Let's explore together while keeping it budget friendly!"
 
-async def amain():
-    communicate = edge_tts.Communicate(TEXT, VOICE)
-    await communicate.save(OUTPUT_FILE)
-    print(f"Generated audio saved to {OUTPUT_FILE}")
-
 if __name__ == "__main__":
-    asyncio.run(amain())
+    cache = get_audio_cache()
+    synthesizer = ChunkedSynthesizer(
+        backend=get_voice_service(VOICE).synthesize,
+        cache=cache,
+        engine="edge-tts",
+        voice=VOICE,
+        rate="+0%"
+    )
+    synthesizer.synthesize(TEXT, os.path.abspath(OUTPUT_FILE))
+    print(f"Generated audio saved to {OUTPUT_FILE}")
+    print(f"Audio cache: {cache.stats()}")